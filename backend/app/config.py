@@ -1,21 +1,91 @@
 from __future__ import annotations
 
+import os
+import tempfile
+
+from pydantic import field_validator
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
+# schema.sql keeps whole-token copies of the *_units columns as numeric(20, 6) / 1000000.
+SCHEMA_TOKEN_DECIMALS = 6
+
 
 class Settings(BaseSettings):
     supabase_url: str = ""
     supabase_key: str = ""
+    supabase_pool_size: int = 20
+    supabase_timeout_seconds: float = 30.0
 
     jwt_secret: str = ""
     jwt_expire_minutes: int = 60 * 24
     cors_origins: str = "*"
 
+    storage_backend: str = "pinata"
+    storage_local_dir: str = os.path.join(tempfile.gettempdir(), "rift-storage")
+
     pinata_jwt: str = ""
     pinata_gateway: str = "gateway.pinata.cloud"
+    pinata_api_url: str = "https://api.pinata.cloud"
+    ipfs_gateways: str = ""
+    gateway_probe_cid: str = "QmUNLLsPACCz1vLxQVkXqqLX5R1X345qqfHbsf67hvA3Nn"
+    gateway_probe_interval_seconds: float = 60.0
+    gateway_probe_timeout_seconds: float = 5.0
+    gateway_failure_threshold: int = 2
+    upload_chunk_bytes: int = 1024 * 1024
+    cid_index_cache_entries: int = 10_000
+    upload_spool_dir: str = os.path.join(tempfile.gettempdir(), "rift-uploads")
+    resumable_staging_dir: str = os.path.join(tempfile.gettempdir(), "rift-resumable")
+    resumable_max_chunk_bytes: int = 64 * 1024 * 1024
+    resumable_max_upload_bytes: int = 20 * 1024 * 1024 * 1024
+    stream_proxy_enabled: bool = False
+    stream_cache_dir: str = os.path.join(tempfile.gettempdir(), "rift-stream-cache")
+    stream_cache_chunk_bytes: int = 1024 * 1024
+    stream_cache_max_bytes: int = 2 * 1024 * 1024 * 1024
+    stream_gateway_pool_size: int = 16
+    stream_gateway_timeout_seconds: int = 30
+    stream_media_type: str = "video/mp4"
+    batch_upload_concurrency: int = 8
+    batch_upload_max_files: int = 500
+    pinning_workers: int = 4
+    pinning_max_attempts: int = 5
+    pinning_retry_base_seconds: float = 2.0
+    pinning_retry_max_seconds: float = 60.0
 
     algod_address: str = "https://testnet-api.algonode.cloud"
+    algod_addresses: str = ""
     algod_token: str = ""
+    indexer_address: str = ""
+    indexer_token: str = ""
+    algod_pool_size: int = 10
+    algod_params_ttl_seconds: int = 30
+    algod_params_max_rounds: int = 10
+    algod_hedge_percentile: float = 95.0
+    algod_hedge_min_delay_ms: int = 20
+    algod_hedge_default_delay_ms: int = 250
+    algod_endpoint_failure_threshold: int = 3
+    algod_endpoint_cooldown_seconds: int = 30
+    confirmation_timeout_seconds: int = 60
+    payout_max_in_flight_groups: int = 32
+    banner_creator_page_size: int = 1000
+    banner_payout_chunk_size: int = 512
+    payout_hot_wallet_mnemonics: str = ""
+    hot_wallet_float_units: int = 0
+    hot_wallet_algo_buffer_micro: int = 1_000_000
+    reconcile_page_size: int = 500
+    reconcile_concurrency: int = 8
+    reconcile_interval_minutes: int = 60
+    solvency_policy: str = "trim"
+    solvency_reserve_units: int = 0
+    balance_cache_ttl_seconds: float = 10.0
+    balance_bulk_concurrency: int = 8
+    balance_bulk_max_wallets: int = 100
+    optin_lookup_concurrency: int = 8
+    optin_cache_ttl_seconds: float = 3600.0
+    optin_negative_ttl_seconds: float = 300.0
+    optin_cache_max_entries: int = 200_000
+    signature_verify_workers: int = 2
+    signature_verify_batch_size: int = 64
+    signature_cache_size: int = 4096
     algorand_mnemonic: str = ""
     platform_wallet: str = ""
 
@@ -35,6 +105,15 @@ class Settings(BaseSettings):
 
     model_config = SettingsConfigDict(env_file=".env", case_sensitive=False)
 
+    @field_validator("token_decimals")
+    @classmethod
+    def _schema_token_decimals(cls, value: int) -> int:
+        if value != SCHEMA_TOKEN_DECIMALS:
+            raise ValueError(
+                f"TOKEN_DECIMALS must be {SCHEMA_TOKEN_DECIMALS}: schema.sql derives whole-token amounts with that many decimals."
+            )
+        return value
+
     @property
     def effective_jwt_secret(self) -> str:
         return self.jwt_secret or self.supabase_key
@@ -46,5 +125,20 @@ class Settings(BaseSettings):
         origins = [origin.strip() for origin in self.cors_origins.split(",") if origin.strip()]
         return origins or ["*"]
 
+    @property
+    def payout_hot_wallet_mnemonic_list(self) -> list[str]:
+        # Comma separated 25-word mnemonics of the payout hot wallets.
+        return [" ".join(phrase.split()) for phrase in self.payout_hot_wallet_mnemonics.split(",") if phrase.strip()]
+
+    @property
+    def algod_address_list(self) -> list[str]:
+        addresses = [address.strip().rstrip("/") for address in self.algod_addresses.split(",") if address.strip()]
+        return addresses or [self.algod_address.rstrip("/")]
+
+    @property
+    def ipfs_gateway_list(self) -> list[str]:
+        # Pinata's gateway first, then any extra gateways to rank against it.
+        return [self.pinata_gateway, *(gateway.strip() for gateway in self.ipfs_gateways.split(",") if gateway.strip())]
+
 
 settings = Settings()
@@ -1,12 +1,20 @@
 from __future__ import annotations
 
+from collections.abc import Iterator
+from contextlib import contextmanager
 from functools import lru_cache
+from typing import Any
 
-from supabase import Client, create_client
+import httpx
+from supabase import AsyncClient, AsyncClientOptions, Client, create_client
 
 from .config import settings
 
 
+_override: Any | None = None
+_async_client: AsyncClient | None = None
+
+
 @lru_cache
 def _build_client() -> Client:
     if not settings.supabase_url or not settings.supabase_key:
@@ -15,4 +23,82 @@ def _build_client() -> Client:
 
 
 def get_db() -> Client:
+    # Blocking client for code on worker threads (scheduler jobs, asyncio.to_thread). Request
+    # handlers and other code on the event loop use get_async_db().
+    if _override is not None:
+        return _override
     return _build_client()
+
+
+class _AwaitableQuery:
+    # Wraps a blocking query builder so `await ....execute()` works on it like on the async client.
+
+    def __init__(self, query: Any) -> None:
+        self._query = query
+
+    def __getattr__(self, name: str) -> Any:
+        attribute = getattr(self._query, name)
+        if not callable(attribute):
+            return attribute
+
+        def chained(*args: Any, **kwargs: Any) -> Any:
+            result = attribute(*args, **kwargs)
+            return _AwaitableQuery(result) if hasattr(result, "execute") else result
+
+        return chained
+
+    async def execute(self) -> Any:
+        return self._query.execute()
+
+
+class _AwaitableDB:
+    def __init__(self, client: Any) -> None:
+        self._client = client
+
+    def table(self, name: str) -> _AwaitableQuery:
+        return _AwaitableQuery(self._client.table(name))
+
+
+def get_async_db() -> AsyncClient:
+    # Non-blocking client: queries go over a pooled httpx AsyncClient (HTTP/2 where the server
+    # negotiates it), so a slow PostgREST query only holds up the request that made it.
+    global _async_client
+    if _override is not None:
+        # The override is an in-process store; its queries never wait on the network.
+        return _AwaitableDB(_override)
+    if _async_client is None:
+        if not settings.supabase_url or not settings.supabase_key:
+            raise RuntimeError("SUPABASE_URL and SUPABASE_KEY must be configured.")
+        http_client = httpx.AsyncClient(
+            http2=True,
+            follow_redirects=True,
+            timeout=settings.supabase_timeout_seconds,
+            limits=httpx.Limits(
+                max_connections=settings.supabase_pool_size,
+                max_keepalive_connections=settings.supabase_pool_size,
+            ),
+        )
+        _async_client = AsyncClient(
+            settings.supabase_url, settings.supabase_key, AsyncClientOptions(httpx_client=http_client)
+        )
+    return _async_client
+
+
+async def aclose_db() -> None:
+    # The async client's connections belong to the running event loop; close them with it.
+    global _async_client
+    client, _async_client = _async_client, None
+    if client is not None and client.options.httpx_client is not None:
+        await client.options.httpx_client.aclose()
+
+
+@contextmanager
+def use_db(client: Any) -> Iterator[None]:
+    # Routes every get_db() and get_async_db() call to `client` (e.g. the in-memory simulation store).
+    global _override
+    previous = _override
+    _override = client
+    try:
+        yield
+    finally:
+        _override = previous
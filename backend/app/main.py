@@ -4,14 +4,24 @@ from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
 from .config import settings
-from .routes import ads, auth, settlement, videos, views, wallets
-from .services import reward_engine
+from .database import aclose_db
+from .routes import ads, auth, settlement, stream, videos, views, wallets
+from .services import algorand_service, reward_engine
+from .services.gateway_registry import gateway_registry
+from .services.pinning_queue import pinning_queue
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
+    algorand_service.warm_up()
     reward_engine.start()
+    await pinning_queue.start()
+    gateway_registry.start()
     yield
+    gateway_registry.stop()
+    await pinning_queue.stop()
+    await algorand_service.aclose()
+    await aclose_db()
 
 
 app = FastAPI(title="Rift Decentralized Video Platform", lifespan=lifespan)
@@ -30,6 +40,7 @@ app.include_router(views.router, prefix="/views", tags=["Views"])
 app.include_router(ads.router, prefix="/ads", tags=["Ads"])
 app.include_router(settlement.router, prefix="/settlement", tags=["Settlement"])
 app.include_router(wallets.router, prefix="/wallets", tags=["Wallets"])
+app.include_router(stream.router, prefix="/stream", tags=["Stream"])
 
 
 @app.get("/")
@@ -0,0 +1,140 @@
+from __future__ import annotations
+
+import asyncio
+import uuid
+from collections.abc import Awaitable, Callable, Hashable
+from typing import Any
+
+from algosdk import encoding
+
+from .database import get_async_db
+
+Row = dict[str, Any]
+ID_CHUNK = 200  # ids per in_() filter, keeps PostgREST URLs short
+
+# Lookups by key go through DataLoaders: every load() made in one event-loop tick, from any number
+# of concurrent requests, is answered by a single `in_` query per table and column. A Repository
+# is created per request and also keeps the rows it has seen for the rest of that request. The
+# shared loaders cache nothing across ticks, so one request never sees another's stale rows.
+# Keys are normalised before they join a batch, and a key that cannot match a row (e.g. a
+# malformed uuid from a client) is answered as not found, so it cannot fail the batch it shares.
+
+
+def fetch_by_ids(db: Any, table: str, column: str, keys: list[Any], columns: str = "*") -> dict[Any, Row]:
+    # Blocking variant for the engines on worker threads: key -> row, ID_CHUNK keys per query.
+    keys = list(dict.fromkeys(keys))
+    rows: dict[Any, Row] = {}
+    for start in range(0, len(keys), ID_CHUNK):
+        result = db.table(table).select(columns).in_(column, keys[start : start + ID_CHUNK]).execute()
+        rows.update({row[column]: row for row in result.data or []})
+    return rows
+
+
+async def afetch_by_ids(table: str, column: str, keys: list[Any], columns: str = "*") -> dict[Any, Row]:
+    keys = list(dict.fromkeys(keys))
+    db = get_async_db()
+    results = await asyncio.gather(
+        *(
+            db.table(table).select(columns).in_(column, keys[start : start + ID_CHUNK]).execute()
+            for start in range(0, len(keys), ID_CHUNK)
+        )
+    )
+    return {row[column]: row for result in results for row in result.data or []}
+
+
+def uuid_key(key: Hashable) -> str | None:
+    try:
+        return str(uuid.UUID(str(key)))
+    except ValueError:
+        return None
+
+
+def wallet_key(key: Hashable) -> str | None:
+    return key if isinstance(key, str) and encoding.is_valid_address(key) else None
+
+
+class DataLoader:
+    def __init__(
+        self,
+        batch: Callable[[list[Hashable]], Awaitable[dict[Hashable, Any]]],
+        normalize: Callable[[Hashable], Hashable | None],
+    ) -> None:
+        self._batch = batch
+        self._normalize = normalize
+        self._pending: dict[Hashable, asyncio.Future] = {}
+        self._dispatches: set[asyncio.Task] = set()
+        self.batches = 0
+        self.keys_loaded = 0
+
+    async def load(self, key: Hashable) -> Any | None:
+        key = self._normalize(key)
+        if key is None:
+            return None
+        future = self._pending.get(key)
+        if future is None:
+            loop = asyncio.get_running_loop()
+            if not self._pending:
+                loop.call_soon(self._dispatch)
+            future = self._pending[key] = loop.create_future()
+        # Shielded so one cancelled caller does not cancel the lookup for the others.
+        return await asyncio.shield(future)
+
+    def _dispatch(self) -> None:
+        pending, self._pending = self._pending, {}
+        if not pending:
+            return
+        task = asyncio.ensure_future(self._run(pending))
+        self._dispatches.add(task)
+        task.add_done_callback(self._dispatches.discard)
+
+    async def _run(self, pending: dict[Hashable, asyncio.Future]) -> None:
+        self.batches += 1
+        self.keys_loaded += len(pending)
+        try:
+            rows = await self._batch(list(pending))
+        except Exception as exc:
+            for future in pending.values():
+                if not future.done():
+                    future.set_exception(exc)
+            return
+        for key, future in pending.items():
+            if not future.done():
+                future.set_result(rows.get(key))
+
+
+def _loader(table: str, column: str, normalize: Callable[[Hashable], Hashable | None]) -> DataLoader:
+    return DataLoader(lambda keys: afetch_by_ids(table, column, keys), normalize)
+
+
+users_by_id = _loader("users", "id", uuid_key)
+users_by_wallet = _loader("users", "wallet_address", wallet_key)
+videos_by_id = _loader("videos", "id", uuid_key)
+
+
+class Repository:
+    def __init__(self) -> None:
+        self._rows: dict[tuple[str, Hashable], asyncio.Future] = {}
+
+    async def _get(self, name: str, loader: DataLoader, key: Hashable) -> Row | None:
+        cached = self._rows.get((name, key))
+        if cached is None:
+            cached = self._rows[(name, key)] = asyncio.ensure_future(loader.load(key))
+        try:
+            return await asyncio.shield(cached)
+        except Exception:
+            self._rows.pop((name, key), None)
+            raise
+
+    async def user(self, user_id: str) -> Row | None:
+        return await self._get("users.id", users_by_id, user_id)
+
+    async def user_by_wallet(self, wallet_address: str) -> Row | None:
+        return await self._get("users.wallet_address", users_by_wallet, wallet_address)
+
+    async def video(self, video_id: str) -> Row | None:
+        return await self._get("videos.id", videos_by_id, video_id)
+
+
+def get_repository() -> Repository:
+    # FastAPI dependency: one Repository, and so one row cache, per request.
+    return Repository()
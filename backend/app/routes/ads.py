@@ -1,22 +1,24 @@
 from __future__ import annotations
 
+import asyncio
 from datetime import date
-from decimal import Decimal, InvalidOperation
 
 from fastapi import APIRouter, Depends, File, Form, HTTPException, UploadFile
 
-from ..database import get_db
+from ..database import get_async_db
+from ..repository import Repository, get_repository
 from ..services import algorand_service, storage_service
+from ..utils.units import row_units, to_tokens, to_units
 from .auth import get_current_user
 
 
 router = APIRouter()
 
 
-def _to_decimal(value: str | float) -> Decimal:
+def _parse_units(value: str | float) -> int:
     try:
-        return Decimal(str(value))
-    except InvalidOperation as exc:
+        return to_units(value)
+    except ValueError as exc:
         raise HTTPException(status_code=400, detail="Invalid numeric value.") from exc
 
 
@@ -27,33 +29,33 @@ async def create_campaign(
     reward_per_view: float = Form(...),
     file: UploadFile | None = File(None),
     current_user: dict = Depends(get_current_user),
+    repo: Repository = Depends(get_repository),
 ):
-    budget_dec = _to_decimal(budget)
-    reward_per_view_dec = _to_decimal(reward_per_view)
-    if budget_dec <= 0 or reward_per_view_dec <= 0:
+    budget_units = _parse_units(budget)
+    reward_per_view_units = _parse_units(reward_per_view)
+    if budget_units <= 0 or reward_per_view_units <= 0:
         raise HTTPException(status_code=400, detail="budget and reward_per_view must be > 0.")
-    if reward_per_view_dec > budget_dec:
+    if reward_per_view_units > budget_units:
         raise HTTPException(status_code=400, detail="reward_per_view cannot exceed budget.")
 
-    db = get_db()
-    video = db.table("videos").select("id").eq("id", video_id).limit(1).execute()
-    if not video.data:
+    if not await repo.video(video_id):
         raise HTTPException(status_code=404, detail="Video not found.")
 
     ad_cid = None
     if file:
-        content = await file.read()
-        if not content:
+        if storage_service.stream_size(file.file) <= 0:
             raise HTTPException(status_code=400, detail="Ad file is empty.")
-        ad_cid = storage_service.upload_file(content, file.filename or "ad-video.mp4")
+        ad_cid = await asyncio.to_thread(
+            storage_service.pin_stream, file.file, file.filename or "ad-video.mp4", file.content_type
+        )
 
-    created = db.table("ad_campaigns").insert(
+    created = await get_async_db().table("ad_campaigns").insert(
         {
             "advertiser_wallet": current_user["wallet_address"],
             "video_id": video_id,
-            "budget": float(budget_dec),
-            "remaining_budget": float(budget_dec),
-            "reward_per_view": float(reward_per_view_dec),
+            "budget_units": budget_units,
+            "remaining_budget_units": budget_units,
+            "reward_per_view_units": reward_per_view_units,
             "active": True,
             "ad_video_cid": ad_cid,
         }
@@ -70,15 +72,15 @@ async def create_campaign(
 
 @router.get("/active")
 async def list_active_campaigns():
-    db = get_db()
-    res = db.table("ad_campaigns").select("*").eq("active", True).gt("remaining_budget", 0).execute()
+    db = get_async_db()
+    res = await db.table("ad_campaigns").select("*").eq("active", True).gt("remaining_budget_units", 0).execute()
     return res.data or []
 
 
 @router.get("/me")
 async def list_my_campaigns(current_user: dict = Depends(get_current_user)):
-    db = get_db()
-    res = (
+    db = get_async_db()
+    res = await (
         db.table("ad_campaigns")
         .select("*, videos(title)")
         .eq("advertiser_wallet", current_user["wallet_address"])
@@ -90,8 +92,8 @@ async def list_my_campaigns(current_user: dict = Depends(get_current_user)):
 
 @router.post("/campaign/{campaign_id}/withdraw")
 async def withdraw_unused_budget(campaign_id: str, current_user: dict = Depends(get_current_user)):
-    db = get_db()
-    campaign_res = (
+    db = get_async_db()
+    campaign_res = await (
         db.table("ad_campaigns")
         .select("*")
         .eq("id", campaign_id)
@@ -103,14 +105,14 @@ async def withdraw_unused_budget(campaign_id: str, current_user: dict = Depends(
         raise HTTPException(status_code=404, detail="Campaign not found.")
 
     campaign = campaign_res.data[0]
-    remaining_budget = _to_decimal(campaign.get("remaining_budget", 0))
+    remaining_budget = row_units(campaign, "remaining_budget")
     if remaining_budget <= 0:
         raise HTTPException(status_code=400, detail="No remaining budget to withdraw.")
 
-    tx_hash = algorand_service.withdraw_unused(current_user["wallet_address"], remaining_budget)
-    db.table("ad_campaigns").update({"remaining_budget": 0, "active": False}).eq("id", campaign_id).execute()
+    tx_hash = await algorand_service.withdraw_unused_async(current_user["wallet_address"], remaining_budget)
+    await db.table("ad_campaigns").update({"remaining_budget_units": 0, "active": False}).eq("id", campaign_id).execute()
 
-    return {"status": "success", "tx_hash": tx_hash, "withdrawn_amount": float(remaining_budget)}
+    return {"status": "success", "tx_hash": tx_hash, "withdrawn_amount": to_tokens(remaining_budget)}
 
 
 @router.post("/banner/create")
@@ -124,8 +126,8 @@ async def create_banner_campaign(
     if tier not in {"1m", "3m", "6m"}:
         raise HTTPException(status_code=400, detail="tier must be one of: 1m, 3m, 6m.")
 
-    fixed_price_dec = _to_decimal(fixed_price)
-    if fixed_price_dec <= 0:
+    fixed_price_units = _parse_units(fixed_price)
+    if fixed_price_units <= 0:
         raise HTTPException(status_code=400, detail="fixed_price must be > 0.")
 
     try:
@@ -137,12 +139,12 @@ async def create_banner_campaign(
     if parsed_end <= parsed_start:
         raise HTTPException(status_code=400, detail="end_date must be later than start_date.")
 
-    db = get_db()
-    created = db.table("banner_campaigns").insert(
+    db = get_async_db()
+    created = await db.table("banner_campaigns").insert(
         {
             "advertiser_wallet": current_user["wallet_address"],
             "tier": tier,
-            "fixed_price": float(fixed_price_dec),
+            "fixed_price_units": fixed_price_units,
             "start_date": parsed_start.isoformat(),
             "end_date": parsed_end.isoformat(),
             "active": True,
@@ -156,15 +158,15 @@ async def create_banner_campaign(
 
 @router.get("/banner/active")
 async def list_active_banner_campaigns():
-    db = get_db()
-    campaigns = db.table("banner_campaigns").select("*").eq("active", True).execute()
+    db = get_async_db()
+    campaigns = await db.table("banner_campaigns").select("*").eq("active", True).execute()
     return campaigns.data or []
 
 
 @router.get("/banner/me")
 async def list_my_banner_campaigns(current_user: dict = Depends(get_current_user)):
-    db = get_db()
-    campaigns = (
+    db = get_async_db()
+    campaigns = await (
         db.table("banner_campaigns")
         .select("*")
         .eq("advertiser_wallet", current_user["wallet_address"])
@@ -176,41 +178,35 @@ async def list_my_banner_campaigns(current_user: dict = Depends(get_current_user
 
 @router.get("/summary")
 async def advertiser_spend_summary(current_user: dict = Depends(get_current_user)):
-    db = get_db()
+    db = get_async_db()
 
     ad_campaigns = (
-        db.table("ad_campaigns")
-        .select("budget, remaining_budget")
+        await db.table("ad_campaigns")
+        .select("budget_units, remaining_budget_units")
         .eq("advertiser_wallet", current_user["wallet_address"])
         .execute()
-        .data
-        or []
-    )
-    total_budget = sum(_to_decimal(c.get("budget")) for c in ad_campaigns)
-    total_remaining = sum(_to_decimal(c.get("remaining_budget")) for c in ad_campaigns)
-    total_spent = total_budget - total_remaining
-    if total_spent < 0:
-        total_spent = _to_decimal(0)
+    ).data or []
+    total_budget = sum(row_units(c, "budget") for c in ad_campaigns)
+    total_remaining = sum(row_units(c, "remaining_budget") for c in ad_campaigns)
+    total_spent = max(total_budget - total_remaining, 0)
 
     banner_campaigns = (
-        db.table("banner_campaigns")
-        .select("fixed_price, distributed")
+        await db.table("banner_campaigns")
+        .select("fixed_price_units, distributed")
         .eq("advertiser_wallet", current_user["wallet_address"])
         .execute()
-        .data
-        or []
-    )
-    banner_committed = sum(_to_decimal(c.get("fixed_price")) for c in banner_campaigns)
-    banner_distributed = sum(_to_decimal(c.get("fixed_price")) for c in banner_campaigns if c.get("distributed"))
+    ).data or []
+    banner_committed = sum(row_units(c, "fixed_price") for c in banner_campaigns)
+    banner_distributed = sum(row_units(c, "fixed_price") for c in banner_campaigns if c.get("distributed"))
 
     return {
         "video_ads": {
-            "total_budget": float(total_budget),
-            "total_remaining": float(total_remaining),
-            "total_spent": float(total_spent),
+            "total_budget": to_tokens(total_budget),
+            "total_remaining": to_tokens(total_remaining),
+            "total_spent": to_tokens(total_spent),
         },
         "banner_ads": {
-            "total_committed": float(banner_committed),
-            "total_distributed": float(banner_distributed),
+            "total_committed": to_tokens(banner_committed),
+            "total_distributed": to_tokens(banner_distributed),
         },
     }
@@ -10,7 +10,8 @@ from jose import JWTError, jwt
 from pydantic import BaseModel, Field
 
 from ..config import settings
-from ..database import get_db
+from ..database import get_async_db
+from ..repository import Repository, get_repository
 from ..services import algorand_service
 
 
@@ -118,22 +119,20 @@ async def auth_challenge(request: ChallengeRequest):
 
 
 @router.post("/signup", response_model=Token)
-async def signup(request: SignupRequest):
+async def signup(request: SignupRequest, repo: Repository = Depends(get_repository)):
     wallet_address = _normalize_wallet(request.wallet_address)
     role = _validate_role(request.role)
 
     if not _validate_challenge(wallet_address, request.message):
         raise HTTPException(status_code=401, detail="Invalid or expired challenge.")
 
-    if not algorand_service.verify_signature(wallet_address, request.message, request.signature):
+    if not await algorand_service.verify_signature_async(wallet_address, request.message, request.signature):
         raise HTTPException(status_code=401, detail="Invalid signature.")
 
-    db = get_db()
-    existing_user = db.table("users").select("id").eq("wallet_address", wallet_address).execute()
-    if existing_user.data:
+    if await repo.user_by_wallet(wallet_address):
         raise HTTPException(status_code=400, detail="User already exists. Please login.")
 
-    created = db.table("users").insert(
+    created = await get_async_db().table("users").insert(
         {
             "wallet_address": wallet_address,
             "username": request.username.strip(),
@@ -156,21 +155,19 @@ async def signup(request: SignupRequest):
 
 
 @router.post("/login", response_model=Token)
-async def login(request: LoginRequest):
+async def login(request: LoginRequest, repo: Repository = Depends(get_repository)):
     wallet_address = _normalize_wallet(request.wallet_address)
 
     if not _validate_challenge(wallet_address, request.message):
         raise HTTPException(status_code=401, detail="Invalid or expired challenge.")
 
-    if not algorand_service.verify_signature(wallet_address, request.message, request.signature):
+    if not await algorand_service.verify_signature_async(wallet_address, request.message, request.signature):
         raise HTTPException(status_code=401, detail="Invalid signature.")
 
-    db = get_db()
-    user_res = db.table("users").select("*").eq("wallet_address", wallet_address).execute()
-    if not user_res.data:
+    user = await repo.user_by_wallet(wallet_address)
+    if not user:
         raise HTTPException(status_code=404, detail="User not found. Please sign up.")
 
-    user = user_res.data[0]
     token = _create_access_token(
         {
             "sub": wallet_address,
@@ -201,9 +198,10 @@ async def get_current_user(token: str = Depends(oauth2_scheme)) -> dict[str, str
 
 
 @router.get("/me")
-async def get_me(current_user: dict[str, str] = Depends(get_current_user)):
-    db = get_db()
-    user_res = db.table("users").select("*").eq("id", current_user["user_id"]).limit(1).execute()
-    if not user_res.data:
+async def get_me(
+    current_user: dict[str, str] = Depends(get_current_user), repo: Repository = Depends(get_repository)
+):
+    user = await repo.user(current_user["user_id"])
+    if not user:
         raise HTTPException(status_code=404, detail="User not found.")
-    return user_res.data[0]
+    return user
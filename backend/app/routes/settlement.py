@@ -1,12 +1,14 @@
 from __future__ import annotations
 
-from decimal import Decimal
+import asyncio
 
 from fastapi import APIRouter, Depends, HTTPException
+from fastapi.responses import JSONResponse
 
 from ..config import settings
-from ..database import get_db
-from ..services import banner_engine, reward_engine
+from ..database import get_async_db
+from ..services import banner_engine, reconciliation_service, reward_engine
+from ..utils.units import row_units, to_tokens
 from .auth import get_current_user
 
 
@@ -25,8 +27,8 @@ def _require_platform_operator(current_user: dict) -> None:
 
 @router.get("/")
 async def get_settlements(limit: int = 100):
-    db = get_db()
-    result = (
+    db = get_async_db()
+    result = await (
         db.table("settlements")
         .select("*")
         .order("timestamp", desc=True)
@@ -40,7 +42,7 @@ async def get_settlements(limit: int = 100):
 async def trigger_settlement(current_user: dict = Depends(get_current_user)):
     _require_platform_operator(current_user)
     try:
-        report = reward_engine.calculate_and_settle()
+        report = await asyncio.to_thread(reward_engine.calculate_and_settle)
         return {"status": "success", "report": report}
     except Exception as exc:
         raise HTTPException(status_code=500, detail=str(exc)) from exc
@@ -50,47 +52,60 @@ async def trigger_settlement(current_user: dict = Depends(get_current_user)):
 async def trigger_banner_distribution(current_user: dict = Depends(get_current_user)):
     _require_platform_operator(current_user)
     try:
-        report = banner_engine.distribute_banner_rewards()
-        return {"status": "success", "report": report}
+        report = await asyncio.to_thread(banner_engine.distribute_banner_rewards)
+    except Exception as exc:
+        # The run keeps its checkpoints; report how far it got so the operator can retrigger.
+        return JSONResponse(
+            status_code=500,
+            content={"detail": str(exc), "progress": await asyncio.to_thread(banner_engine.distribution_progress)},
+        )
+    progress = await asyncio.to_thread(banner_engine.distribution_progress, report.get("run_id"))
+    return {"status": "success", "report": report, "progress": progress}
+
+
+@router.get("/banner-progress")
+async def banner_distribution_progress(run_id: str | None = None, current_user: dict = Depends(get_current_user)):
+    _require_platform_operator(current_user)
+    progress = await asyncio.to_thread(banner_engine.distribution_progress, run_id)
+    if progress is None:
+        raise HTTPException(status_code=404, detail="No banner distribution found.")
+    return progress
+
+
+@router.post("/reconcile")
+async def reconcile_settlements(max_rows: int | None = None, current_user: dict = Depends(get_current_user)):
+    _require_platform_operator(current_user)
+    try:
+        report = await asyncio.to_thread(reconciliation_service.reconcile_settlements, max_rows)
     except Exception as exc:
         raise HTTPException(status_code=500, detail=str(exc)) from exc
+    return {"status": "success", "report": report}
 
 
 @router.get("/summary")
 async def settlement_summary():
-    db = get_db()
-    settlements = db.table("settlements").select("*").order("timestamp", desc=True).limit(1000).execute().data or []
-    banner_campaigns = db.table("banner_campaigns").select("fixed_price, distributed").execute().data or []
+    db = get_async_db()
+    settlements = (await db.table("settlements").select("*").order("timestamp", desc=True).limit(1000).execute()).data or []
+    banner_campaigns = (await db.table("banner_campaigns").select("fixed_price_units, distributed").execute()).data or []
 
     totals = {
-        "video_ad_creator_payout": Decimal("0"),
-        "video_ad_platform_fee": Decimal("0"),
-        "banner_creator_payout": Decimal("0"),
-        "banner_revenue": Decimal("0"),
-        "banner_platform_share": Decimal("0"),
-        "count": len(settlements),
+        "video_ad_creator_payout": 0,
+        "video_ad_platform_fee": 0,
+        "banner_creator_payout": 0,
     }
 
     for settlement in settlements:
         settlement_type = settlement.get("settlement_type", "video_ad")
-        amount = Decimal(str(settlement.get("amount", 0)))
-        platform_fee = Decimal(str(settlement.get("platform_fee", 0)))
+        amount = row_units(settlement, "amount")
 
         if settlement_type == "banner":
             totals["banner_creator_payout"] += amount
         else:
             totals["video_ad_creator_payout"] += amount
-            totals["video_ad_platform_fee"] += platform_fee
+            totals["video_ad_platform_fee"] += row_units(settlement, "platform_fee")
 
-    banner_revenue = sum(Decimal(str(campaign.get("fixed_price", 0))) for campaign in banner_campaigns if campaign.get("distributed"))
+    banner_revenue = sum(row_units(campaign, "fixed_price") for campaign in banner_campaigns if campaign.get("distributed"))
     totals["banner_revenue"] = banner_revenue
-    totals["banner_platform_share"] = (banner_revenue * Decimal("0.30")).quantize(Decimal("0.000001"))
-
-    return {
-        "count": totals["count"],
-        "video_ad_creator_payout": float(totals["video_ad_creator_payout"]),
-        "video_ad_platform_fee": float(totals["video_ad_platform_fee"]),
-        "banner_creator_payout": float(totals["banner_creator_payout"]),
-        "banner_revenue": float(totals["banner_revenue"]),
-        "banner_platform_share": float(totals["banner_platform_share"]),
-    }
+    totals["banner_platform_share"] = banner_engine.split_revenue(banner_revenue)[1]
+
+    return {"count": len(settlements), **{key: to_tokens(value) for key, value in totals.items()}}
@@ -0,0 +1,134 @@
+from __future__ import annotations
+
+import asyncio
+import re
+
+from fastapi import APIRouter, Depends, HTTPException, Request
+from fastapi.responses import FileResponse, Response, StreamingResponse
+
+from ..config import settings
+from ..services.gateway_registry import gateway_registry
+from ..services.storage_backends import get_backend
+from ..services.stream_cache import CID_PATTERN, chunk_cache
+from .auth import get_current_user
+
+
+router = APIRouter()
+_RANGE = re.compile(r"^bytes=(\d*)-(\d*)$")
+
+
+def _require_platform_operator(current_user: dict) -> None:
+    configured_platform = (settings.platform_wallet or "").strip().lower()
+    if not configured_platform:
+        raise HTTPException(status_code=500, detail="PLATFORM_WALLET is not configured.")
+
+    wallet = current_user["wallet_address"].strip().lower()
+    if wallet != configured_platform:
+        raise HTTPException(status_code=403, detail="Only the platform wallet can read playback stats.")
+
+
+def _parse_range(header: str, size: int) -> tuple[int, int]:
+    # A single "bytes=start-end", "bytes=start-" or "bytes=-suffix" range, clamped to the object.
+    match = _RANGE.match(header.strip())
+    if not match or match.groups() == ("", ""):
+        raise HTTPException(status_code=416, detail="Only single byte ranges are supported.", headers={"Content-Range": f"bytes */{size}"})
+    first, last = match.groups()
+    if first:
+        start, end = int(first), int(last) if last else size - 1
+    else:
+        start, end = max(size - int(last), 0), size - 1
+    end = min(end, size - 1)
+    if start > end:
+        raise HTTPException(status_code=416, detail="Range not satisfiable.", headers={"Content-Range": f"bytes */{size}"})
+    return start, end
+
+
+def _read(path: str, offset: int, length: int) -> bytes:
+    with open(path, "rb") as chunk:
+        chunk.seek(offset)
+        return chunk.read(length)
+
+
+class _ChunkFileResponse(FileResponse):
+    # Holds the chunk's pin until the file has been sent, so eviction cannot remove it mid-send.
+
+    def __init__(self, path: str, chunk_key: tuple[str, int], **kwargs) -> None:
+        super().__init__(path, **kwargs)
+        self.chunk_key = chunk_key
+
+    async def __call__(self, scope, receive, send) -> None:
+        try:
+            await super().__call__(scope, receive, send)
+        finally:
+            await asyncio.to_thread(chunk_cache.release_chunk, *self.chunk_key)
+
+
+async def _chunk(cid: str, index: int) -> str:
+    # The returned chunk is pinned; release it with chunk_cache.release_chunk once read.
+    try:
+        return await asyncio.to_thread(chunk_cache.get_chunk, cid, index)
+    except IndexError as exc:
+        raise HTTPException(status_code=416, detail=str(exc)) from exc
+    except Exception as exc:
+        raise HTTPException(status_code=502, detail=f"Storage read failed: {exc}") from exc
+
+
+async def _read_chunk(cid: str, index: int, offset: int, length: int) -> bytes:
+    path = await _chunk(cid, index)
+    try:
+        return await asyncio.to_thread(_read, path, offset, length)
+    finally:
+        await asyncio.to_thread(chunk_cache.release_chunk, cid, index)
+
+
+@router.get("/stats")
+async def get_stream_cache_stats(current_user: dict = Depends(get_current_user)):
+    _require_platform_operator(current_user)
+    return chunk_cache.stats()
+
+
+@router.get("/gateways")
+async def get_gateway_ranking(current_user: dict = Depends(get_current_user)):
+    _require_platform_operator(current_user)
+    return {"gateways": gateway_registry.snapshot()}
+
+
+@router.get("/{cid}")
+async def stream_cid(cid: str, request: Request):
+    # Serves playback from the local chunk cache. A ranged response covers at most one cached
+    # chunk; players ask for the next range as they go. Chunk-aligned ranges are sent as the
+    # chunk file itself, zero-copy on servers with the ASGI pathsend extension.
+    if not settings.stream_proxy_enabled and get_backend().public_gateways:
+        raise HTTPException(status_code=404, detail="Stream proxy is disabled.")
+    if not CID_PATTERN.match(cid):
+        raise HTTPException(status_code=400, detail="Invalid CID.")
+
+    try:
+        size = await asyncio.to_thread(chunk_cache.object_size, cid)
+    except Exception as exc:
+        raise HTTPException(status_code=502, detail=f"Storage read failed: {exc}") from exc
+    chunk_bytes = chunk_cache.chunk_bytes
+    headers = {"Accept-Ranges": "bytes", "Cache-Control": "public, max-age=31536000, immutable"}
+
+    range_header = request.headers.get("range")
+    if range_header is None:
+        async def body():
+            for index in range((size + chunk_bytes - 1) // chunk_bytes):
+                yield await _read_chunk(cid, index, 0, chunk_bytes)
+
+        headers["Content-Length"] = str(size)
+        return StreamingResponse(body(), media_type=settings.stream_media_type, headers=headers)
+
+    start, end = _parse_range(range_header, size)
+    index = start // chunk_bytes
+    chunk_start = index * chunk_bytes
+    chunk_end = min(chunk_start + chunk_bytes, size) - 1
+    end = min(end, chunk_end)
+    headers["Content-Range"] = f"bytes {start}-{end}/{size}"
+    if start == chunk_start and end == chunk_end:
+        path = await _chunk(cid, index)
+        return _ChunkFileResponse(
+            path, (cid, index), status_code=206, media_type=settings.stream_media_type, headers=headers
+        )
+    content = await _read_chunk(cid, index, start - chunk_start, end - start + 1)
+    return Response(content=content, status_code=206, media_type=settings.stream_media_type, headers=headers)
@@ -1,63 +1,345 @@
 from __future__ import annotations
 
-from fastapi import APIRouter, Depends, File, Form, HTTPException, UploadFile
+import asyncio
+import hashlib
+import json
+import os
+import uuid
+import weakref
+from typing import BinaryIO
 
-from ..database import get_db
-from ..services import storage_service
+from fastapi import APIRouter, Depends, File, Form, Header, HTTPException, Request, Response, UploadFile
+from fastapi.responses import JSONResponse, StreamingResponse
+from pydantic import BaseModel, Field
+
+from ..config import settings
+from ..database import get_async_db
+from ..repository import Repository, get_repository
+from ..services import resumable_uploads, storage_service
+from ..services.batch_import import BatchImport, batch_spool_path
+from ..services.pinning_queue import COMPLETED, FAILED, QUEUED, RECEIVING, finish_upload, pinning_queue, spool_path
+from ..services.storage_backends import get_backend
 from .auth import get_current_user
 
 
 router = APIRouter()
+# A lock lives only while a chunk request holds it, so abandoned uploads leave nothing behind.
+_chunk_locks: weakref.WeakValueDictionary[str, asyncio.Lock] = weakref.WeakValueDictionary()
+
+
+class ResumableUploadCreate(BaseModel):
+    title: str = Field(min_length=1)
+    description: str = ""
+    filename: str | None = None
+    content_type: str | None = None
+    size_bytes: int = Field(gt=0)
+
 
+def _spool(source: BinaryIO, path: str) -> tuple[int, str]:
+    # Copies the upload to the spool directory, hashing it on the way for the CID index.
+    digest = hashlib.sha256()
+    with open(path, "wb") as target:
+        while chunk := source.read(settings.upload_chunk_bytes):
+            digest.update(chunk)
+            target.write(chunk)
+        return target.tell(), digest.hexdigest()
 
-@router.post("/upload")
+
+@router.post("/upload", status_code=202)
 async def upload_video(
     title: str = Form(...),
     description: str = Form(""),
     file: UploadFile = File(...),
     current_user: dict = Depends(get_current_user),
 ):
-    file_content = await file.read()
-    if not file_content:
+    # The file is spooled to local disk and pinned in the background; poll the job for the CID.
+    if storage_service.stream_size(file.file) <= 0:
         raise HTTPException(status_code=400, detail="Video file is empty.")
+    if not pinning_queue.running:
+        raise HTTPException(status_code=503, detail="Upload workers are not running.")
+
+    db = get_async_db()
+    created = await (
+        db.table("upload_jobs")
+        .insert(
+            {
+                "creator_id": current_user["user_id"],
+                "title": title.strip(),
+                "description": description.strip(),
+                "filename": file.filename or "video.mp4",
+                "content_type": file.content_type,
+                "status": QUEUED,
+            }
+        )
+        .execute()
+    )
+    if not created.data:
+        raise HTTPException(status_code=500, detail="Failed to create upload job.")
+    job = created.data[0]
 
     try:
-        cid = storage_service.upload_file(file_content, file.filename or "video.mp4")
-    except Exception as exc:
-        raise HTTPException(status_code=500, detail=f"Pinata upload failed: {exc}") from exc
-
-    db = get_db()
-    insert_payload = {
-        "creator_id": current_user["user_id"],
-        "cid": cid,
-        "title": title.strip(),
-        "description": description.strip(),
-        "ads_enabled": True,
-    }
-    created = db.table("videos").insert(insert_payload).execute()
+        job["size_bytes"], job["content_sha256"] = await asyncio.to_thread(_spool, file.file, spool_path(job["id"]))
+    except OSError as exc:
+        await db.table("upload_jobs").update({"status": FAILED, "error": f"Failed to spool upload: {exc}"}).eq(
+            "id", job["id"]
+        ).execute()
+        raise HTTPException(status_code=500, detail="Failed to store upload.") from exc
+    await db.table("upload_jobs").update({"size_bytes": job["size_bytes"], "content_sha256": job["content_sha256"]}).eq(
+        "id", job["id"]
+    ).execute()
+    return await _queue_spooled(job)
+
+
+async def _queue_spooled(job: dict) -> dict:
+    # Bytes pinned before complete here without a Pinata round trip.
+    cid = await asyncio.to_thread(storage_service.known_cid, job["content_sha256"])
+    if cid:
+        video_id = await asyncio.to_thread(finish_upload, job, cid)
+        if video_id is None:
+            raise HTTPException(status_code=500, detail="Failed to save video metadata.")
+        return {
+            "status": COMPLETED,
+            "job_id": job["id"],
+            "video_id": video_id,
+            "cid": cid,
+            "ipfs_url": storage_service.build_ipfs_url(cid),
+        }
+
+    pinning_queue.submit(job)
+    return {"status": QUEUED, "job_id": job["id"]}
+
+
+def _batch_metadata(metadata: str, files: list[UploadFile]) -> list[dict]:
+    # metadata is a JSON array of {"title", "description"} objects, one per file in order. Missing
+    # entries or titles fall back to the file name.
+    try:
+        entries = json.loads(metadata or "[]")
+    except json.JSONDecodeError as exc:
+        raise HTTPException(status_code=400, detail="metadata must be a JSON array.") from exc
+    if not isinstance(entries, list) or len(entries) > len(files):
+        raise HTTPException(status_code=400, detail="metadata must be a JSON array with at most one entry per file.")
+    described = []
+    for index, file in enumerate(files):
+        entry = entries[index] if index < len(entries) else {}
+        if not isinstance(entry, dict):
+            raise HTTPException(status_code=400, detail=f"metadata[{index}] must be an object.")
+        filename = file.filename or f"video-{index}.mp4"
+        described.append(
+            {
+                "index": index,
+                "filename": filename,
+                "content_type": file.content_type,
+                "title": str(entry.get("title") or os.path.splitext(filename)[0]).strip(),
+                "description": str(entry.get("description") or "").strip(),
+            }
+        )
+    return described
+
+
+@router.post("/batch-upload")
+async def batch_upload_videos(
+    files: list[UploadFile] = File(...),
+    metadata: str = Form("[]"),
+    stream: bool = True,
+    current_user: dict = Depends(get_current_user),
+):
+    # Imports a catalog in one request. Progress is streamed as NDJSON events (started, then pinned
+    # or failed per file, then completed with per-file results); stream=false waits and returns
+    # only the completed summary.
+    if len(files) > settings.batch_upload_max_files:
+        raise HTTPException(status_code=413, detail=f"Batches are limited to {settings.batch_upload_max_files} files.")
+    items = _batch_metadata(metadata, files)
+    for item, file in zip(items, files):
+        if storage_service.stream_size(file.file) <= 0:
+            raise HTTPException(status_code=400, detail=f"{item['filename']} is empty.")
+
+    batch_id = uuid.uuid4().hex
+    os.makedirs(settings.upload_spool_dir, exist_ok=True)
+    try:
+        for item, file in zip(items, files):
+            item["path"] = batch_spool_path(batch_id, item["index"])
+            item["size_bytes"], item["content_sha256"] = await asyncio.to_thread(_spool, file.file, item["path"])
+    except OSError as exc:
+        for item in items:
+            if "path" in item and os.path.exists(item["path"]):
+                os.remove(item["path"])
+        raise HTTPException(status_code=500, detail="Failed to store upload.") from exc
+
+    batch = BatchImport(current_user["user_id"], items)
+    batch.start()
+    if not stream:
+        return await batch.result()
+
+    async def body():
+        async for event in batch.events():
+            yield json.dumps(event) + "\n"
+
+    return StreamingResponse(body(), media_type="application/x-ndjson")
+
+
+async def _upload_job(job_id: str, current_user: dict, columns: str = "*") -> dict:
+    result = await (
+        get_async_db()
+        .table("upload_jobs")
+        .select(columns)
+        .eq("id", job_id)
+        .eq("creator_id", current_user["user_id"])
+        .limit(1)
+        .execute()
+    )
+    if not result.data:
+        raise HTTPException(status_code=404, detail="Upload job not found.")
+    return result.data[0]
+
+
+async def _receiving_job(job_id: str, current_user: dict) -> dict:
+    job = await _upload_job(job_id, current_user)
+    if job["status"] != RECEIVING:
+        raise HTTPException(status_code=409, detail=f"Upload is already {job['status']}.")
+    return job
+
+
+@router.post("/uploads", status_code=201)
+async def create_resumable_upload(payload: ResumableUploadCreate, current_user: dict = Depends(get_current_user)):
+    # tus-style resumable upload: PATCH chunks at Upload-Offset, then finalize to pin.
+    if payload.size_bytes > settings.resumable_max_upload_bytes:
+        raise HTTPException(status_code=413, detail=f"Uploads are limited to {settings.resumable_max_upload_bytes} bytes.")
+    created = await (
+        get_async_db()
+        .table("upload_jobs")
+        .insert(
+            {
+                "creator_id": current_user["user_id"],
+                "title": payload.title.strip(),
+                "description": payload.description.strip(),
+                "filename": payload.filename or "video.mp4",
+                "content_type": payload.content_type,
+                "size_bytes": payload.size_bytes,
+                "received_bytes": 0,
+                "status": RECEIVING,
+            }
+        )
+        .execute()
+    )
     if not created.data:
-        raise HTTPException(status_code=500, detail="Failed to save video metadata.")
-
-    created_video = created.data[0]
-    return {
-        "status": "success",
-        "video_id": created_video["id"],
-        "cid": cid,
-        "ipfs_url": storage_service.build_ipfs_url(cid),
-    }
+        raise HTTPException(status_code=500, detail="Failed to create upload job.")
+    job_id = created.data[0]["id"]
+    return JSONResponse(
+        status_code=201,
+        content={
+            "job_id": job_id,
+            "offset": 0,
+            "size_bytes": payload.size_bytes,
+            "max_chunk_bytes": settings.resumable_max_chunk_bytes,
+        },
+        headers={"Location": f"/videos/uploads/{job_id}", "Upload-Offset": "0", "Upload-Length": str(payload.size_bytes)},
+    )
+
+
+@router.head("/uploads/{job_id}")
+async def get_resumable_upload_offset(job_id: str, current_user: dict = Depends(get_current_user)):
+    job = await _upload_job(job_id, current_user, "id, status, size_bytes")
+    offset = resumable_uploads.received_bytes(job_id) if job["status"] == RECEIVING else int(job["size_bytes"])
+    return Response(
+        status_code=200,
+        headers={"Upload-Offset": str(offset), "Upload-Length": str(job["size_bytes"]), "Cache-Control": "no-store"},
+    )
+
+
+@router.patch("/uploads/{job_id}", status_code=204)
+async def upload_chunk(
+    job_id: str,
+    request: Request,
+    upload_offset: int = Header(..., alias="Upload-Offset"),
+    upload_checksum: str | None = Header(None, alias="Upload-Checksum"),
+    current_user: dict = Depends(get_current_user),
+):
+    job = await _receiving_job(job_id, current_user)
+    lock = _chunk_locks.setdefault(job_id, asyncio.Lock())
+    if lock.locked():
+        raise HTTPException(status_code=409, detail="Another chunk of this upload is being written.")
+    async with lock:
+        try:
+            offset = await resumable_uploads.write_chunk(
+                job_id,
+                upload_offset,
+                int(job["size_bytes"]),
+                request.stream(),
+                resumable_uploads.parse_checksum(upload_checksum),
+            )
+        except resumable_uploads.ChunkRejected as exc:
+            raise HTTPException(
+                status_code=exc.status_code,
+                detail=exc.detail,
+                headers={"Upload-Offset": str(resumable_uploads.received_bytes(job_id))},
+            ) from exc
+    await get_async_db().table("upload_jobs").update({"received_bytes": offset}).eq("id", job_id).execute()
+    return Response(status_code=204, headers={"Upload-Offset": str(offset)})
+
+
+@router.post("/uploads/{job_id}/finalize", status_code=202)
+async def finalize_resumable_upload(job_id: str, current_user: dict = Depends(get_current_user)):
+    job = await _receiving_job(job_id, current_user)
+    if not pinning_queue.running:
+        raise HTTPException(status_code=503, detail="Upload workers are not running.")
+    received = resumable_uploads.received_bytes(job_id)
+    if received != int(job["size_bytes"]):
+        raise HTTPException(
+            status_code=409,
+            detail=f"Upload incomplete: {received} of {job['size_bytes']} bytes received.",
+            headers={"Upload-Offset": str(received)},
+        )
+
+    try:
+        size, job["content_sha256"] = await asyncio.to_thread(resumable_uploads.assemble, job_id, spool_path(job_id))
+    except (OSError, RuntimeError) as exc:
+        raise HTTPException(
+            status_code=409,
+            detail=str(exc),
+            headers={"Upload-Offset": str(resumable_uploads.received_bytes(job_id))},
+        ) from exc
+    await asyncio.to_thread(resumable_uploads.discard, job_id)
+
+    job["status"] = QUEUED
+    await get_async_db().table("upload_jobs").update(
+        {"status": QUEUED, "received_bytes": size, "content_sha256": job["content_sha256"]}
+    ).eq("id", job_id).execute()
+    return await _queue_spooled(job)
+
+
+@router.get("/upload/{job_id}")
+async def get_upload_job(job_id: str, current_user: dict = Depends(get_current_user)):
+    job = await _upload_job(
+        job_id, current_user, "id, status, attempts, size_bytes, received_bytes, cid, video_id, error, created_at, updated_at"
+    )
+    if job["cid"]:
+        job["ipfs_url"] = storage_service.build_ipfs_url(job["cid"])
+    return job
+
+
+def _with_playback_urls(videos: list[dict], fallbacks: bool) -> list[dict]:
+    # Gateways are ranked once per response so every video points at the same, fastest gateway.
+    prefixes = get_backend().url_prefixes()
+    for video in videos:
+        video["ipfs_url"] = f"{prefixes[0]}/{video['cid']}"
+        if fallbacks:
+            video["ipfs_fallback_urls"] = [f"{prefix}/{video['cid']}" for prefix in prefixes[1:]]
+        if settings.stream_proxy_enabled:
+            video["stream_url"] = f"/stream/{video['cid']}"
+    return videos
 
 
 @router.get("/list")
-async def list_videos():
-    db = get_db()
-    videos = db.table("videos").select("*, users(username, wallet_address)").order("created_at", desc=True).execute()
-    return videos.data or []
+async def list_videos(fallbacks: bool = False):
+    db = get_async_db()
+    videos = await db.table("videos").select("*, users(username, wallet_address)").order("created_at", desc=True).execute()
+    return _with_playback_urls(videos.data or [], fallbacks)
 
 
 @router.get("/me")
 async def list_my_videos(current_user: dict = Depends(get_current_user)):
-    db = get_db()
-    videos = (
+    db = get_async_db()
+    videos = await (
         db.table("videos")
         .select("*")
         .eq("creator_id", current_user["user_id"])
@@ -68,18 +350,15 @@ async def list_my_videos(current_user: dict = Depends(get_current_user)):
 
 
 @router.get("/{video_id}")
-async def get_video(video_id: str):
-    db = get_db()
-    result = (
-        db.table("videos")
-        .select("*, users(username, wallet_address)")
-        .eq("id", video_id)
-        .limit(1)
-        .execute()
-    )
-    if not result.data:
+async def get_video(video_id: str, fallbacks: bool = False, repo: Repository = Depends(get_repository)):
+    video = await repo.video(video_id)
+    if not video:
         raise HTTPException(status_code=404, detail="Video not found.")
+    creator = await repo.user(video["creator_id"])
 
-    video = result.data[0]
-    video["ipfs_url"] = storage_service.build_ipfs_url(video["cid"])
-    return video
+    # Same shape as the users(username, wallet_address) embed of /videos/list.
+    video = {
+        **video,
+        "users": {"username": creator["username"], "wallet_address": creator["wallet_address"]} if creator else None,
+    }
+    return _with_playback_urls([video], fallbacks)[0]
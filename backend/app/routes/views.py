@@ -5,7 +5,8 @@ from datetime import datetime, timezone
 from fastapi import APIRouter, Depends, HTTPException, Request
 from pydantic import BaseModel
 
-from ..database import get_db
+from ..database import get_async_db
+from ..repository import Repository, get_repository
 from ..utils import anti_bot
 from .auth import get_current_user
 
@@ -25,6 +26,7 @@ async def track_view(
     payload: TrackViewRequest,
     request: Request,
     current_user: dict = Depends(get_current_user),
+    repo: Repository = Depends(get_repository),
 ):
     wallet_address = current_user["wallet_address"]
     if payload.wallet and payload.wallet != wallet_address:
@@ -43,18 +45,10 @@ async def track_view(
     if not is_valid:
         return {"status": "ignored", "reason": reason}
 
-    db = get_db()
-    video_res = (
-        db.table("videos")
-        .select("id, total_views, total_watch_time, ads_enabled")
-        .eq("id", payload.video_id)
-        .limit(1)
-        .execute()
-    )
-    if not video_res.data:
+    video = await repo.video(payload.video_id)
+    if not video:
         raise HTTPException(status_code=404, detail="Video not found.")
 
-    video = video_res.data[0]
     insert_payload = {
         "video_id": payload.video_id,
         "viewer_wallet": wallet_address,
@@ -63,11 +57,12 @@ async def track_view(
         "viewer_fingerprint": fingerprint,
         "timestamp": datetime.now(timezone.utc).isoformat(),
     }
-    created = db.table("views").insert(insert_payload).execute()
+    db = get_async_db()
+    created = await db.table("views").insert(insert_payload).execute()
     if not created.data:
         raise HTTPException(status_code=500, detail="Failed to store view.")
 
-    db.table("videos").update(
+    await db.table("videos").update(
         {
             "total_views": int(video.get("total_views", 0)) + 1,
             "total_watch_time": int(video.get("total_watch_time", 0)) + int(payload.watch_seconds),
@@ -1,17 +1,27 @@
 from __future__ import annotations
 
-from decimal import Decimal
+import asyncio
 
 from fastapi import APIRouter, Depends, HTTPException
+from pydantic import BaseModel, Field
 
 from ..config import settings
-from ..services import algorand_service
+from ..services import algorand_service, solvency
+from ..utils.units import to_tokens
 from .auth import get_current_user
 
 
 router = APIRouter()
 
 
+class BulkBalanceRequest(BaseModel):
+    wallets: list[str] = Field(min_length=1)
+
+
+class OptInReport(BaseModel):
+    tx_hash: str = Field(min_length=1)
+
+
 def _require_platform_operator(current_user: dict) -> None:
     configured_platform = (settings.platform_wallet or "").strip().lower()
     if not configured_platform:
@@ -22,21 +32,17 @@ def _require_platform_operator(current_user: dict) -> None:
         raise HTTPException(status_code=403, detail="Only platform wallet can access this resource.")
 
 
-def _to_float(value: Decimal) -> float:
-    return float(value.quantize(Decimal("0.000001")))
-
-
 @router.get("/balance")
 async def get_my_wallet_balance(current_user: dict = Depends(get_current_user)):
     wallet = current_user["wallet_address"]
     try:
-        balance = algorand_service.get_asset_balance(wallet)
+        balance = await algorand_service.get_asset_balance_async(wallet)
     except Exception as exc:
         raise HTTPException(status_code=502, detail=str(exc)) from exc
     return {
         "wallet_address": wallet,
         "asset_id": settings.asset_id,
-        "balance": _to_float(balance),
+        "balance": to_tokens(balance),
     }
 
 
@@ -45,11 +51,51 @@ async def get_platform_wallet_balance(current_user: dict = Depends(get_current_u
     _require_platform_operator(current_user)
     platform_wallet = (settings.platform_wallet or "").strip()
     try:
-        balance = algorand_service.get_asset_balance(platform_wallet)
+        balance = await algorand_service.get_asset_balance_async(platform_wallet)
     except Exception as exc:
         raise HTTPException(status_code=502, detail=str(exc)) from exc
     return {
         "wallet_address": platform_wallet,
         "asset_id": settings.asset_id,
-        "balance": _to_float(balance),
+        "balance": to_tokens(balance),
     }
+
+
+@router.get("/solvency")
+async def get_platform_solvency(current_user: dict = Depends(get_current_user)):
+    # Pending settlement liabilities against the balances that pay them.
+    _require_platform_operator(current_user)
+    try:
+        return await asyncio.to_thread(solvency.forecast)
+    except Exception as exc:
+        raise HTTPException(status_code=502, detail=str(exc)) from exc
+
+
+@router.post("/balances")
+async def get_wallet_balances(payload: BulkBalanceRequest, current_user: dict = Depends(get_current_user)):
+    if len(payload.wallets) > settings.balance_bulk_max_wallets:
+        raise HTTPException(
+            status_code=400,
+            detail=f"At most {settings.balance_bulk_max_wallets} wallets per request.",
+        )
+
+    results = await algorand_service.get_asset_balances_async(payload.wallets)
+    balances = []
+    for wallet, result in results.items():
+        if isinstance(result, Exception):
+            balances.append({"wallet_address": wallet, "balance": None, "error": str(result)})
+        else:
+            balances.append({"wallet_address": wallet, "balance": to_tokens(result)})
+    return {"asset_id": settings.asset_id, "balances": balances}
+
+
+@router.post("/opt-in")
+async def report_opt_in(payload: OptInReport, current_user: dict = Depends(get_current_user)):
+    wallet = current_user["wallet_address"]
+    try:
+        recorded = await asyncio.to_thread(algorand_service.record_opt_in, wallet, payload.tx_hash.strip())
+    except Exception as exc:
+        raise HTTPException(status_code=502, detail=str(exc)) from exc
+    if not recorded:
+        raise HTTPException(status_code=400, detail="Transaction is not a confirmed opt-in to the platform asset by this wallet.")
+    return {"wallet_address": wallet, "asset_id": settings.asset_id, "opted_in": True}
@@ -45,6 +45,9 @@ class AdCampaign(BaseModel):
     id: str
     advertiser_wallet: str
     video_id: str
+    budget_units: int
+    remaining_budget_units: int
+    reward_per_view_units: int
     budget: float
     remaining_budget: float
     reward_per_view: float
@@ -59,6 +62,7 @@ class BannerCampaign(BaseModel):
     id: str
     advertiser_wallet: str
     tier: str
+    fixed_price_units: int
     fixed_price: float
     start_date: str
     end_date: str
@@ -72,9 +76,14 @@ class BannerCampaign(BaseModel):
 class Settlement(BaseModel):
     id: str
     creator_wallet: str
+    amount_units: int
+    platform_fee_units: int
     amount: float
     platform_fee: float
     tx_hash: str | None = None
+    confirmed_round: int | None = None
+    reconciliation_status: str | None = None
+    reconciliation_error: str | None = None
     settlement_type: str
     timestamp: datetime
 
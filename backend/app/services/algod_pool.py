@@ -0,0 +1,236 @@
+from __future__ import annotations
+
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Any
+
+import requests
+from algosdk import constants, error
+from algosdk.v2client import algod
+from algosdk.v2client.algod import api_version_path_prefix
+from requests.adapters import HTTPAdapter
+
+from ..config import settings
+
+
+# Reads that are safe to send to two nodes at once and that sit on the payout/balance hot path.
+HEDGED_PREFIXES = ("/accounts/", "/transactions/pending/")
+# Long-poll endpoints whose latency says nothing about node health.
+UNTIMED_PREFIXES = ("/status/wait-for-block-after/",)
+_LATENCY_WINDOW = 200
+_MIN_SAMPLES_FOR_PERCENTILE = 20
+
+
+class PooledAlgodClient(algod.AlgodClient):
+    # algosdk opens a new urllib connection per request; reuse keep-alive connections instead.
+
+    def __init__(self, algod_token: str, algod_address: str, pool_size: int = 10) -> None:
+        super().__init__(algod_token, algod_address)
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=max(1, pool_size))
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+    def algod_request(
+        self,
+        method: str,
+        requrl: str,
+        params: dict[str, Any] | None = None,
+        data: bytes | None = None,
+        headers: dict[str, str] | None = None,
+        response_format: str | None = "json",
+        timeout: int | None = 30,
+    ) -> Any:
+        header = {"User-Agent": "py-algorand-sdk"}
+        if self.headers:
+            header.update(self.headers)
+        if headers:
+            header.update(headers)
+        if requrl not in constants.no_auth:
+            header[constants.algod_auth_header] = self.algod_token
+        if requrl not in constants.unversioned_paths:
+            requrl = api_version_path_prefix + requrl
+
+        response = self.session.request(
+            method,
+            self.algod_address + requrl,
+            params=params or None,
+            data=data,
+            headers=header,
+            timeout=timeout,
+        )
+        if response.status_code >= 400:
+            try:
+                body = response.json()
+            except ValueError:
+                body = {}
+            raise error.AlgodHTTPError(body.get("message", response.text), response.status_code, body.get("data"))
+        if response_format != "json":
+            return response.content
+        if not response.content:
+            return {}
+        try:
+            return response.json()
+        except ValueError as exc:
+            raise error.AlgodResponseError("Failed to parse JSON response from algod") from exc
+
+
+class EndpointStats:
+    def __init__(self, address: str) -> None:
+        self.address = address
+        self._lock = threading.Lock()
+        self._latencies: deque[float] = deque(maxlen=_LATENCY_WINDOW)
+        self.requests = 0
+        self.errors = 0
+        self.hedges_won = 0
+        self.error_rate = 0.0
+        self.consecutive_errors = 0
+        self.cooldown_until = 0.0
+
+    def record(self, seconds: float | None, ok: bool) -> None:
+        with self._lock:
+            self.requests += 1
+            if seconds is not None:
+                self._latencies.append(seconds)
+            # Exponentially weighted so a node that recovers is trusted again quickly.
+            self.error_rate = self.error_rate * 0.9 + (0.0 if ok else 0.1)
+            if ok:
+                self.consecutive_errors = 0
+                return
+            self.errors += 1
+            self.consecutive_errors += 1
+            if self.consecutive_errors >= settings.algod_endpoint_failure_threshold:
+                self.cooldown_until = time.monotonic() + settings.algod_endpoint_cooldown_seconds
+
+    def percentile(self, pct: float) -> float | None:
+        with self._lock:
+            if len(self._latencies) < _MIN_SAMPLES_FOR_PERCENTILE:
+                return None
+            ordered = sorted(self._latencies)
+        index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+        return ordered[index]
+
+    def score(self) -> float:
+        # Lower is healthier. Untried nodes score 0 so they get probed early.
+        median = self.percentile(50)
+        if median is None:
+            with self._lock:
+                if self._latencies:
+                    median = sum(self._latencies) / len(self._latencies)
+                elif self.requests:
+                    # Only failures so far: assume it is no better than the hedge fallback.
+                    median = settings.algod_hedge_default_delay_ms / 1000
+                else:
+                    median = 0.0
+        score = median * (1.0 + 10.0 * self.error_rate)
+        if time.monotonic() < self.cooldown_until:
+            score += 1_000.0
+        return score
+
+    def snapshot(self) -> dict[str, Any]:
+        p50 = self.percentile(50)
+        p95 = self.percentile(95)
+        return {
+            "address": self.address,
+            "requests": self.requests,
+            "errors": self.errors,
+            "error_rate": round(self.error_rate, 4),
+            "hedges_won": self.hedges_won,
+            "p50_ms": None if p50 is None else round(p50 * 1000, 2),
+            "p95_ms": None if p95 is None else round(p95 * 1000, 2),
+            "cooling_down": time.monotonic() < self.cooldown_until,
+        }
+
+
+def is_node_failure(exc: BaseException) -> bool:
+    # A 4xx is a valid answer from a healthy node (e.g. a pending txid it has not seen yet).
+    if isinstance(exc, error.AlgodHTTPError):
+        return exc.code is None or exc.code >= 500
+    return True
+
+
+class AlgodEndpointPool(algod.AlgodClient):
+    # Routes every algod call to the healthiest of several nodes and hedges slow reads.
+
+    def __init__(self, algod_token: str, addresses: list[str], pool_size: int = 10) -> None:
+        if not addresses:
+            raise RuntimeError("At least one algod address must be configured.")
+        super().__init__(algod_token, addresses[0])
+        self.endpoints = [PooledAlgodClient(algod_token, address, pool_size=pool_size) for address in addresses]
+        self.stats = {endpoint.algod_address: EndpointStats(endpoint.algod_address) for endpoint in self.endpoints}
+        self._executor = ThreadPoolExecutor(
+            max_workers=max(2, pool_size * len(self.endpoints)),
+            thread_name_prefix="algod-hedge",
+        )
+
+    def ranked_endpoints(self) -> list[PooledAlgodClient]:
+        return sorted(self.endpoints, key=lambda endpoint: self.stats[endpoint.algod_address].score())
+
+    def health(self) -> list[dict[str, Any]]:
+        return [self.stats[endpoint.algod_address].snapshot() for endpoint in self.ranked_endpoints()]
+
+    def _timed_request(self, endpoint: PooledAlgodClient, timed: bool, args: tuple, kwargs: dict[str, Any]) -> Any:
+        stats = self.stats[endpoint.algod_address]
+        started = time.perf_counter()
+        try:
+            result = endpoint.algod_request(*args, **kwargs)
+        except Exception as exc:
+            stats.record(None, not is_node_failure(exc))
+            raise
+        stats.record(time.perf_counter() - started if timed else None, True)
+        return result
+
+    def hedge_delay(self, address: str) -> float:
+        threshold = self.stats[address].percentile(settings.algod_hedge_percentile)
+        if threshold is None:
+            return settings.algod_hedge_default_delay_ms / 1000
+        return max(threshold, settings.algod_hedge_min_delay_ms / 1000)
+
+    def _hedged_request(self, ranked: list[PooledAlgodClient], args: tuple, kwargs: dict[str, Any]) -> Any:
+        primary, backup = ranked[0], ranked[1]
+        futures: dict[Future, PooledAlgodClient] = {
+            self._executor.submit(self._timed_request, primary, True, args, kwargs): primary
+        }
+        done, _ = wait(futures, timeout=self.hedge_delay(primary.algod_address))
+        primary_error = next(iter(done)).exception() if done else None
+        if primary_error is not None and not is_node_failure(primary_error):
+            # A 4xx (e.g. a 404 for a wallet without the asset) is the answer, not a slow node.
+            raise primary_error
+        if not done or primary_error is not None:
+            futures[self._executor.submit(self._timed_request, backup, True, args, kwargs)] = backup
+
+        first_error: BaseException | None = None
+        pending = set(futures)
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                exc = future.exception()
+                if exc is None:
+                    if futures[future] is backup:
+                        self.stats[backup.algod_address].hedges_won += 1
+                    return future.result()
+                if not is_node_failure(exc):
+                    raise exc
+                first_error = first_error or exc
+        assert first_error is not None
+        raise first_error
+
+    def algod_request(self, method: str, requrl: str, *args: Any, **kwargs: Any) -> Any:
+        call_args = (method, requrl, *args)
+        ranked = self.ranked_endpoints()
+        if method == "GET" and len(ranked) > 1 and requrl.startswith(HEDGED_PREFIXES):
+            return self._hedged_request(ranked, call_args, kwargs)
+
+        timed = not requrl.startswith(UNTIMED_PREFIXES)
+        last_error: BaseException | None = None
+        for endpoint in ranked:
+            try:
+                return self._timed_request(endpoint, timed, call_args, kwargs)
+            except Exception as exc:
+                if not is_node_failure(exc):
+                    raise
+                last_error = exc
+        assert last_error is not None
+        raise last_error
@@ -1,219 +1,910 @@
 from __future__ import annotations
 
-import base64
-from decimal import Decimal, ROUND_DOWN
-from typing import Any
-
-from algosdk import account, mnemonic, util
+import asyncio
+import copy
+import logging
+import os
+import threading
+import time
+from collections.abc import Callable, Iterator
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from typing import Any, NamedTuple
+
+from algosdk import account, error, mnemonic
 from algosdk.transaction import AssetTransferTxn, wait_for_confirmation
-from algosdk.v2client import algod
+from algosdk.v2client import algod, indexer
 from algosdk import transaction
 
 from ..config import settings
+from ..utils.ttl_cache import TTLCache
+from .algod_pool import AlgodEndpointPool
+from .async_algod import AsyncAlgodClient
+from .confirmation_tracker import ConfirmationTracker
+from .hot_wallets import HotWallet, HotWalletPool
+from .optin_index import OptInIndex
+from .signature_verifier import SignatureVerifier
+
+logger = logging.getLogger(__name__)
+
+
+class _ThreadedAlgodClient:
+    # Async facade over a synchronous client (e.g. the simulator's) using worker threads.
+
+    def __init__(self, client: Any) -> None:
+        self._client = client
+
+    def __getattr__(self, name: str) -> Callable[..., Any]:
+        method = getattr(self._client, name)
+
+        async def call(*args: Any, **kwargs: Any) -> Any:
+            return await asyncio.to_thread(method, *args, **kwargs)
+
+        return call
+
+    async def wait_for_confirmation(self, txid: str, wait_rounds: int = 4) -> dict[str, Any]:
+        return await asyncio.to_thread(wait_for_confirmation, self._client, txid, wait_rounds)
+
+    async def aclose(self) -> None:
+        return None
+
+
+class AlgodClientManager:
+    # Process-wide algod client, signer and suggested-params cache shared by every payout helper.
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._client: Any | None = None
+        self._signer: tuple[str, str] | None = None
+        self._params: transaction.SuggestedParams | None = None
+        self._params_fetched_at = 0.0
+        self._latest_round = 0
+        self._async_client: Any | None = None
+        self._indexer: Any | None = None
+        self._indexer_loaded = False
+
+    def client(self) -> algod.AlgodClient:
+        if self._client is None:
+            with self._lock:
+                if self._client is None:
+                    self._client = AlgodEndpointPool(
+                        settings.algod_token,
+                        settings.algod_address_list,
+                        pool_size=settings.algod_pool_size,
+                    )
+        return self._client
+
+    def indexer(self) -> indexer.IndexerClient | None:
+        # Optional; without INDEXER_ADDRESS transaction lookups fall back to algod.
+        if not self._indexer_loaded:
+            with self._lock:
+                if not self._indexer_loaded:
+                    if settings.indexer_address:
+                        self._indexer = indexer.IndexerClient(settings.indexer_token, settings.indexer_address.rstrip("/"))
+                    self._indexer_loaded = True
+        return self._indexer
+
+    def signer(self) -> tuple[str, str]:
+        if self._signer is None:
+            if not settings.algorand_mnemonic:
+                raise RuntimeError("ALGORAND_MNEMONIC is not configured.")
+            with self._lock:
+                if self._signer is None:
+                    private_key = mnemonic.to_private_key(settings.algorand_mnemonic)
+                    self._signer = (private_key, account.address_from_private_key(private_key))
+        return self._signer
+
+    def _params_stale(self) -> bool:
+        if self._params is None:
+            return True
+        if time.monotonic() - self._params_fetched_at >= settings.algod_params_ttl_seconds:
+            return True
+        return self._latest_round - self._params.first >= settings.algod_params_max_rounds
+
+    def _store_params(self, params: transaction.SuggestedParams) -> None:
+        self._params = params
+        self._params_fetched_at = time.monotonic()
+        self._latest_round = max(self._latest_round, params.first)
+
+    def _next_params(self) -> transaction.SuggestedParams:
+        # A copy, so a builder adjusting its params cannot change the shared ones. Transactions
+        # built from the same params are kept distinct by their lease, see _unique_lease.
+        return copy.copy(self._params)
+
+    def suggested_params(self) -> transaction.SuggestedParams:
+        with self._lock:
+            if self._params_stale():
+                self._store_params(self.client().suggested_params())
+            return self._next_params()
+
+    async def suggested_params_async(self) -> transaction.SuggestedParams:
+        with self._lock:
+            stale = self._params_stale()
+        if stale:
+            fresh = await self.async_client().suggested_params()
+            with self._lock:
+                self._store_params(fresh)
+        with self._lock:
+            return self._next_params()
+
+    def async_client(self) -> Any:
+        if self._async_client is None:
+            client = self.client()
+            with self._lock:
+                if self._async_client is None:
+                    if isinstance(client, AlgodEndpointPool):
+                        self._async_client = AsyncAlgodClient(client, pool_size=settings.algod_pool_size)
+                    else:
+                        self._async_client = _ThreadedAlgodClient(client)
+        return self._async_client
+
+    async def aclose(self) -> None:
+        async_client, self._async_client = self._async_client, None
+        if async_client is not None:
+            await async_client.aclose()
+
+    def note_round(self, round_num: int | None) -> None:
+        if round_num and round_num > self._latest_round:
+            self._latest_round = round_num
+
+    def warm_up(self) -> None:
+        self.client()
+        if settings.algorand_mnemonic:
+            self.signer()
+
+    @contextmanager
+    def override(self, client: Any, private_key: str) -> Iterator[None]:
+        with self._lock:
+            previous = (
+                self._client,
+                self._async_client,
+                self._signer,
+                self._params,
+                self._params_fetched_at,
+                self._latest_round,
+                self._indexer,
+                self._indexer_loaded,
+            )
+            self._client = client
+            self._async_client = None
+            # The substitute node is also the only transaction source.
+            self._indexer, self._indexer_loaded = None, True
+            self._signer = (private_key, account.address_from_private_key(private_key))
+            self._params, self._params_fetched_at, self._latest_round = None, 0.0, 0
+        try:
+            yield
+        finally:
+            with self._lock:
+                (
+                    self._client,
+                    self._async_client,
+                    self._signer,
+                    self._params,
+                    self._params_fetched_at,
+                    self._latest_round,
+                    self._indexer,
+                    self._indexer_loaded,
+                ) = previous
+
+
+client_manager = AlgodClientManager()
+confirmation_tracker = ConfirmationTracker(lambda: client_manager.client())
+optin_index = OptInIndex(lambda: client_manager.client())
+hot_wallet_pool = HotWalletPool(lambda: settings.payout_hot_wallet_mnemonic_list)
 
 
 def get_algod_client() -> algod.AlgodClient:
-    return algod.AlgodClient(settings.algod_token, settings.algod_address)
+    return client_manager.client()
 
 
-def _token_scale() -> Decimal:
-    return Decimal(10) ** settings.token_decimals
+def get_async_algod_client() -> Any:
+    return client_manager.async_client()
 
 
-def _token_quantizer() -> Decimal:
-    if settings.token_decimals <= 0:
-        return Decimal("1")
-    return Decimal(f"1.{'0' * settings.token_decimals}")
+def warm_up() -> None:
+    client_manager.warm_up()
 
 
-def to_base_units(amount_tokens: Decimal | float | int | str) -> int:
-    amount = Decimal(str(amount_tokens))
-    if amount <= 0:
-        return 0
-    scaled = (amount * _token_scale()).quantize(Decimal("1"), rounding=ROUND_DOWN)
-    return int(scaled)
+async def aclose() -> None:
+    signature_verifier.shutdown()
+    await client_manager.aclose()
 
 
-def from_base_units(amount_base_units: int) -> Decimal:
-    if amount_base_units <= 0:
-        return Decimal("0").quantize(_token_quantizer())
-    return (Decimal(amount_base_units) / _token_scale()).quantize(_token_quantizer())
+@contextmanager
+def use_algod(client: Any, private_key: str) -> Iterator[None]:
+    # Swaps the node and signing key, e.g. for the settlement dry-run simulator.
+    with client_manager.override(client, private_key):
+        yield
+
+
+def _asset_amount(info: dict[str, Any]) -> int:
+    holdings = info.get("assets") or []
+    for holding in holdings:
+        if int(holding.get("asset-id", 0)) == int(settings.asset_id):
+            return int(holding.get("amount", 0))
+    return 0
 
 
-def get_asset_balance(wallet_address: str) -> Decimal:
+balance_cache: TTLCache[str, int] = TTLCache(lambda: settings.balance_cache_ttl_seconds)
+
+
+def get_asset_balance(wallet_address: str) -> int:
     wallet = (wallet_address or "").strip()
     if not wallet:
-        return Decimal("0").quantize(_token_quantizer())
+        return 0
     if settings.asset_id <= 0:
-        return Decimal("0").quantize(_token_quantizer())
+        return 0
 
     client = get_algod_client()
-    info = client.account_info(wallet)
-    holdings = info.get("assets") or []
-    for holding in holdings:
-        if int(holding.get("asset-id", 0)) == int(settings.asset_id):
-            amount = int(holding.get("amount", 0))
-            return from_base_units(amount)
-    return Decimal("0").quantize(_token_quantizer())
+    return balance_cache.get_or_load(wallet, lambda: _asset_amount(client.account_info(wallet)))
 
 
-def _decode_signature(signature: str) -> bytes:
+async def get_asset_balance_async(wallet_address: str) -> int:
+    wallet = (wallet_address or "").strip()
+    if not wallet:
+        return 0
+    if settings.asset_id <= 0:
+        return 0
+
+    client = get_async_algod_client()
+
+    async def load() -> int:
+        return _asset_amount(await client.account_info(wallet))
+
+    return await balance_cache.get_or_load_async(wallet, load)
+
+
+async def get_asset_balances_async(wallet_addresses: list[str]) -> dict[str, int | Exception]:
+    semaphore = asyncio.Semaphore(max(1, settings.balance_bulk_concurrency))
+
+    async def one(wallet: str) -> int | Exception:
+        async with semaphore:
+            try:
+                return await get_asset_balance_async(wallet)
+            except Exception as exc:
+                return exc
+
+    wallets = list(dict.fromkeys(wallet.strip() for wallet in wallet_addresses if wallet and wallet.strip()))
+    results = await asyncio.gather(*(one(wallet) for wallet in wallets))
+    return dict(zip(wallets, results))
+
+
+def split_opted_in(wallet_addresses: list[str]) -> tuple[set[str], set[str]]:
+    # (payable, not opted in) for payout receivers, from the opt-in index refreshed in bulk.
+    return optin_index.split(wallet_addresses)
+
+
+def record_opt_in(wallet_address: str, txid: str) -> bool:
+    # A wallet reports its own opt-in transaction; once it is confirmed on chain the wallet is
+    # marked payable without waiting for its negative opt-in entry to expire.
     try:
-        return base64.b64decode(signature)
-    except Exception:
-        try:
-            return bytes.fromhex(signature)
-        except Exception:
-            return signature.encode("utf-8")
+        info = get_algod_client().pending_transaction_info(txid)
+    except error.AlgodHTTPError as exc:
+        if exc.code == 404:
+            return False
+        raise
+    txn = (info.get("txn") or {}).get("txn") or {}
+    is_opt_in = (
+        txn.get("type") == "axfer"
+        and txn.get("snd") == wallet_address
+        and txn.get("arcv") == wallet_address
+        and int(txn.get("xaid") or 0) == int(settings.asset_id)
+    )
+    if not is_opt_in or not info.get("confirmed-round"):
+        return False
+    optin_index.mark(wallet_address, True)
+    balance_cache.invalidate(wallet_address)
+    return True
+
+
+def _invalidate_balances(txn: transaction.Transaction) -> None:
+    # Drop cached balances for every wallet this transaction moves tokens between.
+    balance_cache.invalidate(txn.sender)
+    receiver = getattr(txn, "receiver", None)
+    if receiver:
+        balance_cache.invalidate(receiver)
+    for wallet in getattr(txn, "accounts", None) or []:
+        balance_cache.invalidate(wallet)
+
+
+signature_verifier = SignatureVerifier(
+    workers=lambda: settings.signature_verify_workers,
+    cache_size=lambda: settings.signature_cache_size,
+    batch_size=lambda: settings.signature_verify_batch_size,
+)
 
 
 def verify_signature(wallet_address: str, message: str, signature: str) -> bool:
-    if not wallet_address or not message or not signature:
-        return False
+    return signature_verifier.verify(wallet_address, message, signature)
+
+
+async def verify_signature_async(wallet_address: str, message: str, signature: str) -> bool:
+    return await signature_verifier.verify_async(wallet_address, message, signature)
+
+
+def _get_signer() -> tuple[str, str]:
+    return client_manager.signer()
+
+
+TxnBuilder = Callable[[str, transaction.SuggestedParams], transaction.Transaction]
+
+
+class Submission(NamedTuple):
+    txid: str
+    confirmed_round: int
+
+
+def _sign(build: TxnBuilder, signer: tuple[str, str] | None = None) -> transaction.SignedTransaction:
+    private_key, sender_address = signer or _get_signer()
+    return build(sender_address, client_manager.suggested_params()).sign(private_key)
 
+
+def _sign_and_submit(build: TxnBuilder, signer: tuple[str, str] | None = None) -> Submission:
+    return _submit_signed(_sign(build, signer))
+
+
+def _submit_signed(signed_txn: transaction.SignedTransaction) -> Submission:
+    client = get_algod_client()
+    txn = signed_txn.transaction
+    pending = confirmation_tracker.track(signed_txn.get_txid(), txn.last_valid_round, wait_rounds=4)
     try:
-        signature_bytes = _decode_signature(signature)
-        return util.verify_bytes(message.encode("utf-8"), signature_bytes, wallet_address)
+        txid = client.send_transaction(signed_txn)
+        confirmed_round = confirmation_tracker.wait(pending)
     except Exception:
-        return False
+        confirmation_tracker.forget(pending)
+        raise
+    finally:
+        _invalidate_balances(txn)
+    client_manager.note_round(confirmed_round)
+    return Submission(txid, confirmed_round)
 
 
-def _get_signer() -> tuple[str, str]:
-    if not settings.algorand_mnemonic:
-        raise RuntimeError("ALGORAND_MNEMONIC is not configured.")
+async def _sign_and_submit_async(build: TxnBuilder) -> Submission:
+    client = get_async_algod_client()
+    private_key, sender_address = _get_signer()
+    txn = build(sender_address, await client_manager.suggested_params_async())
+    signed_txn = txn.sign(private_key)
+    pending = confirmation_tracker.track(signed_txn.get_txid(), txn.last_valid_round, wait_rounds=4)
+    try:
+        txid = await client.send_transaction(signed_txn)
+        confirmed_round = await confirmation_tracker.wait_async(pending)
+    except Exception:
+        confirmation_tracker.forget(pending)
+        raise
+    finally:
+        _invalidate_balances(txn)
+    client_manager.note_round(confirmed_round)
+    return Submission(txid, confirmed_round)
+
 
-    private_key = mnemonic.to_private_key(settings.algorand_mnemonic)
-    sender_address = account.address_from_private_key(private_key)
-    return private_key, sender_address
+def _unique_lease() -> bytes:
+    # Shared suggested params would give otherwise identical transfers (same receiver, amount
+    # and note) the same txid. A random lease makes every transaction distinct without touching
+    # its validity window; two random leases never collide, so none is ever refused for reuse.
+    return os.urandom(32)
 
 
-def _send_asset_transfer(receiver_wallet: str, amount_base_units: int, note: str | None = None) -> str:
+def _asset_transfer(receiver_wallet: str, amount_base_units: int, note: str | None = None) -> TxnBuilder:
     if settings.asset_id <= 0:
         raise RuntimeError("ASSET_ID is not configured.")
     if amount_base_units <= 0:
         raise RuntimeError("Transfer amount must be > 0.")
 
-    client = get_algod_client()
-    private_key, sender_address = _get_signer()
-    params = client.suggested_params()
-
-    txn = AssetTransferTxn(
+    return lambda sender_address, params: AssetTransferTxn(
         sender=sender_address,
         sp=params,
         receiver=receiver_wallet,
         amt=amount_base_units,
         index=settings.asset_id,
         note=note.encode("utf-8") if note else None,
+        lease=_unique_lease(),
     )
-    signed_txn = txn.sign(private_key)
-    txid = client.send_transaction(signed_txn)
-    wait_for_confirmation(client, txid, 4)
-    return txid
 
 
-def _call_settle_contract(creator_wallet: str, gross_amount_base_units: int) -> str:
+def _contract_call(method: bytes, wallet: str, amount_base_units: int) -> TxnBuilder:
     if settings.app_id <= 0:
         raise RuntimeError("APP_ID is not configured.")
     if settings.asset_id <= 0:
         raise RuntimeError("ASSET_ID is not configured.")
 
-    client = get_algod_client()
-    private_key, sender_address = _get_signer()
-    params = client.suggested_params()
-
-    txn = transaction.ApplicationNoOpTxn(
+    return lambda sender_address, params: transaction.ApplicationNoOpTxn(
         sender=sender_address,
         sp=params,
         index=settings.app_id,
-        app_args=[b"settle_reward", gross_amount_base_units.to_bytes(8, "big")],
-        accounts=[creator_wallet],
+        app_args=[method, amount_base_units.to_bytes(8, "big")],
+        accounts=[wallet],
         foreign_assets=[settings.asset_id],
+        lease=_unique_lease(),
     )
-    signed_txn = txn.sign(private_key)
-    txid = client.send_transaction(signed_txn)
-    wait_for_confirmation(client, txid, 4)
-    return txid
 
 
-def _call_withdraw_contract(advertiser_wallet: str, amount_base_units: int) -> str:
-    if settings.app_id <= 0:
-        raise RuntimeError("APP_ID is not configured.")
-    if settings.asset_id <= 0:
-        raise RuntimeError("ASSET_ID is not configured.")
+def _send_asset_transfer(receiver_wallet: str, amount_base_units: int, note: str | None = None) -> Submission:
+    return _sign_and_submit(_asset_transfer(receiver_wallet, amount_base_units, note))
 
-    client = get_algod_client()
-    private_key, sender_address = _get_signer()
-    params = client.suggested_params()
 
-    txn = transaction.ApplicationNoOpTxn(
-        sender=sender_address,
-        sp=params,
-        index=settings.app_id,
-        app_args=[b"withdraw_unused", amount_base_units.to_bytes(8, "big")],
-        accounts=[advertiser_wallet],
-        foreign_assets=[settings.asset_id],
-    )
-    signed_txn = txn.sign(private_key)
-    txid = client.send_transaction(signed_txn)
-    wait_for_confirmation(client, txid, 4)
-    return txid
+def _call_settle_contract(creator_wallet: str, gross_amount_base_units: int) -> Submission:
+    return _sign_and_submit(_contract_call(b"settle_reward", creator_wallet, gross_amount_base_units))
+
 
+def _call_withdraw_contract(advertiser_wallet: str, amount_base_units: int) -> Submission:
+    return _sign_and_submit(_contract_call(b"withdraw_unused", advertiser_wallet, amount_base_units))
 
-def settle_reward(creator_wallet: str, gross_amount_tokens: Decimal | float | int | str) -> dict[str, Any]:
-    gross_base_units = to_base_units(gross_amount_tokens)
-    if gross_base_units <= 0:
+
+def settle_reward(creator_wallet: str, gross_amount_units: int) -> dict[str, Any]:
+    if gross_amount_units <= 0:
         raise RuntimeError("Settlement amount too small.")
 
-    fee_base_units = (gross_base_units * settings.settlement_fee_bps) // 10000
-    creator_base_units = gross_base_units - fee_base_units
-    if creator_base_units <= 0:
+    fee_units = (gross_amount_units * settings.settlement_fee_bps) // 10000
+    creator_units = gross_amount_units - fee_units
+    if creator_units <= 0:
         raise RuntimeError("Settlement amount too small after fee.")
 
-    if settings.use_contract_settlement and settings.app_id > 0:
-        tx_hash = _call_settle_contract(creator_wallet, gross_base_units)
-    else:
-        # Fallback path: transfer creator share from platform wallet.
-        # Fee remains in platform-controlled wallet balance.
-        tx_hash = _send_asset_transfer(
-            creator_wallet,
-            creator_base_units,
-            note="rift:video-settlement",
-        )
+    try:
+        if settings.use_contract_settlement and settings.app_id > 0:
+            submission = _call_settle_contract(creator_wallet, gross_amount_units)
+        else:
+            # Fallback path: transfer creator share from platform wallet.
+            # Fee remains in platform-controlled wallet balance.
+            submission = _send_asset_transfer(
+                creator_wallet,
+                creator_units,
+                note="rift:video-settlement",
+            )
+    except Exception as exc:
+        optin_index.observe_transfer(creator_wallet, exc)
+        raise
+    optin_index.observe_transfer(creator_wallet, None)
 
     return {
-        "tx_hash": tx_hash,
-        "gross_amount": from_base_units(gross_base_units),
-        "platform_fee": from_base_units(fee_base_units),
-        "creator_amount": from_base_units(creator_base_units),
+        "tx_hash": submission.txid,
+        "confirmed_round": submission.confirmed_round,
+        "gross_amount_units": gross_amount_units,
+        "platform_fee_units": fee_units,
+        "creator_amount_units": creator_units,
     }
 
 
-def transfer_tokens(receiver_wallet: str, amount_tokens: Decimal | float | int | str) -> dict[str, Any]:
-    amount_base_units = to_base_units(amount_tokens)
-    if amount_base_units <= 0:
+def transfer_tokens(receiver_wallet: str, amount_units: int) -> dict[str, Any]:
+    if amount_units <= 0:
         raise RuntimeError("Transfer amount too small.")
 
-    tx_hash = _send_asset_transfer(
+    submission = _send_asset_transfer(
         receiver_wallet,
-        amount_base_units,
+        amount_units,
         note="rift:banner-distribution",
     )
     return {
-        "tx_hash": tx_hash,
-        "amount": from_base_units(amount_base_units),
+        "tx_hash": submission.txid,
+        "confirmed_round": submission.confirmed_round,
+        "amount_units": amount_units,
     }
 
 
-def withdraw_unused(advertiser_wallet: str, amount_tokens: Decimal | float | int | str) -> str:
-    amount_base_units = to_base_units(amount_tokens)
-    if amount_base_units <= 0:
+PAYOUT_GROUP_SIZE = 16  # algod's atomic transaction group limit
+HOT_WALLET_FEE_MICRO_ALGOS = 1_000  # minimum fee per payout
+ASSET_HOLDING_MIN_BALANCE_MICRO_ALGOS = 100_000  # minimum balance added by an asset opt-in
+
+
+class Payout(NamedTuple):
+    wallet: str
+    amount_units: int
+
+
+PAYOUT_PAID = "paid"
+PAYOUT_REJECTED = "rejected"  # never committed, safe to retry
+PAYOUT_UNKNOWN = "unknown"  # may still land on chain, must not be retried blindly
+
+
+def _payout_result(
+    payout: Payout,
+    txid: str | None,
+    confirmed_round: int | None,
+    failure: BaseException | None = None,
+    last_valid_round: int | None = None,
+) -> dict[str, Any]:
+    if failure is None:
+        outcome = PAYOUT_PAID
+    elif isinstance(failure, (error.AlgodHTTPError, error.TransactionRejectedError)):
+        outcome = PAYOUT_REJECTED
+    else:
+        outcome = PAYOUT_UNKNOWN
+    return {
+        "wallet": payout.wallet,
+        "amount_units": payout.amount_units,
+        "tx_hash": txid,
+        "last_valid_round": last_valid_round,
+        "confirmed_round": confirmed_round,
+        "outcome": outcome,
+        "error": None if failure is None else str(failure),
+    }
+
+
+def _send_payouts_one_by_one(payouts: list[Payout], note: str, signer: tuple[str, str]) -> list[dict[str, Any]]:
+    # Failures keep the txid and last valid round, so an unknown outcome can be resolved later.
+    results = []
+    for payout in payouts:
+        try:
+            signed = _sign(_asset_transfer(payout.wallet, payout.amount_units, note), signer)
+        except Exception as exc:
+            # Nothing was signed, so nothing can land.
+            result = _payout_result(payout, None, None, exc)
+            results.append({**result, "outcome": PAYOUT_REJECTED})
+            continue
+        last_valid_round = signed.transaction.last_valid_round
+        try:
+            submission = _submit_signed(signed)
+        except Exception as exc:
+            optin_index.observe_transfer(payout.wallet, exc)
+            results.append(_payout_result(payout, signed.get_txid(), None, exc, last_valid_round))
+        else:
+            optin_index.observe_transfer(payout.wallet, None)
+            results.append(_payout_result(payout, submission.txid, submission.confirmed_round, None, last_valid_round))
+    return results
+
+
+def _send_payout_batches(
+    signer: tuple[str, str],
+    payouts: list[Payout],
+    indexes: list[int],
+    note: str,
+    on_signed: Callable[[list[dict[str, Any]]], None] | None,
+) -> list[dict[str, Any]]:
+    # Payouts go out as atomic groups of up to 16 transfers, with up to payout_max_in_flight_groups
+    # groups submitted before waiting on the block follower. A group the node rejects (e.g. one
+    # receiver not opted in) is retried transfer by transfer so one bad wallet cannot block the
+    # rest. indexes are the payouts' positions in the caller's list, reported to on_signed.
+    client = get_algod_client()
+    private_key, sender_address = signer
+    starts = range(0, len(payouts), PAYOUT_GROUP_SIZE)
+    groups = [payouts[start : start + PAYOUT_GROUP_SIZE] for start in starts]
+    window = max(1, settings.payout_max_in_flight_groups)
+    results: list[dict[str, Any]] = []
+
+    for window_start in range(0, len(groups), window):
+        signed_groups = []
+        for group in groups[window_start : window_start + window]:
+            params = client_manager.suggested_params()
+            txns = [_asset_transfer(payout.wallet, payout.amount_units, note)(sender_address, params) for payout in group]
+            if len(txns) > 1:
+                txns = transaction.assign_group_id(txns)
+            signed_groups.append((group, [txn.sign(private_key) for txn in txns]))
+        if on_signed is not None:
+            on_signed(
+                [
+                    {
+                        "index": indexes[start + offset],
+                        "wallet": payout.wallet,
+                        "tx_hash": signed.get_txid(),
+                        "last_valid_round": signed.transaction.last_valid_round,
+                    }
+                    for start, (group, signed_txns) in zip(starts[window_start:], signed_groups)
+                    for offset, (payout, signed) in enumerate(zip(group, signed_txns))
+                ]
+            )
+
+        in_flight = []
+        for group, signed_txns in signed_groups:
+            first = signed_txns[0]
+            pending = confirmation_tracker.track(first.get_txid(), first.transaction.last_valid_round, wait_rounds=4)
+            try:
+                client.send_transactions(signed_txns)
+            except error.AlgodHTTPError as exc:
+                # Rejected by the node, so nothing in the group was committed and a retry is safe.
+                confirmation_tracker.forget(pending)
+                in_flight.append((group, signed_txns, None, exc))
+            except Exception as exc:
+                confirmation_tracker.forget(pending)
+                in_flight.append((group, signed_txns, None, RuntimeError(f"Submission outcome unknown: {exc}")))
+            else:
+                in_flight.append((group, signed_txns, pending, None))
+
+        for group, signed_txns, pending, exc in in_flight:
+            try:
+                if isinstance(exc, error.AlgodHTTPError) and len(group) > 1:
+                    results.extend(_send_payouts_one_by_one(group, note, signer))
+                    continue
+                if exc is not None:
+                    results.extend(
+                        _payout_result(payout, signed.get_txid(), None, exc, signed.transaction.last_valid_round)
+                        for payout, signed in zip(group, signed_txns)
+                    )
+                    continue
+                try:
+                    confirmed_round = confirmation_tracker.wait(pending)
+                except Exception as wait_exc:
+                    # Only an explicit rejection is retried: a timed-out group may still land.
+                    results.extend(
+                        _payout_result(payout, signed.get_txid(), None, wait_exc, signed.transaction.last_valid_round)
+                        for payout, signed in zip(group, signed_txns)
+                    )
+                    continue
+                client_manager.note_round(confirmed_round)
+                for payout, signed in zip(group, signed_txns):
+                    optin_index.observe_transfer(payout.wallet, None)
+                    results.append(
+                        _payout_result(payout, signed.get_txid(), confirmed_round, None, signed.transaction.last_valid_round)
+                    )
+            finally:
+                for signed in signed_txns:
+                    _invalidate_balances(signed.transaction)
+
+    return results
+
+
+def _send_rebalance_groups(signed_txns: list[tuple[transaction.Transaction, str]]) -> None:
+    client = get_algod_client()
+    for start in range(0, len(signed_txns), PAYOUT_GROUP_SIZE):
+        batch = signed_txns[start : start + PAYOUT_GROUP_SIZE]
+        txns = [txn for txn, _ in batch]
+        if len(txns) > 1:
+            txns = transaction.assign_group_id(txns)
+        signed = [txn.sign(private_key) for txn, (_, private_key) in zip(txns, batch)]
+        pending = confirmation_tracker.track(signed[0].get_txid(), txns[0].last_valid_round, wait_rounds=4)
+        try:
+            client.send_transactions(signed)
+            client_manager.note_round(confirmation_tracker.wait(pending))
+        except Exception as exc:
+            confirmation_tracker.forget(pending)
+            raise RuntimeError(f"Hot wallet rebalance failed: {exc}") from exc
+        finally:
+            for txn in txns:
+                _invalidate_balances(txn)
+
+
+def payout_account() -> str:
+    # The platform account that signs direct payouts and funds the hot wallets.
+    return _get_signer()[1]
+
+
+def payout_funds_units() -> int:
+    # Cached balance of the platform account plus the float already sitting in hot wallets.
+    return get_asset_balance(payout_account()) + sum(
+        get_asset_balance(wallet.address) for wallet in hot_wallet_pool.wallets()
+    )
+
+
+def _rebalance_hot_wallets(shards: list[tuple[HotWallet, list[Payout]]]) -> None:
+    # Tops every hot wallet up from the platform account before it sends its share: enough ALGO
+    # for its minimum balance, fees and HOT_WALLET_ALGO_BUFFER_MICRO, an asset opt-in if it has
+    # none yet, and the tokens it is about to pay plus HOT_WALLET_FLOAT_UNITS. Each step goes out
+    # as atomic groups and confirms before the next, and all of it before any payout is signed.
+    client = get_algod_client()
+    platform_key, platform_address = _get_signer()
+    algo_top_ups: list[tuple[transaction.Transaction, str]] = []
+    opt_ins: list[tuple[transaction.Transaction, str]] = []
+    token_top_ups: list[tuple[transaction.Transaction, str]] = []
+    for wallet, payouts in shards:
+        params = client_manager.suggested_params()
+        info = client.account_info(wallet.address)
+        holds_asset = any(int(holding.get("asset-id", 0)) == int(settings.asset_id) for holding in info.get("assets") or [])
+        needed_micro_algos = (
+            int(info.get("min-balance", 0))
+            + (0 if holds_asset else ASSET_HOLDING_MIN_BALANCE_MICRO_ALGOS)
+            + (len(payouts) + (0 if holds_asset else 1)) * HOT_WALLET_FEE_MICRO_ALGOS
+            + settings.hot_wallet_algo_buffer_micro
+        )
+        algo_balance = int(info.get("amount", 0))
+        if algo_balance < needed_micro_algos:
+            # needed_micro_algos already includes HOT_WALLET_ALGO_BUFFER_MICRO.
+            top_up = needed_micro_algos - algo_balance
+            algo_top_ups.append(
+                (transaction.PaymentTxn(platform_address, params, wallet.address, top_up, note=b"rift:hot-wallet-rebalance"), platform_key)
+            )
+        if not holds_asset:
+            opt_ins.append((transaction.AssetOptInTxn(wallet.address, params, settings.asset_id), wallet.private_key))
+        needed_units = sum(payout.amount_units for payout in payouts)
+        token_balance = _asset_amount(info)
+        if token_balance < needed_units:
+            build = _asset_transfer(
+                wallet.address, needed_units + settings.hot_wallet_float_units - token_balance, "rift:hot-wallet-rebalance"
+            )
+            token_top_ups.append((build(platform_address, params), platform_key))
+
+    for step in (algo_top_ups, opt_ins, token_top_ups):
+        _send_rebalance_groups(step)
+
+
+def transfer_tokens_bulk(
+    payouts: list[Payout],
+    note: str = "rift:banner-distribution",
+    on_signed: Callable[[list[dict[str, Any]]], None] | None = None,
+) -> list[dict[str, Any]]:
+    # Results line up with payouts; failures carry "error" and an "outcome" instead of raising.
+    # on_signed sees each window's txids (with each payout's "index") before any of them is sent,
+    # so callers can checkpoint what might land on chain. With PAYOUT_HOT_WALLET_MNEMONICS set,
+    # payouts are spread across the hot wallets, each sending its share in parallel with its own
+    # in-flight window; otherwise the platform account sends everything.
+    for payout in payouts:
+        if payout.amount_units <= 0:
+            raise RuntimeError("Transfer amount too small.")
+
+    assignments = hot_wallet_pool.assign([payout.amount_units for payout in payouts])
+    if not assignments:
+        return _send_payout_batches(_get_signer(), payouts, list(range(len(payouts))), note, on_signed)
+
+    shards = [(wallet, [payouts[index] for index in indexes]) for wallet, indexes in assignments]
+    _rebalance_hot_wallets(shards)
+
+    signed_lock = threading.Lock()
+
+    def checkpoint(signed: list[dict[str, Any]]) -> None:
+        with signed_lock:
+            on_signed(signed)  # type: ignore[misc]
+
+    results: list[dict[str, Any] | None] = [None] * len(payouts)
+    with ThreadPoolExecutor(max_workers=len(shards), thread_name_prefix="hot-wallet") as pool:
+        futures = [
+            (
+                indexes,
+                pool.submit(
+                    _send_payout_batches,
+                    (wallet.private_key, wallet.address),
+                    shard,
+                    indexes,
+                    note,
+                    checkpoint if on_signed is not None else None,
+                ),
+            )
+            for (wallet, indexes), (_, shard) in zip(assignments, shards)
+        ]
+        for indexes, future in futures:
+            for index, result in zip(indexes, future.result()):
+                results[index] = result
+    return results  # type: ignore[return-value]
+
+
+def transaction_outcome(txid: str) -> tuple[str, int | None]:
+    # Best-effort lookup for a txid whose confirmation was never observed (e.g. after a crash).
+    # algod only remembers recent transactions, so anything it cannot place stays unknown.
+    try:
+        info = get_algod_client().pending_transaction_info(txid)
+    except error.AlgodHTTPError:
+        return PAYOUT_UNKNOWN, None
+    if info.get("confirmed-round"):
+        return PAYOUT_PAID, int(info["confirmed-round"])
+    if info.get("pool-error"):
+        return PAYOUT_REJECTED, None
+    return PAYOUT_UNKNOWN, None
+
+
+class TransferRecord(NamedTuple):
+    confirmed_round: int | None
+    amount_units: int  # settlement asset moved to the receiver, inner transactions included
+
+
+def _transferred_to(receiver: str, txn: dict[str, Any], inner: list[dict[str, Any]]) -> int:
+    # Sums asset transfers to receiver in algod's (txn/arcv/aamt) or the indexer's
+    # (asset-transfer-transaction) encoding, including contract inner transactions.
+    amount = 0
+    if txn.get("xaid") is not None and int(txn["xaid"]) == int(settings.asset_id) and txn.get("arcv") == receiver:
+        amount += int(txn.get("aamt") or 0)
+    transfer = txn.get("asset-transfer-transaction") or {}
+    if transfer and int(transfer.get("asset-id", 0)) == int(settings.asset_id) and transfer.get("receiver") == receiver:
+        amount += int(transfer.get("amount") or 0)
+    for child in inner:
+        child_txn = (child.get("txn") or {}).get("txn") or child
+        amount += _transferred_to(receiver, child_txn, child.get("inner-txns") or [])
+    return amount
+
+
+def lookup_transfer(txid: str, receiver: str) -> TransferRecord | None:
+    # None when no source knows the txid. algod only remembers recent transactions, so
+    # INDEXER_ADDRESS is needed to check older ones.
+    source = client_manager.indexer()
+    try:
+        if source is not None:
+            txn = source.transaction(txid)["transaction"]
+            return TransferRecord(txn.get("confirmed-round"), _transferred_to(receiver, txn, txn.get("inner-txns") or []))
+        info = get_algod_client().pending_transaction_info(txid)
+    except error.IndexerHTTPError as exc:
+        # The indexer reports a 404 only through its message ("no transaction found ...").
+        if "found" in str(exc).lower():
+            return None
+        raise
+    except error.AlgodHTTPError as exc:
+        if exc.code == 404:
+            return None
+        raise
+    txn = (info.get("txn") or {}).get("txn") or {}
+    return TransferRecord(info.get("confirmed-round") or None, _transferred_to(receiver, txn, info.get("inner-txns") or []))
+
+
+
+def transaction_in_block(txid: str, round_num: int) -> bool:
+    # Raises when algod cannot return the block (e.g. a non-archival node has pruned it).
+    return txid in (get_algod_client().get_block_txids(round_num).get("blockTxids") or [])
+
+
+MAX_TXN_LIFE = 1000  # protocol limit on last valid round minus first valid round
+
+
+class OutstandingPayout(NamedTuple):
+    txid: str
+    receiver: str
+    last_valid_round: int | None
+
+
+def _blocks_seen(source: Any, last_valid_round: int) -> bool:
+    # Whether the indexer has ingested every round the transaction could have landed in.
+    try:
+        return int(source.health().get("round") or 0) >= last_valid_round
+    except Exception as exc:
+        logger.warning("Indexer health check failed: %s", exc)
+        return False
+
+
+def _scan_validity_windows(expired: dict[str, int]) -> dict[str, int] | None:
+    # Reads each block of the expired txids' validity windows once; txid -> confirmed round for
+    # those found, or None when a block cannot be read (e.g. a non-archival node has pruned it).
+    rounds: set[int] = set()
+    for last_valid_round in expired.values():
+        rounds.update(range(max(1, last_valid_round - MAX_TXN_LIFE), last_valid_round + 1))
+    client = get_algod_client()
+    found: dict[str, int] = {}
+    for round_num in sorted(rounds):
+        try:
+            txids = client.get_block_txids(round_num).get("blockTxids") or []
+        except Exception as exc:
+            logger.warning("Could not read block %s while resolving payouts: %s", round_num, exc)
+            return None
+        found.update((txid, round_num) for txid in expired.keys() & set(txids))
+    return found
+
+
+def payout_outcomes(payouts: list[OutstandingPayout]) -> dict[str, tuple[str, int | None]]:
+    # Resolves payouts whose confirmation was never observed (an interruption or a confirmation
+    # timeout): txid -> (outcome, confirmed round). A payout is rejected, and so safe to send
+    # again, only once the chain is past its last valid round and no source can place it in its
+    # validity window. Until then, or when that cannot be established, it stays unknown.
+    outcomes: dict[str, tuple[str, int | None]] = {}
+    if not payouts:
+        return outcomes
+    source = client_manager.indexer()
+    last_round = int(get_algod_client().status()["last-round"])
+    client_manager.note_round(last_round)
+    expired: dict[str, int] = {}
+    for payout in payouts:
+        outcome, confirmed_round = transaction_outcome(payout.txid)
+        if outcome == PAYOUT_UNKNOWN and source is not None:
+            try:
+                record = lookup_transfer(payout.txid, payout.receiver)
+            except Exception as exc:
+                logger.warning("Indexer lookup of %s failed: %s", payout.txid, exc)
+            else:
+                if record is not None and record.confirmed_round:
+                    outcome, confirmed_round = PAYOUT_PAID, int(record.confirmed_round)
+                elif record is None and payout.last_valid_round and _blocks_seen(source, payout.last_valid_round):
+                    outcome = PAYOUT_REJECTED
+        if outcome == PAYOUT_UNKNOWN and payout.last_valid_round and last_round > payout.last_valid_round:
+            expired[payout.txid] = payout.last_valid_round
+        outcomes[payout.txid] = (outcome, confirmed_round)
+
+    if expired and source is None:
+        # algod only remembers recent transactions, so absence is checked block by block.
+        found = _scan_validity_windows(expired)
+        if found is not None:
+            for txid in expired:
+                outcomes[txid] = (PAYOUT_PAID, found[txid]) if txid in found else (PAYOUT_REJECTED, None)
+    return outcomes
+
+
+def _withdrawal(advertiser_wallet: str, amount_units: int) -> TxnBuilder:
+    if amount_units <= 0:
         raise RuntimeError("Withdrawal amount too small.")
 
     if settings.use_contract_settlement and settings.app_id > 0:
-        return _call_withdraw_contract(advertiser_wallet, amount_base_units)
+        return _contract_call(b"withdraw_unused", advertiser_wallet, amount_units)
 
-    return _send_asset_transfer(
+    return _asset_transfer(
         advertiser_wallet,
-        amount_base_units,
+        amount_units,
         note="rift:withdraw-unused",
     )
+
+
+def withdraw_unused(advertiser_wallet: str, amount_units: int) -> str:
+    return _sign_and_submit(_withdrawal(advertiser_wallet, amount_units)).txid
+
+
+async def withdraw_unused_async(advertiser_wallet: str, amount_units: int) -> str:
+    return (await _sign_and_submit_async(_withdrawal(advertiser_wallet, amount_units))).txid
@@ -0,0 +1,145 @@
+from __future__ import annotations
+
+import asyncio
+import base64
+import time
+from typing import Any
+
+import httpx
+from algosdk import constants, encoding, error, transaction
+
+from ..config import settings
+from .algod_pool import HEDGED_PREFIXES, UNTIMED_PREFIXES, AlgodEndpointPool, is_node_failure
+
+
+class AsyncAlgodClient:
+    # Non-blocking counterpart of AlgodEndpointPool for code running on the event loop. It
+    # shares the pool's per-node stats, so sync and async callers agree on which node is healthy.
+
+    def __init__(self, pool: AlgodEndpointPool, pool_size: int = 10) -> None:
+        self.pool = pool
+        limits = httpx.Limits(max_connections=pool_size, max_keepalive_connections=pool_size)
+        self._clients = {
+            endpoint.algod_address: httpx.AsyncClient(
+                base_url=endpoint.algod_address,
+                headers={"User-Agent": "py-algorand-sdk", constants.algod_auth_header: pool.algod_token},
+                limits=limits,
+                timeout=30,
+            )
+            for endpoint in pool.endpoints
+        }
+
+    async def aclose(self) -> None:
+        await asyncio.gather(*(client.aclose() for client in self._clients.values()))
+
+    async def _request_one(self, address: str, method: str, path: str, timed: bool, **kwargs: Any) -> Any:
+        stats = self.pool.stats[address]
+        started = time.perf_counter()
+        try:
+            response = await self._clients[address].request(method, "/v2" + path, **kwargs)
+            if response.status_code >= 400:
+                try:
+                    body = response.json()
+                except ValueError:
+                    body = {}
+                raise error.AlgodHTTPError(body.get("message", response.text), response.status_code, body.get("data"))
+            payload = response.json() if response.content else {}
+        except Exception as exc:
+            stats.record(None, not is_node_failure(exc))
+            raise
+        stats.record(time.perf_counter() - started if timed else None, True)
+        return payload
+
+    async def _hedged(self, ranked: list[str], method: str, path: str, **kwargs: Any) -> Any:
+        primary, backup = ranked[0], ranked[1]
+        tasks = {asyncio.ensure_future(self._request_one(primary, method, path, True, **kwargs)): primary}
+        done, _ = await asyncio.wait(tasks, timeout=self.pool.hedge_delay(primary))
+        if not done or next(iter(done)).exception() is not None:
+            tasks[asyncio.ensure_future(self._request_one(backup, method, path, True, **kwargs))] = backup
+
+        first_error: BaseException | None = None
+        pending = set(tasks)
+        try:
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    exc = task.exception()
+                    if exc is None:
+                        if tasks[task] == backup:
+                            self.pool.stats[backup].hedges_won += 1
+                        return task.result()
+                    first_error = first_error or exc
+        finally:
+            for task in pending:
+                task.cancel()
+        assert first_error is not None
+        raise first_error
+
+    async def request(self, method: str, path: str, **kwargs: Any) -> Any:
+        ranked = [endpoint.algod_address for endpoint in self.pool.ranked_endpoints()]
+        if method == "GET" and len(ranked) > 1 and path.startswith(HEDGED_PREFIXES):
+            return await self._hedged(ranked, method, path, **kwargs)
+
+        timed = not path.startswith(UNTIMED_PREFIXES)
+        last_error: BaseException | None = None
+        for address in ranked:
+            try:
+                return await self._request_one(address, method, path, timed, **kwargs)
+            except Exception as exc:
+                if not is_node_failure(exc):
+                    raise
+                last_error = exc
+        assert last_error is not None
+        raise last_error
+
+    async def status(self) -> dict[str, Any]:
+        return await self.request("GET", "/status")
+
+    async def status_after_block(self, round_num: int) -> dict[str, Any]:
+        return await self.request("GET", f"/status/wait-for-block-after/{round_num}")
+
+    async def account_info(self, address: str) -> dict[str, Any]:
+        return await self.request("GET", f"/accounts/{address}")
+
+    async def pending_transaction_info(self, txid: str) -> dict[str, Any]:
+        return await self.request("GET", f"/transactions/pending/{txid}", params={"format": "json"})
+
+    async def suggested_params(self) -> transaction.SuggestedParams:
+        res = await self.request("GET", "/transactions/params")
+        return transaction.SuggestedParams(
+            res["fee"],
+            res["last-round"],
+            res["last-round"] + 1000,
+            res["genesis-hash"],
+            res["genesis-id"],
+            False,
+            res["consensus-version"],
+            res["min-fee"],
+        )
+
+    async def send_transaction(self, signed_txn: Any) -> str:
+        raw = base64.b64decode(encoding.msgpack_encode(signed_txn))
+        res = await self.request(
+            "POST",
+            "/transactions",
+            content=raw,
+            headers={"Content-Type": "application/x-binary"},
+        )
+        return res["txId"]
+
+    async def wait_for_confirmation(self, txid: str, wait_rounds: int = 4) -> dict[str, Any]:
+        # Mirrors algosdk.transaction.wait_for_confirmation without blocking the loop.
+        last_round = int((await self.status())["last-round"])
+        current_round = last_round + 1
+        while current_round <= last_round + wait_rounds:
+            try:
+                tx_info = await self.pending_transaction_info(txid)
+                if tx_info.get("pool-error"):
+                    raise error.TransactionRejectedError("Transaction rejected: " + tx_info["pool-error"])
+                if tx_info.get("confirmed-round"):
+                    return tx_info
+            except error.AlgodHTTPError:
+                pass
+            await self.status_after_block(current_round)
+            current_round += 1
+        raise error.ConfirmationTimeoutError(f"Wait for transaction id {txid} timed out")
@@ -1,109 +1,491 @@
 from __future__ import annotations
 
+import logging
+import threading
+from collections.abc import Iterator
 from datetime import date, datetime, timezone
-from decimal import Decimal, ROUND_DOWN
+from typing import Any
 
+from ..config import settings
 from ..database import get_db
-from . import algorand_service
+from ..utils.units import row_units, to_tokens
+from . import algorand_service, reward_allocation, solvency
+from .optin_index import is_optin_rejection
 
+CREATOR_SHARE_PERCENT = 70
+ALLOCATION_STATUSES = ("pending", "submitted", "paid", "deferred", "failed", "unknown")
+NOT_OPTED_IN = "Receiver has not opted in to the asset."
 
-def _to_decimal(value: object) -> Decimal:
-    return Decimal(str(value or 0))
+logger = logging.getLogger(__name__)
+_run_lock = threading.Lock()
 
 
-def _token_quantizer() -> Decimal:
-    return Decimal("0.000001")
+# A distribution run is planned once into banner_allocations (one row per creator with its
+# amount), then paid in chunks. Every chunk is checkpointed twice: txids are stored as
+# "submitted" before anything is sent, and outcomes are stored after confirmation. A run that
+# stops half way is resumed by the next call instead of being recomputed. Allocations whose
+# outcome cannot be established are left "unknown" rather than paid again, and are rechecked on
+# every resume until the chain is past their last valid round. Creators who have not opted in to
+# the asset are "deferred" without a transaction and paid by a later run.
 
 
-def _eligible_banner_campaigns(campaigns: list[dict]) -> list[dict]:
-    today = date.today()
-    eligible: list[dict] = []
-    for campaign in campaigns:
-        if campaign.get("distributed"):
-            continue
-        end_date_raw = campaign.get("end_date")
-        if not end_date_raw:
-            eligible.append(campaign)
-            continue
-        try:
-            end_date = date.fromisoformat(str(end_date_raw))
-        except ValueError:
-            eligible.append(campaign)
-            continue
-        if end_date <= today:
-            eligible.append(campaign)
-    return eligible
+def split_revenue(total_revenue_units: int) -> tuple[int, int]:
+    # Creators get 70% rounded down; the platform keeps the rest, so no base unit is lost.
+    creator_pool = total_revenue_units * CREATOR_SHARE_PERCENT // 100
+    return creator_pool, total_revenue_units - creator_pool
 
 
-def distribute_banner_rewards() -> dict[str, int | float]:
-    db = get_db()
-    campaigns = db.table("banner_campaigns").select("*").eq("active", True).execute().data or []
-    eligible_campaigns = _eligible_banner_campaigns(campaigns)
-    if not eligible_campaigns:
-        return {
-            "campaigns_distributed": 0,
-            "creators_paid": 0,
-            "creator_pool": 0.0,
-            "platform_share": 0.0,
-        }
+def _now() -> str:
+    return datetime.now(timezone.utc).isoformat()
 
-    total_revenue = sum(_to_decimal(campaign.get("fixed_price")) for campaign in eligible_campaigns)
-    if total_revenue <= 0:
-        return {
-            "campaigns_distributed": 0,
-            "creators_paid": 0,
-            "creator_pool": 0.0,
-            "platform_share": 0.0,
-        }
 
-    platform_share = (total_revenue * Decimal("0.30")).quantize(_token_quantizer(), rounding=ROUND_DOWN)
-    creator_pool = (total_revenue * Decimal("0.70")).quantize(_token_quantizer(), rounding=ROUND_DOWN)
-    if creator_pool <= 0:
-        return {
-            "campaigns_distributed": 0,
-            "creators_paid": 0,
-            "creator_pool": float(creator_pool),
-            "platform_share": float(platform_share),
-        }
+def eligible_banner_campaigns(db: Any) -> list[dict]:
+    return (
+        db.table("banner_campaigns")
+        .select("id, fixed_price_units")
+        .eq("active", True)
+        .eq("distributed", False)
+        .is_("distribution_run_id", "null")
+        .lte("end_date", date.today().isoformat())
+        .execute()
+        .data
+        or []
+    )
 
-    creators = db.table("users").select("id, wallet_address, subscribers_count").eq("role", "creator").execute().data or []
-    eligible_creators = [creator for creator in creators if int(creator.get("subscribers_count") or 0) > 0]
-    total_subscribers = sum(int(creator["subscribers_count"]) for creator in eligible_creators)
-    if total_subscribers <= 0:
-        return {
-            "campaigns_distributed": 0,
-            "creators_paid": 0,
-            "creator_pool": float(creator_pool),
-            "platform_share": float(platform_share),
-        }
 
-    creators_paid = 0
-    for creator in eligible_creators:
-        subscribers_count = int(creator["subscribers_count"])
-        ratio = Decimal(subscribers_count) / Decimal(total_subscribers)
-        creator_reward = (creator_pool * ratio).quantize(_token_quantizer(), rounding=ROUND_DOWN)
-        if creator_reward <= 0:
-            continue
-
-        transfer = algorand_service.transfer_tokens(creator["wallet_address"], creator_reward)
-        db.table("settlements").insert(
+def _creator_pages(db: Any, columns: str) -> Iterator[list[dict]]:
+    # Keyset pagination over creators with subscribers; only one page is held at a time.
+    page_size = max(1, settings.banner_creator_page_size)
+    last_id: str | None = None
+    while True:
+        query = db.table("users").select(columns).eq("role", "creator").gt("subscribers_count", 0)
+        if last_id is not None:
+            query = query.gt("id", last_id)
+        page = query.order("id").limit(page_size).execute().data or []
+        if page:
+            yield page
+        if len(page) < page_size:
+            return
+        last_id = page[-1]["id"]
+
+
+def _allocation_pages(db: Any, run_id: str | None, *statuses: str) -> Iterator[list[dict]]:
+    page_size = max(1, settings.banner_payout_chunk_size)
+    last_id: str | None = None
+    while True:
+        query = (
+            db.table("banner_allocations")
+            .select("id, run_id, creator_wallet, amount_units, status, tx_hash, last_valid_round")
+            .in_("status", list(statuses))
+        )
+        if run_id is not None:
+            query = query.eq("run_id", run_id)
+        if last_id is not None:
+            query = query.gt("id", last_id)
+        page = query.order("id").limit(page_size).execute().data or []
+        if page:
+            yield page
+        if len(page) < page_size:
+            return
+        last_id = page[-1]["id"]
+
+
+def _total_subscribers(db: Any) -> int:
+    return sum(
+        int(creator["subscribers_count"]) for page in _creator_pages(db, "id, subscribers_count") for creator in page
+    )
+
+
+def _report(
+    campaigns: int,
+    creators_paid: int,
+    creator_pool: int,
+    platform_share: int,
+    run_id: str | None = None,
+    resumed: bool = False,
+    creators_deferred: int = 0,
+) -> dict[str, Any]:
+    return {
+        "campaigns_distributed": campaigns,
+        "creators_paid": creators_paid,
+        "creators_deferred": creators_deferred,
+        "creator_pool": to_tokens(creator_pool),
+        "platform_share": to_tokens(platform_share),
+        "run_id": run_id,
+        "resumed": resumed,
+    }
+
+
+def _open_run(db: Any) -> dict | None:
+    runs = (
+        db.table("banner_distribution_runs")
+        .select("*")
+        .in_("status", ["planning", "paying"])
+        .order("created_at")
+        .limit(1)
+        .execute()
+        .data
+    )
+    return runs[0] if runs else None
+
+
+def _create_run(db: Any, campaigns: list[dict], creator_pool: int, platform_share: int) -> dict:
+    run = (
+        db.table("banner_distribution_runs")
+        .insert(
             {
-                "creator_wallet": creator["wallet_address"],
-                "amount": float(transfer["amount"]),
-                "platform_fee": 0.0,
-                "tx_hash": transfer["tx_hash"],
-                "timestamp": datetime.now(timezone.utc).isoformat(),
-                "settlement_type": "banner",
+                "status": "planning",
+                "creator_pool_units": creator_pool,
+                "platform_share_units": platform_share,
+                "campaigns_count": len(campaigns),
             }
-        ).execute()
-        creators_paid += 1
+        )
+        .execute()
+        .data[0]
+    )
+    # Claim the campaigns so a campaign ending mid-run waits for the next plan.
+    db.table("banner_campaigns").update({"distribution_run_id": run["id"]}).in_(
+        "id", [campaign["id"] for campaign in campaigns]
+    ).is_("distribution_run_id", "null").execute()
+    return run
+
+
+def _plan_allocations(db: Any, run: dict, total_subscribers: int) -> None:
+    # Each page gets the slice of the pool between the running subscriber totals at its edges,
+    # floor(pool * end / total) - floor(pool * start / total), split by largest remainder. The
+    # slices telescope, so the whole pool is allocated without holding every creator in memory.
+    creator_pool = int(run["creator_pool_units"])
+    db.table("banner_allocations").delete().eq("run_id", run["id"]).execute()
+
+    planned = 0
+    running_subscribers = 0
+    for page in _creator_pages(db, "id, wallet_address, subscribers_count"):
+        weights = [int(creator["subscribers_count"]) for creator in page]
+        page_start = min(running_subscribers, total_subscribers)
+        running_subscribers += sum(weights)
+        page_end = min(running_subscribers, total_subscribers)
+        page_pool = creator_pool * page_end // total_subscribers - creator_pool * page_start // total_subscribers
+
+        shares = reward_allocation.largest_remainder(page_pool, weights)
+        rows = [
+            {"run_id": run["id"], "creator_wallet": creator["wallet_address"], "amount_units": share, "status": "pending"}
+            for creator, share in zip(page, shares)
+            if share > 0
+        ]
+        if rows:
+            db.table("banner_allocations").insert(rows).execute()
+            planned += len(rows)
 
-    campaign_ids = [campaign["id"] for campaign in eligible_campaigns]
-    db.table("banner_campaigns").update({"distributed": True, "active": False}).in_("id", campaign_ids).execute()
+    if running_subscribers != total_subscribers:
+        # Subscriber counts moved between the totalling pass and the planning pass.
+        logger.warning(
+            "Banner plan %s saw %s subscribers while allocating, %s while totalling",
+            run["id"],
+            running_subscribers,
+            total_subscribers,
+        )
 
+    db.table("banner_distribution_runs").update(
+        {"status": "paying", "creators_planned": planned, "updated_at": _now()}
+    ).eq("id", run["id"]).execute()
+    run["status"] = "paying"
+
+
+def _settlement_row(allocation: dict, tx_hash: str | None, confirmed_round: int | None) -> dict[str, Any]:
     return {
-        "campaigns_distributed": len(eligible_campaigns),
-        "creators_paid": creators_paid,
-        "creator_pool": float(creator_pool),
-        "platform_share": float(platform_share),
+        "creator_wallet": allocation["creator_wallet"],
+        "amount_units": allocation["amount_units"],
+        "platform_fee_units": 0,
+        "tx_hash": tx_hash,
+        "confirmed_round": confirmed_round,
+        "timestamp": _now(),
+        "settlement_type": "banner",
     }
+
+
+def _checkpoint(db: Any, allocations: list[dict], changes: dict[str, dict[str, Any]]) -> None:
+    # One upsert per chunk, keyed by allocation id; rows carry every required column so the
+    # upsert can never insert a stub.
+    timestamp = _now()
+    rows = [
+        {
+            "id": allocation["id"],
+            "run_id": allocation["run_id"],
+            "creator_wallet": allocation["creator_wallet"],
+            "amount_units": allocation["amount_units"],
+            "updated_at": timestamp,
+            **changes[allocation["id"]],
+        }
+        for allocation in allocations
+        if allocation["id"] in changes
+    ]
+    if rows:
+        db.table("banner_allocations").upsert(rows, on_conflict="id").execute()
+
+
+def _record_paid(db: Any, allocations: list[dict], outcomes: dict[str, tuple[str | None, int | None]]) -> int:
+    rows = [
+        _settlement_row(allocation, *outcomes[allocation["id"]]) for allocation in allocations if allocation["id"] in outcomes
+    ]
+    if rows:
+        db.table("settlements").insert(rows).execute()
+    return len(rows)
+
+
+def _recover_outstanding(db: Any, run_id: str) -> int:
+    # Allocations left "submitted" were signed and possibly sent when the last run stopped;
+    # "unknown" ones were sent but their confirmation was never observed. Both are looked up
+    # again, and go back to "pending" once they can no longer land.
+    recovered = 0
+    for page in _allocation_pages(db, run_id, "submitted", "unknown"):
+        outcomes = algorand_service.payout_outcomes(
+            [
+                algorand_service.OutstandingPayout(row["tx_hash"], row["creator_wallet"], row.get("last_valid_round"))
+                for row in page
+                if row.get("tx_hash")
+            ]
+        )
+        changes: dict[str, dict[str, Any]] = {}
+        paid: dict[str, tuple[str | None, int | None]] = {}
+        for allocation in page:
+            if not allocation.get("tx_hash"):
+                # No txid to look up; left for manual reconciliation.
+                continue
+            outcome, confirmed_round = outcomes[allocation["tx_hash"]]
+            if outcome == algorand_service.PAYOUT_PAID:
+                changes[allocation["id"]] = {"status": "paid", "confirmed_round": confirmed_round, "error": None}
+                paid[allocation["id"]] = (allocation["tx_hash"], confirmed_round)
+            elif outcome == algorand_service.PAYOUT_REJECTED:
+                changes[allocation["id"]] = {"status": "pending", "tx_hash": None, "last_valid_round": None, "error": None}
+            elif allocation["status"] == "submitted":
+                changes[allocation["id"]] = {
+                    "status": "unknown",
+                    "error": "Submitted before an interruption; outcome not found on the node.",
+                }
+        _checkpoint(db, page, changes)
+        recovered += _record_paid(db, page, paid)
+    return recovered
+
+
+def _pay_chunk(db: Any, chunk: list[dict]) -> tuple[int, int]:
+    # Receivers known not to hold the asset are deferred before any transaction is built; the
+    # rest are paid and checkpointed. Returns (paid, deferred).
+    payable, not_opted_in = algorand_service.split_opted_in([row["creator_wallet"] for row in chunk])
+    deferred_rows = [row for row in chunk if row["creator_wallet"] in not_opted_in]
+    paying = [row for row in chunk if row["creator_wallet"] in payable]
+    changes: dict[str, dict[str, Any]] = {row["id"]: {"status": "deferred", "error": NOT_OPTED_IN} for row in deferred_rows}
+
+    paid: dict[str, tuple[str | None, int | None]] = {}
+    if paying:
+        payouts = [algorand_service.Payout(row["creator_wallet"], int(row["amount_units"])) for row in paying]
+
+        def checkpoint_signed(signed: list[dict[str, Any]]) -> None:
+            rows = [paying[item["index"]] for item in signed]
+            _checkpoint(
+                db,
+                rows,
+                {
+                    row["id"]: {"status": "submitted", "tx_hash": item["tx_hash"], "last_valid_round": item["last_valid_round"]}
+                    for row, item in zip(rows, signed)
+                },
+            )
+
+        results = algorand_service.transfer_tokens_bulk(payouts, on_signed=checkpoint_signed)
+        for row, result in zip(paying, results):
+            if result["outcome"] == algorand_service.PAYOUT_PAID:
+                changes[row["id"]] = {
+                    "status": "paid",
+                    "tx_hash": result["tx_hash"],
+                    "confirmed_round": result["confirmed_round"],
+                    "error": None,
+                }
+                paid[row["id"]] = (result["tx_hash"], result["confirmed_round"])
+            elif result["outcome"] == algorand_service.PAYOUT_REJECTED:
+                # The transfer never landed; an opt-in rejection waits for the creator to opt in.
+                status = "deferred" if is_optin_rejection(RuntimeError(result["error"])) else "failed"
+                changes[row["id"]] = {"status": status, "tx_hash": None, "last_valid_round": None, "error": result["error"]}
+            else:
+                changes[row["id"]] = {
+                    "status": "unknown",
+                    "tx_hash": result["tx_hash"],
+                    "last_valid_round": result["last_valid_round"],
+                    "error": result["error"],
+                }
+
+    _checkpoint(db, chunk, changes)
+    return _record_paid(db, chunk, paid), sum(1 for change in changes.values() if change["status"] == "deferred")
+
+
+def _payout_budget() -> int:
+    return max(algorand_service.payout_funds_units() - settings.solvency_reserve_units, 0)
+
+
+def _affordable(chunk: list[dict], budget: int) -> list[dict]:
+    # The leading rows of chunk whose amounts fit in budget.
+    rows = []
+    for row in chunk:
+        budget -= int(row["amount_units"])
+        if budget < 0:
+            break
+        rows.append(row)
+    return rows
+
+
+def _pay_allocations(db: Any, run_id: str) -> int:
+    # Payouts stop at the first chunk the payout account can no longer cover; the rows left
+    # pending are paid when the run is resumed after a top-up.
+    creators_paid = 0
+    budget = _payout_budget()
+    for chunk in _allocation_pages(db, run_id, "pending"):
+        affordable = _affordable(chunk, budget)
+        if affordable:
+            paid, _ = _pay_chunk(db, affordable)
+            creators_paid += paid
+            budget -= sum(int(row["amount_units"]) for row in affordable)
+            db.table("banner_distribution_runs").update({"updated_at": _now()}).eq("id", run_id).execute()
+        if len(affordable) < len(chunk):
+            break
+    return creators_paid
+
+
+def _retry_deferred(db: Any) -> int:
+    # Deferred allocations from any run are paid once their creator has opted in. Rows whose
+    # creator is still not opted in are skipped without a write.
+    creators_paid = 0
+    budget = _payout_budget()
+    for page in _allocation_pages(db, None, "deferred"):
+        payable, _ = algorand_service.split_opted_in([row["creator_wallet"] for row in page])
+        ready = [row for row in page if row["creator_wallet"] in payable]
+        affordable = _affordable(ready, budget)
+        if affordable:
+            creators_paid += _pay_chunk(db, affordable)[0]
+            budget -= sum(int(row["amount_units"]) for row in affordable)
+        if len(affordable) < len(ready):
+            break
+    return creators_paid
+
+
+def _count(db: Any, run_id: str, status: str) -> int:
+    res = (
+        db.table("banner_allocations")
+        .select("id", count="exact")
+        .eq("run_id", run_id)
+        .eq("status", status)
+        .limit(1)
+        .execute()
+    )
+    return int(res.count or 0)
+
+
+def distribution_progress(run_id: str | None = None) -> dict[str, Any] | None:
+    db = get_db()
+    query = db.table("banner_distribution_runs").select("*")
+    if run_id is not None:
+        query = query.eq("id", run_id)
+    runs = query.order("created_at", desc=True).limit(1).execute().data
+    if not runs:
+        return None
+    run = runs[0]
+    return {
+        "run_id": run["id"],
+        "status": run["status"],
+        "creators_planned": run.get("creators_planned") or 0,
+        **{status: _count(db, run["id"], status) for status in ALLOCATION_STATUSES},
+        "creator_pool": to_tokens(row_units(run, "creator_pool")),
+        "platform_share": to_tokens(row_units(run, "platform_share")),
+        "last_error": run.get("last_error"),
+        "created_at": run.get("created_at"),
+        "updated_at": run.get("updated_at"),
+    }
+
+
+def _execute_run(db: Any, run: dict, total_subscribers: int | None = None) -> dict[str, Any]:
+    if run["status"] == "planning":
+        # Nothing is paid while planning, so an interrupted plan is simply rebuilt.
+        _plan_allocations(db, run, total_subscribers if total_subscribers is not None else _total_subscribers(db))
+
+    # Rejected payouts were never committed; give them another attempt on every resume.
+    db.table("banner_allocations").update({"status": "pending", "updated_at": _now()}).eq("run_id", run["id"]).eq(
+        "status", "failed"
+    ).execute()
+    creators_paid = _recover_outstanding(db, run["id"])
+    creators_paid += _pay_allocations(db, run["id"])
+
+    failed = _count(db, run["id"], "failed")
+    unknown = _count(db, run["id"], "unknown")
+    if failed or unknown:
+        raise RuntimeError(
+            f"Banner run {run['id']} incomplete: {failed} payouts failed, {unknown} still unresolved on chain and rechecked on the next run."
+        )
+    pending = _count(db, run["id"], "pending")
+    if pending:
+        raise RuntimeError(
+            f"Banner run {run['id']} paused: insufficient platform balance for {pending} pending payouts."
+        )
+
+    completed_at = _now()
+    db.table("banner_campaigns").update({"distributed": True, "active": False}).eq(
+        "distribution_run_id", run["id"]
+    ).execute()
+    db.table("banner_distribution_runs").update(
+        {"status": "completed", "last_error": None, "updated_at": completed_at, "completed_at": completed_at}
+    ).eq("id", run["id"]).execute()
+    return _report(
+        int(run.get("campaigns_count") or 0),
+        creators_paid,
+        row_units(run, "creator_pool"),
+        row_units(run, "platform_share"),
+        run["id"],
+        total_subscribers is None,
+        _count(db, run["id"], "deferred"),
+    )
+
+
+def _distribute(db: Any) -> dict[str, Any]:
+    run = _open_run(db)
+    total_subscribers: int | None = None
+    if run is None:
+        eligible_campaigns = eligible_banner_campaigns(db)
+        if not eligible_campaigns:
+            return _report(0, 0, 0, 0)
+
+        total_revenue = sum(row_units(campaign, "fixed_price") for campaign in eligible_campaigns)
+        if total_revenue <= 0:
+            return _report(0, 0, 0, 0)
+
+        creator_pool, platform_share = split_revenue(total_revenue)
+        if creator_pool <= 0:
+            return _report(0, 0, creator_pool, platform_share)
+
+        total_subscribers = _total_subscribers(db)
+        if total_subscribers <= 0:
+            return _report(0, 0, creator_pool, platform_share)
+
+        if settings.solvency_policy == solvency.SOLVENCY_REFUSE and creator_pool > _payout_budget():
+            raise RuntimeError(
+                f"Platform wallet cannot cover the banner creator pool of {to_tokens(creator_pool)} tokens."
+            )
+
+        run = _create_run(db, eligible_campaigns, creator_pool, platform_share)
+
+    try:
+        return _execute_run(db, run, total_subscribers)
+    except Exception as exc:
+        db.table("banner_distribution_runs").update({"last_error": str(exc), "updated_at": _now()}).eq(
+            "id", run["id"]
+        ).execute()
+        raise
+
+
+def distribute_banner_rewards() -> dict[str, Any]:
+    if not _run_lock.acquire(blocking=False):
+        raise RuntimeError("A banner distribution is already running.")
+    try:
+        db = get_db()
+        # Allocations deferred by earlier runs go first, before this run defers new ones.
+        deferred_paid = _retry_deferred(db)
+        report = _distribute(db)
+        report["deferred_paid"] = deferred_paid
+        return report
+    finally:
+        _run_lock.release()
@@ -0,0 +1,161 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import os
+import time
+from collections.abc import AsyncIterator
+from typing import Any
+
+from ..config import settings
+from ..database import get_async_db
+from .pinning_queue import COMPLETED, FAILED, RetryLater, pin_spooled
+
+logger = logging.getLogger(__name__)
+
+# A catalog import: every file of the batch is spooled by the route, pinned here with at most
+# BATCH_UPLOAD_CONCURRENCY pins in flight, and the videos of all pinned files are inserted with one
+# bulk insert at the end. Progress is published as events while the batch runs. The batch runs in
+# its own task, so a client that disconnects does not leave pinned files without their videos.
+
+_running: set[asyncio.Task] = set()
+
+
+def batch_spool_path(batch_id: str, index: int) -> str:
+    return os.path.join(settings.upload_spool_dir, f"batch-{batch_id}-{index}")
+
+
+def _discard(path: str) -> None:
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+
+
+class BatchImport:
+    def __init__(self, creator_id: str, items: list[dict[str, Any]]) -> None:
+        # Each item: index, path, filename, content_type, title, description, content_sha256.
+        self.creator_id = creator_id
+        self.items = items
+        self.results: list[dict[str, Any]] = [
+            {"index": item["index"], "filename": item["filename"], "status": "pending"} for item in items
+        ]
+        self._events: asyncio.Queue[dict[str, Any] | None] = asyncio.Queue()
+        self._resume_at = 0.0
+        self._done = 0
+
+    def start(self) -> None:
+        task = asyncio.create_task(self._run(), name="batch-import")
+        _running.add(task)
+        task.add_done_callback(_running.discard)
+
+    async def events(self) -> AsyncIterator[dict[str, Any]]:
+        while (event := await self._events.get()) is not None:
+            yield event
+
+    async def result(self) -> dict[str, Any]:
+        summary: dict[str, Any] = {}
+        async for event in self.events():
+            summary = event
+        return summary
+
+    def _publish(self, event: dict[str, Any]) -> None:
+        self._events.put_nowait(event)
+
+    async def _run(self) -> None:
+        self._publish({"event": "started", "total": len(self.items)})
+        try:
+            semaphore = asyncio.Semaphore(max(1, settings.batch_upload_concurrency))
+            await asyncio.gather(*(self._pin(item, semaphore) for item in self.items))
+            await self._insert_videos()
+        except Exception as exc:
+            logger.exception("Batch import failed")
+            for result in self.results:
+                if result["status"] != COMPLETED:
+                    result.update(status=FAILED, error=result.get("error") or str(exc))
+        finally:
+            for item in self.items:
+                _discard(item["path"])
+            created = sum(1 for result in self.results if result["status"] == COMPLETED)
+            self._publish(
+                {
+                    "event": "completed",
+                    "total": len(self.items),
+                    "created": created,
+                    "failed": len(self.items) - created,
+                    "results": self.results,
+                }
+            )
+            self._publish(None)
+
+    async def _pin(self, item: dict[str, Any], semaphore: asyncio.Semaphore) -> None:
+        result = self.results[item["index"]]
+        async with semaphore:
+            for attempt in range(1, settings.pinning_max_attempts + 1):
+                # A 429 on any file holds back the whole batch until its Retry-After has passed.
+                pause = self._resume_at - time.monotonic()
+                if pause > 0:
+                    await asyncio.sleep(pause)
+                try:
+                    result["cid"] = await asyncio.to_thread(
+                        pin_spooled,
+                        item["path"],
+                        item["filename"],
+                        item.get("content_type"),
+                        item.get("content_sha256"),
+                        attempt,
+                    )
+                    result["status"] = "pinned"
+                    result.pop("error", None)
+                    break
+                except RetryLater as exc:
+                    result["error"] = f"Pinata upload failed after {attempt} attempts: {exc}"
+                    if attempt == settings.pinning_max_attempts:
+                        result["status"] = FAILED
+                        break
+                    if exc.rate_limited:
+                        self._resume_at = max(self._resume_at, time.monotonic() + exc.delay)
+                    else:
+                        await asyncio.sleep(exc.delay)
+                except Exception as exc:
+                    result.update(status=FAILED, error=f"Pinata upload failed: {exc}")
+                    break
+        _discard(item["path"])
+        self._done += 1
+        event = {
+            "event": result["status"],
+            "index": item["index"],
+            "filename": item["filename"],
+            "done": self._done,
+            "total": len(self.items),
+        }
+        event.update({"cid": result["cid"]} if result["status"] == "pinned" else {"error": result["error"]})
+        self._publish(event)
+
+    async def _insert_videos(self) -> None:
+        pinned = [item for item in self.items if self.results[item["index"]]["status"] == "pinned"]
+        if not pinned:
+            return
+        created = await (
+            get_async_db()
+            .table("videos")
+            .insert(
+                [
+                    {
+                        "creator_id": self.creator_id,
+                        "cid": self.results[item["index"]]["cid"],
+                        "title": item["title"],
+                        "description": item["description"],
+                        "ads_enabled": True,
+                    }
+                    for item in pinned
+                ]
+            )
+            .execute()
+        )
+        if len(created.data or []) != len(pinned):
+            raise RuntimeError("Failed to save video metadata.")
+        # Rows come back in insert order.
+        for item, row in zip(pinned, created.data):
+            result = self.results[item["index"]]
+            result.update(status=COMPLETED, video_id=row["id"])
@@ -0,0 +1,160 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import threading
+import time
+from collections.abc import Callable
+from typing import Any
+
+from algosdk import error
+
+from ..config import settings
+
+
+logger = logging.getLogger(__name__)
+
+
+class PendingTxn:
+    def __init__(self, txid: str, last_valid_round: int, wait_rounds: int) -> None:
+        self.txid = txid
+        self.last_valid_round = last_valid_round
+        self.wait_rounds = wait_rounds
+        self.deadline_round: int | None = None
+        self.confirmed_round: int | None = None
+        self.done = threading.Event()
+        self._callbacks: list[Callable[[], None]] = []
+        self._lock = threading.Lock()
+
+    def _resolve(self, confirmed_round: int | None) -> None:
+        with self._lock:
+            if self.done.is_set():
+                return
+            self.confirmed_round = confirmed_round
+            self.done.set()
+            callbacks, self._callbacks = self._callbacks, []
+        for callback in callbacks:
+            callback()
+
+    def add_done_callback(self, callback: Callable[[], None]) -> None:
+        with self._lock:
+            if not self.done.is_set():
+                self._callbacks.append(callback)
+                return
+        callback()
+
+
+class ConfirmationTracker:
+    # One background thread follows the chain round by round and reads each block's txids
+    # once, resolving every in-flight transaction this process submitted. Confirmation cost is
+    # one algod read per round regardless of how many payouts are waiting.
+
+    def __init__(self, client_factory: Callable[[], Any]) -> None:
+        self._client_factory = client_factory
+        self._cond = threading.Condition()
+        self._pending: dict[str, PendingTxn] = {}
+        self._next_round: int | None = None
+        self._thread: threading.Thread | None = None
+        self.rounds_read = 0
+        self.confirmed = 0
+        self.expired = 0
+
+    def track(self, txid: str, last_valid_round: int, wait_rounds: int = 4) -> PendingTxn:
+        # Register before sending so the txn cannot confirm in a round the follower skipped.
+        pending = PendingTxn(txid, last_valid_round, wait_rounds)
+        with self._cond:
+            self._pending[txid] = pending
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._follow, name="algod-block-follower", daemon=True)
+                self._thread.start()
+            self._cond.notify_all()
+        return pending
+
+    def forget(self, pending: PendingTxn) -> None:
+        with self._cond:
+            self._pending.pop(pending.txid, None)
+        pending._resolve(None)
+
+    def wait(self, pending: PendingTxn) -> int:
+        pending.done.wait(timeout=settings.confirmation_timeout_seconds)
+        return self._result(pending)
+
+    async def wait_async(self, pending: PendingTxn) -> int:
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+
+        def wake() -> None:
+            loop.call_soon_threadsafe(lambda: future.done() or future.set_result(None))
+
+        pending.add_done_callback(wake)
+        try:
+            await asyncio.wait_for(future, timeout=settings.confirmation_timeout_seconds)
+        except asyncio.TimeoutError:
+            pass
+        return await asyncio.to_thread(self._result, pending)
+
+    def _result(self, pending: PendingTxn) -> int:
+        if pending.confirmed_round:
+            return pending.confirmed_round
+        self.forget(pending)
+        # The follower gave up (deadline passed or it fell behind): one direct lookup before failing.
+        try:
+            info = self._client_factory().pending_transaction_info(pending.txid)
+        except error.AlgodHTTPError:
+            info = {}
+        if info.get("pool-error"):
+            raise error.TransactionRejectedError("Transaction rejected: " + info["pool-error"])
+        if info.get("confirmed-round"):
+            return int(info["confirmed-round"])
+        raise error.ConfirmationTimeoutError(f"Wait for transaction id {pending.txid} timed out")
+
+    def _follow(self) -> None:
+        while True:
+            with self._cond:
+                while not self._pending:
+                    # Idle: stop following until the next submission.
+                    self._next_round = None
+                    self._cond.wait()
+                round_num = self._next_round
+            try:
+                client = self._client_factory()
+                if round_num is None:
+                    round_num = int(client.status()["last-round"])
+                elif int(client.status_after_block(round_num - 1).get("last-round", 0)) < round_num:
+                    # algod's long poll timed out before the round was produced.
+                    continue
+                txids = client.get_block_txids(round_num).get("blockTxids") or []
+            except Exception:
+                logger.exception("Block follower failed to read round %s", round_num)
+                time.sleep(1)
+                continue
+
+            self.rounds_read += 1
+            self._process_round(round_num, set(txids))
+
+    def _process_round(self, round_num: int, txids: set[str]) -> None:
+        resolved: list[tuple[PendingTxn, int | None]] = []
+        with self._cond:
+            for txid, pending in list(self._pending.items()):
+                if pending.deadline_round is None:
+                    pending.deadline_round = min(pending.last_valid_round, round_num + pending.wait_rounds)
+                if txid in txids:
+                    resolved.append((self._pending.pop(txid), round_num))
+                elif round_num >= pending.deadline_round:
+                    resolved.append((self._pending.pop(txid), None))
+            self._next_round = round_num + 1
+
+        for pending, confirmed_round in resolved:
+            if confirmed_round is None:
+                self.expired += 1
+            else:
+                self.confirmed += 1
+            pending._resolve(confirmed_round)
+
+    def stats(self) -> dict[str, int]:
+        return {
+            "in_flight": len(self._pending),
+            "rounds_read": self.rounds_read,
+            "confirmed": self.confirmed,
+            "expired": self.expired,
+        }
@@ -0,0 +1,162 @@
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from collections import deque
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any
+
+import requests
+
+from ..config import settings
+
+logger = logging.getLogger(__name__)
+_LATENCY_WINDOW = 20
+_UNREACHABLE_SCORE = 1_000.0
+
+
+def normalize_gateway(gateway: str) -> str:
+    gateway = gateway.strip().rstrip("/")
+    if gateway.startswith("http://") or gateway.startswith("https://"):
+        return gateway
+    return f"https://{gateway}"
+
+
+class GatewayStats:
+    def __init__(self, base_url: str) -> None:
+        self.base_url = base_url
+        self._lock = threading.Lock()
+        self._latencies: deque[float] = deque(maxlen=_LATENCY_WINDOW)
+        self.probes = 0
+        self.failures = 0
+        self.availability = 1.0
+        self.consecutive_failures = 0
+        self.last_probe_at: float | None = None
+
+    def record(self, seconds: float | None, ok: bool) -> None:
+        with self._lock:
+            self.probes += 1
+            self.last_probe_at = time.time()
+            # Exponentially weighted so a gateway that recovers is trusted again within a few probes.
+            self.availability = self.availability * 0.7 + (0.3 if ok else 0.0)
+            if ok and seconds is not None:
+                self._latencies.append(seconds)
+                self.consecutive_failures = 0
+                return
+            self.failures += 1
+            self.consecutive_failures += 1
+
+    def latency(self) -> float | None:
+        with self._lock:
+            if not self._latencies:
+                return None
+            ordered = sorted(self._latencies)
+        return ordered[len(ordered) // 2]
+
+    def score(self) -> float:
+        # Lower is better: median time to first byte, inflated by recent failures. Gateways that
+        # failed their last probes sink below every reachable one.
+        if self.consecutive_failures >= settings.gateway_failure_threshold:
+            return _UNREACHABLE_SCORE + self.consecutive_failures
+        latency = self.latency()
+        if latency is None:
+            return _UNREACHABLE_SCORE / 2 if self.probes else 0.0
+        return latency / max(self.availability, 0.05)
+
+    def snapshot(self) -> dict[str, Any]:
+        latency = self.latency()
+        return {
+            "gateway": self.base_url,
+            "probes": self.probes,
+            "failures": self.failures,
+            "availability": round(self.availability, 4),
+            "latency_ms": round(latency * 1000, 1) if latency is not None else None,
+            "reachable": self.consecutive_failures < settings.gateway_failure_threshold,
+            "score": round(self.score(), 4),
+        }
+
+
+class GatewayRegistry:
+    # Ranks the configured IPFS gateways by a background probe of each one's time to first byte
+    # for a small known CID. Unprobed gateways keep their configured order.
+
+    def __init__(self, gateways: Callable[[], list[str]]) -> None:
+        self._gateways = gateways
+        self._lock = threading.Lock()
+        self._stats: dict[str, GatewayStats] = {}
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+        self._session = requests.Session()
+
+    def _current(self) -> list[GatewayStats]:
+        configured = list(dict.fromkeys(normalize_gateway(gateway) for gateway in self._gateways() if gateway.strip()))
+        with self._lock:
+            for gateway in configured:
+                if gateway not in self._stats:
+                    self._stats[gateway] = GatewayStats(gateway)
+            return [self._stats[gateway] for gateway in configured]
+
+    def ranked(self) -> list[str]:
+        current = self._current()
+        order = {stats.base_url: position for position, stats in enumerate(current)}
+        return [stats.base_url for stats in sorted(current, key=lambda stats: (stats.score(), order[stats.base_url]))]
+
+    def best(self) -> str:
+        return self.ranked()[0]
+
+    def _probe_one(self, stats: GatewayStats) -> None:
+        started = time.perf_counter()
+        try:
+            response = self._session.get(
+                f"{stats.base_url}/ipfs/{settings.gateway_probe_cid}",
+                headers={"Range": "bytes=0-0"},
+                stream=True,
+                timeout=settings.gateway_probe_timeout_seconds,
+            )
+            elapsed = time.perf_counter() - started
+            response.close()
+            stats.record(elapsed, response.status_code < 400)
+        except requests.RequestException:
+            stats.record(None, False)
+
+    def probe(self) -> None:
+        current = self._current()
+        if not current:
+            return
+        with ThreadPoolExecutor(max_workers=len(current), thread_name_prefix="gateway-probe") as pool:
+            list(pool.map(self._probe_one, current))
+
+    def start(self) -> None:
+        if self._thread is not None and self._thread.is_alive():
+            return
+        if len(self._current()) < 2:
+            return  # nothing to choose between
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="gateway-prober", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        thread, self._thread = self._thread, None
+        if thread is not None:
+            thread.join(timeout=settings.gateway_probe_timeout_seconds + 1)
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            try:
+                self.probe()
+            except Exception:
+                logger.exception("Gateway probe failed")
+            self._stop.wait(settings.gateway_probe_interval_seconds)
+
+    def snapshot(self) -> list[dict[str, Any]]:
+        return [self._stats_for(gateway).snapshot() for gateway in self.ranked()]
+
+    def _stats_for(self, gateway: str) -> GatewayStats:
+        with self._lock:
+            return self._stats[gateway]
+
+
+gateway_registry = GatewayRegistry(lambda: settings.ipfs_gateway_list)
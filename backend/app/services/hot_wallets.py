@@ -0,0 +1,46 @@
+from __future__ import annotations
+
+import threading
+from collections.abc import Callable
+from typing import NamedTuple
+
+from algosdk import account, mnemonic
+
+
+class HotWallet(NamedTuple):
+    private_key: str
+    address: str
+
+
+class HotWalletPool:
+    # Funded sender accounts for bulk payouts. Each wallet signs its own share of a run with its
+    # own in-flight window, so submission is not serialized through one sender. The platform
+    # account stays the treasury and tops the pool up before each run.
+
+    def __init__(self, mnemonics: Callable[[], list[str]]) -> None:
+        self._mnemonics = mnemonics
+        self._lock = threading.Lock()
+        self._source: tuple[str, ...] = ()
+        self._wallets: list[HotWallet] = []
+
+    def wallets(self) -> list[HotWallet]:
+        source = tuple(self._mnemonics())
+        with self._lock:
+            if source != self._source:
+                wallets = []
+                for phrase in source:
+                    private_key = mnemonic.to_private_key(phrase)
+                    wallets.append(HotWallet(private_key, account.address_from_private_key(private_key)))
+                self._source, self._wallets = source, wallets
+            return list(self._wallets)
+
+    def assign(self, amounts: list[int]) -> list[tuple[HotWallet, list[int]]]:
+        # Spreads payout indexes round-robin so every wallet sends a similar number of
+        # transactions; returns only wallets with work.
+        wallets = self.wallets()
+        if not wallets:
+            return []
+        shares: list[list[int]] = [[] for _ in wallets]
+        for index in range(len(amounts)):
+            shares[index % len(wallets)].append(index)
+        return [(wallet, indexes) for wallet, indexes in zip(wallets, shares) if indexes]
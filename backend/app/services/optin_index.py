@@ -0,0 +1,114 @@
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from collections.abc import Callable, Iterable
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any
+
+from algosdk import error
+
+from ..config import settings
+
+
+logger = logging.getLogger(__name__)
+
+
+def is_optin_rejection(exc: BaseException) -> bool:
+    # algod rejects transfers to non-holders with "... must optin, asset N missing from ADDR".
+    message = str(exc).lower()
+    return "must optin" in message or "missing from" in message
+
+
+class OptInIndex:
+    # Which payout receivers hold the settlement asset. Opt-ins are sticky, so positive entries
+    # live for optin_cache_ttl_seconds; negative entries expire after optin_negative_ttl_seconds
+    # so a creator who opts in is picked up by a later run even if nobody reports it.
+    # Unknown wallets are looked up in bulk before a run builds any transactions.
+
+    def __init__(self, client_factory: Callable[[], Any]) -> None:
+        self._client_factory = client_factory
+        self._lock = threading.Lock()
+        self._entries: dict[tuple[int, str], tuple[float, bool]] = {}
+        self.lookups = 0
+        self.lookup_errors = 0
+
+    def _ttl(self, opted_in: bool) -> float:
+        return settings.optin_cache_ttl_seconds if opted_in else settings.optin_negative_ttl_seconds
+
+    def get(self, wallet: str) -> bool | None:
+        with self._lock:
+            entry = self._entries.get((settings.asset_id, wallet))
+        if entry is None or entry[0] <= time.monotonic():
+            return None
+        return entry[1]
+
+    def mark(self, wallet: str, opted_in: bool) -> None:
+        ttl = self._ttl(opted_in)
+        with self._lock:
+            if ttl <= 0:
+                self._entries.pop((settings.asset_id, wallet), None)
+                return
+            if len(self._entries) >= settings.optin_cache_max_entries:
+                now = time.monotonic()
+                self._entries = {key: entry for key, entry in self._entries.items() if entry[0] > now}
+                if len(self._entries) >= settings.optin_cache_max_entries:
+                    self._entries.pop(next(iter(self._entries)))
+            self._entries[(settings.asset_id, wallet)] = (time.monotonic() + ttl, opted_in)
+
+    def invalidate(self, wallet: str) -> None:
+        with self._lock:
+            self._entries.pop((settings.asset_id, wallet), None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def _lookup(self, wallet: str) -> bool | None:
+        self.lookups += 1
+        try:
+            self._client_factory().account_asset_info(wallet, settings.asset_id)
+        except error.AlgodHTTPError as exc:
+            if exc.code == 404:
+                return False
+            self.lookup_errors += 1
+            logger.warning("Opt-in lookup for %s failed: %s", wallet, exc)
+            return None
+        except Exception as exc:
+            self.lookup_errors += 1
+            logger.warning("Opt-in lookup for %s failed: %s", wallet, exc)
+            return None
+        return True
+
+    def refresh(self, wallets: Iterable[str]) -> None:
+        # Bounded-concurrency lookups for every wallet without a live entry; the endpoint pool
+        # spreads them across nodes. Failed lookups are not cached.
+        if settings.asset_id <= 0:
+            return
+        missing = [wallet for wallet in dict.fromkeys(wallets) if wallet and self.get(wallet) is None]
+        if not missing:
+            return
+        workers = max(1, min(settings.optin_lookup_concurrency, len(missing)))
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="optin-lookup") as pool:
+            for wallet, opted_in in zip(missing, pool.map(self._lookup, missing)):
+                if opted_in is not None:
+                    self.mark(wallet, opted_in)
+
+    def split(self, wallets: Iterable[str]) -> tuple[set[str], set[str]]:
+        # Returns (payable, not opted in). Wallets whose status could not be established are
+        # treated as payable and left for the node to accept or reject.
+        wallets = list(wallets)
+        self.refresh(wallets)
+        not_opted_in = {wallet for wallet in wallets if self.get(wallet) is False}
+        return set(wallets) - not_opted_in, not_opted_in
+
+    def observe_transfer(self, receiver: str, failure: BaseException | None) -> None:
+        # A confirmed transfer proves the opt-in; an opt-in rejection disproves it.
+        if failure is None:
+            self.mark(receiver, True)
+        elif is_optin_rejection(failure):
+            self.mark(receiver, False)
+
+    def stats(self) -> dict[str, int]:
+        return {"entries": len(self._entries), "lookups": self.lookups, "lookup_errors": self.lookup_errors}
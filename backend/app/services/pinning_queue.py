@@ -0,0 +1,258 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import os
+import time
+from datetime import datetime, timezone
+from typing import Any
+
+import requests
+
+from ..config import settings
+from ..database import get_async_db, get_db
+from . import storage_service
+
+RECEIVING = "receiving"  # resumable upload still taking chunks
+QUEUED = "queued"
+PINNING = "pinning"
+COMPLETED = "completed"
+FAILED = "failed"
+
+logger = logging.getLogger(__name__)
+
+# Uploads are spooled to local disk by the route and pinned here by a fixed number of worker
+# tasks, so a request returns as soon as its file is on disk. A 429 from Pinata pauses every
+# worker until its Retry-After has passed; 5xx and connection errors retry the job with
+# exponential backoff. The video row is inserted when the CID arrives. Files whose content hash
+# is already in the CID index are completed by the route without being queued.
+
+
+def _now() -> str:
+    return datetime.now(timezone.utc).isoformat()
+
+
+def spool_path(job_id: str) -> str:
+    return os.path.join(settings.upload_spool_dir, job_id)
+
+
+def _discard_spool(job: dict[str, Any]) -> None:
+    try:
+        os.remove(spool_path(job["id"]))
+    except FileNotFoundError:
+        pass
+
+
+def fail_upload(job: dict[str, Any], reason: str, cid: str | None = None) -> None:
+    logger.warning("Pinning job %s failed: %s", job["id"], reason)
+    get_db().table("upload_jobs").update(
+        {"status": FAILED, "cid": cid, "error": reason, "updated_at": _now()}
+    ).eq("id", job["id"]).execute()
+    _discard_spool(job)
+
+
+def finish_upload(job: dict[str, Any], cid: str) -> str | None:
+    # Inserts the video for a pinned upload; returns its id, or None when the job failed instead.
+    db = get_db()
+    created = (
+        db.table("videos")
+        .insert(
+            {
+                "creator_id": job["creator_id"],
+                "cid": cid,
+                "title": job["title"],
+                "description": job.get("description") or "",
+                "ads_enabled": True,
+            }
+        )
+        .execute()
+    )
+    if not created.data:
+        fail_upload(job, "Failed to save video metadata.", cid)
+        return None
+    video_id = created.data[0]["id"]
+    db.table("upload_jobs").update(
+        {"status": COMPLETED, "cid": cid, "video_id": video_id, "error": None, "updated_at": _now()}
+    ).eq("id", job["id"]).execute()
+    _discard_spool(job)
+    return video_id
+
+
+class RetryLater(Exception):
+    def __init__(self, delay: float, reason: str, rate_limited: bool = False) -> None:
+        super().__init__(reason)
+        self.delay = delay
+        self.rate_limited = rate_limited
+
+
+def _backoff(attempts: int) -> float:
+    return min(settings.pinning_retry_base_seconds * 2 ** max(attempts - 1, 0), settings.pinning_retry_max_seconds)
+
+
+def _retry_after(response: requests.Response, attempts: int) -> float:
+    try:
+        return max(float(response.headers.get("Retry-After", "")), 0.0)
+    except ValueError:
+        return _backoff(attempts)
+
+
+def pin_spooled(path: str, filename: str, content_type: str | None, sha256: str | None, attempts: int) -> str:
+    # Runs in a worker thread. Raises RetryLater for errors worth another attempt.
+    try:
+        with open(path, "rb") as stream:
+            return storage_service.pin_stream(stream, filename, content_type, sha256)
+    except requests.HTTPError as exc:
+        status = exc.response.status_code if exc.response is not None else 0
+        if status == 429:
+            raise RetryLater(_retry_after(exc.response, attempts), "Pinata rate limit", rate_limited=True) from exc
+        if status >= 500:
+            raise RetryLater(_backoff(attempts), f"Pinata error {status}") from exc
+        raise
+    except (requests.ConnectionError, requests.Timeout) as exc:
+        raise RetryLater(_backoff(attempts), str(exc)) from exc
+
+
+def _pin(job: dict[str, Any]) -> str:
+    return pin_spooled(
+        spool_path(job["id"]),
+        job["filename"],
+        job.get("content_type"),
+        job.get("content_sha256"),
+        int(job.get("attempts") or 0),
+    )
+
+
+class PinningQueue:
+    def __init__(self) -> None:
+        self._queue: asyncio.Queue[dict[str, Any]] | None = None
+        self._workers: list[asyncio.Task] = []
+        self._retries: set[asyncio.TimerHandle] = set()
+        self._resume_at = 0.0
+        self._outstanding = 0
+        self._idle = asyncio.Event()
+        self._idle.set()
+
+    @property
+    def running(self) -> bool:
+        return bool(self._workers)
+
+    async def start(self) -> None:
+        if self._workers:
+            return
+        os.makedirs(settings.upload_spool_dir, exist_ok=True)
+        self._queue = asyncio.Queue()
+        self._workers = [
+            asyncio.create_task(self._work(), name=f"pinning-worker-{index}")
+            for index in range(max(1, settings.pinning_workers))
+        ]
+        try:
+            unfinished = await self._unfinished_jobs()
+        except Exception:
+            logger.exception("Could not load unfinished upload jobs")
+            unfinished = []
+        for job in unfinished:
+            self.submit(job)
+
+    async def stop(self) -> None:
+        for handle in self._retries:
+            handle.cancel()
+        self._retries.clear()
+        workers, self._workers = self._workers, []
+        for worker in workers:
+            worker.cancel()
+        await asyncio.gather(*workers, return_exceptions=True)
+        self._queue = None
+        self._outstanding = 0
+        self._idle.set()
+
+    def submit(self, job: dict[str, Any]) -> None:
+        if self._queue is None:
+            raise RuntimeError("Pinning workers are not running.")
+        self._outstanding += 1
+        self._idle.clear()
+        self._queue.put_nowait(job)
+
+    async def join(self) -> None:
+        # Waits until every submitted job has completed or failed, including scheduled retries.
+        await self._idle.wait()
+
+    def _finished(self) -> None:
+        self._outstanding -= 1
+        if self._outstanding <= 0:
+            self._outstanding = 0
+            self._idle.set()
+
+    async def _unfinished_jobs(self) -> list[dict[str, Any]]:
+        # Jobs interrupted by a restart are picked up again when their spooled file is on this host.
+        rows = (
+            await get_async_db()
+            .table("upload_jobs")
+            .select("*")
+            .in_("status", [QUEUED, PINNING])
+            .order("created_at")
+            .execute()
+        ).data or []
+        return [row for row in rows if os.path.exists(spool_path(row["id"]))]
+
+    def _retry_later(self, job: dict[str, Any], delay: float) -> None:
+        loop = asyncio.get_running_loop()
+
+        def requeue() -> None:
+            self._retries.discard(handle)
+            if self._queue is not None:
+                self._queue.put_nowait(job)
+
+        handle = loop.call_later(delay, requeue)
+        self._retries.add(handle)
+
+    async def _work(self) -> None:
+        assert self._queue is not None
+        queue = self._queue
+        while True:
+            job = await queue.get()
+            try:
+                pause = self._resume_at - time.monotonic()
+                if pause > 0:
+                    await asyncio.sleep(pause)
+                await self._process(job)
+            except Exception:
+                logger.exception("Pinning job %s crashed", job.get("id"))
+                self._finished()
+            finally:
+                queue.task_done()
+
+    async def _process(self, job: dict[str, Any]) -> None:
+        db = get_async_db()
+        job["attempts"] = int(job.get("attempts") or 0) + 1
+        await db.table("upload_jobs").update({"status": PINNING, "attempts": job["attempts"], "updated_at": _now()}).eq(
+            "id", job["id"]
+        ).execute()
+        try:
+            cid = await asyncio.to_thread(_pin, job)
+        except RetryLater as exc:
+            if job["attempts"] >= settings.pinning_max_attempts:
+                await self._fail(job, f"Pinata upload failed after {job['attempts']} attempts: {exc}")
+                return
+            if exc.rate_limited:
+                self._resume_at = max(self._resume_at, time.monotonic() + exc.delay)
+            await db.table("upload_jobs").update({"status": QUEUED, "error": str(exc), "updated_at": _now()}).eq(
+                "id", job["id"]
+            ).execute()
+            self._retry_later(job, exc.delay)
+            return
+        except Exception as exc:
+            await self._fail(job, f"Pinata upload failed: {exc}")
+            return
+        await self._complete(job, cid)
+
+    async def _complete(self, job: dict[str, Any], cid: str) -> None:
+        # finish_upload and fail_upload also remove the spooled file, so they run off the loop.
+        await asyncio.to_thread(finish_upload, job, cid)
+        self._finished()
+
+    async def _fail(self, job: dict[str, Any], reason: str) -> None:
+        await asyncio.to_thread(fail_upload, job, reason)
+        self._finished()
+
+
+pinning_queue = PinningQueue()
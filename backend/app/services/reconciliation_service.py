@@ -0,0 +1,165 @@
+from __future__ import annotations
+
+import logging
+import threading
+from collections import Counter
+from collections.abc import Iterator
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from typing import Any
+
+from ..config import settings
+from ..database import get_db
+from . import algorand_service
+
+RECONCILE_JOB = "settlements"
+CONFIRMED = "confirmed"
+PENDING = "pending"  # not confirmed yet or lookup failed; checked again on every run
+MISSING = "missing"
+MISMATCH = "mismatch"
+
+logger = logging.getLogger(__name__)
+_run_lock = threading.Lock()
+
+
+# Settlement rows are checked against the chain in keyset pages of seq (an insertion-ordered
+# bigserial). Only rows past the stored watermark are new work; rows left pending by an earlier
+# run are checked again first. Lookups run with bounded concurrency and each page is written
+# back with one upsert before the watermark moves past it.
+
+
+def _now() -> str:
+    return datetime.now(timezone.utc).isoformat()
+
+
+def _watermark(db: Any) -> int:
+    rows = db.table("reconciliation_watermarks").select("last_seq").eq("job", RECONCILE_JOB).limit(1).execute().data
+    return int(rows[0]["last_seq"]) if rows else 0
+
+
+def _save_watermark(db: Any, last_seq: int) -> None:
+    db.table("reconciliation_watermarks").upsert(
+        {"job": RECONCILE_JOB, "last_seq": last_seq, "updated_at": _now()}, on_conflict="job"
+    ).execute()
+
+
+def _settlement_pages(db: Any, after_seq: int, status: str | None = None, until_seq: int | None = None) -> Iterator[list[dict]]:
+    page_size = max(1, settings.reconcile_page_size)
+    last_seq = after_seq
+    while True:
+        query = (
+            db.table("settlements")
+            .select("id, seq, creator_wallet, amount_units, tx_hash, confirmed_round")
+            .gt("seq", last_seq)
+        )
+        if status is not None:
+            query = query.eq("reconciliation_status", status)
+        if until_seq is not None:
+            query = query.lte("seq", until_seq)
+        page = query.order("seq").limit(page_size).execute().data or []
+        if page:
+            yield page
+        if len(page) < page_size:
+            return
+        last_seq = int(page[-1]["seq"])
+
+
+def _check_block(tx_hash: str, confirmed_round: int | None) -> tuple[str, int | None, str | None]:
+    # Without an indexer, algod forgets confirmed transactions after a while, so the block at the
+    # round recorded at settlement time decides. Block txids carry no amounts, so a row found
+    # there is confirmed without the amount check.
+    if not confirmed_round:
+        return PENDING, None, "Transaction not on algod and no confirmed round recorded; needs INDEXER_ADDRESS."
+    try:
+        found = algorand_service.transaction_in_block(tx_hash, int(confirmed_round))
+    except Exception as exc:
+        return PENDING, int(confirmed_round), f"Could not read block {confirmed_round}: {exc}"
+    if not found:
+        return MISSING, None, f"Transaction not in block {confirmed_round}."
+    return CONFIRMED, int(confirmed_round), "Found in its block; amount not checked without INDEXER_ADDRESS."
+
+
+def _check(row: dict) -> tuple[str, int | None, str | None]:
+    tx_hash = row.get("tx_hash")
+    if not tx_hash:
+        return MISSING, None, "No transaction hash recorded."
+    try:
+        record = algorand_service.lookup_transfer(tx_hash, row["creator_wallet"])
+    except Exception as exc:
+        return PENDING, row.get("confirmed_round"), f"Lookup failed: {exc}"
+    if record is None:
+        if algorand_service.client_manager.indexer() is None:
+            return _check_block(tx_hash, row.get("confirmed_round"))
+        return MISSING, None, "Transaction not found on chain."
+    if not record.confirmed_round:
+        return PENDING, None, "Transaction not confirmed yet."
+    expected = int(row["amount_units"])
+    if record.amount_units != expected:
+        return (
+            MISMATCH,
+            int(record.confirmed_round),
+            f"Expected {expected} units to {row['creator_wallet']}, transaction moved {record.amount_units}.",
+        )
+    return CONFIRMED, int(record.confirmed_round), None
+
+
+def _reconcile_page(db: Any, pool: ThreadPoolExecutor, page: list[dict]) -> Counter[str]:
+    checked_at = _now()
+    rows = []
+    outcomes: Counter[str] = Counter()
+    for row, (status, confirmed_round, reason) in zip(page, pool.map(_check, page)):
+        outcomes[status] += 1
+        rows.append(
+            {
+                "id": row["id"],
+                "creator_wallet": row["creator_wallet"],
+                "amount_units": row["amount_units"],
+                "confirmed_round": confirmed_round if confirmed_round is not None else row.get("confirmed_round"),
+                "reconciliation_status": status,
+                "reconciliation_error": reason,
+                "reconciled_at": checked_at,
+            }
+        )
+        if status in (MISSING, MISMATCH):
+            logger.warning("Settlement %s %s: %s", row["id"], status, reason)
+    db.table("settlements").upsert(rows, on_conflict="id").execute()
+    return outcomes
+
+
+def reconcile_settlements(max_rows: int | None = None) -> dict[str, int]:
+    # max_rows caps the new rows checked in one run; the watermark resumes from there next time.
+    if not _run_lock.acquire(blocking=False):
+        raise RuntimeError("Settlement reconciliation is already running.")
+    try:
+        db = get_db()
+        watermark = _watermark(db)
+        report: Counter[str] = Counter()
+        with ThreadPoolExecutor(
+            max_workers=max(1, settings.reconcile_concurrency), thread_name_prefix="reconcile"
+        ) as pool:
+            for page in _settlement_pages(db, 0, status=PENDING, until_seq=watermark):
+                report.update(_reconcile_page(db, pool, page))
+            report["rechecked"] = sum(report.values())
+
+            new_rows = 0
+            for page in _settlement_pages(db, watermark):
+                if max_rows is not None and new_rows >= max_rows:
+                    break
+                if max_rows is not None:
+                    page = page[: max_rows - new_rows]
+                report.update(_reconcile_page(db, pool, page))
+                new_rows += len(page)
+                watermark = int(page[-1]["seq"])
+                _save_watermark(db, watermark)
+        return {
+            "checked": sum(report[status] for status in (CONFIRMED, PENDING, MISSING, MISMATCH)),
+            "rechecked": report["rechecked"],
+            "new": new_rows,
+            CONFIRMED: report[CONFIRMED],
+            PENDING: report[PENDING],
+            MISSING: report[MISSING],
+            MISMATCH: report[MISMATCH],
+            "watermark": watermark,
+        }
+    finally:
+        _run_lock.release()
@@ -0,0 +1,132 @@
+from __future__ import annotations
+
+import base64
+import hashlib
+import os
+import shutil
+from collections.abc import AsyncIterator
+
+from ..config import settings
+
+# Resumable uploads are staged as one file per accepted chunk, named by its offset and SHA-256:
+#   <RESUMABLE_STAGING_DIR>/<job_id>/<offset>-<sha256>.part
+# The upload offset is where the last chunk ends, so it survives restarts without a database
+# write. A chunk is renamed into place only after its checksum is verified; an interrupted or
+# corrupt chunk leaves nothing behind and the client resends it from the same offset.
+
+CHECKSUM_ALGORITHMS = {"sha1", "sha256", "sha512", "md5"}
+
+
+class ChunkRejected(Exception):
+    def __init__(self, status_code: int, detail: str) -> None:
+        super().__init__(detail)
+        self.status_code = status_code
+        self.detail = detail
+
+
+def staging_dir(job_id: str) -> str:
+    return os.path.join(settings.resumable_staging_dir, job_id)
+
+
+def _chunks(job_id: str) -> list[tuple[int, str, str]]:
+    # (offset, sha256, path) of every accepted chunk, in offset order.
+    directory = staging_dir(job_id)
+    if not os.path.isdir(directory):
+        return []
+    chunks = []
+    for name in os.listdir(directory):
+        if not name.endswith(".part"):
+            continue
+        offset, sha256 = name[: -len(".part")].split("-", 1)
+        chunks.append((int(offset), sha256, os.path.join(directory, name)))
+    return sorted(chunks)
+
+
+def received_bytes(job_id: str) -> int:
+    chunks = _chunks(job_id)
+    if not chunks:
+        return 0
+    offset, _, path = chunks[-1]
+    return offset + os.path.getsize(path)
+
+
+def parse_checksum(header: str | None) -> tuple[str, bytes] | None:
+    # tus checksum extension: "Upload-Checksum: <algorithm> <base64 digest>".
+    if not header:
+        return None
+    try:
+        algorithm, encoded = header.strip().split(" ", 1)
+        digest = base64.b64decode(encoded.strip(), validate=True)
+    except ValueError as exc:
+        raise ChunkRejected(400, "Upload-Checksum must be '<algorithm> <base64 digest>'.") from exc
+    algorithm = algorithm.lower()
+    if algorithm not in CHECKSUM_ALGORITHMS:
+        raise ChunkRejected(400, f"Unsupported checksum algorithm: {algorithm}.")
+    return algorithm, digest
+
+
+async def write_chunk(
+    job_id: str,
+    offset: int,
+    length: int,
+    body: AsyncIterator[bytes],
+    checksum: tuple[str, bytes] | None = None,
+) -> int:
+    # Streams one chunk to a temporary file and accepts it at offset; returns the new offset.
+    if offset != received_bytes(job_id):
+        raise ChunkRejected(409, f"Upload-Offset {offset} does not match the upload offset {received_bytes(job_id)}.")
+    directory = staging_dir(job_id)
+    os.makedirs(directory, exist_ok=True)
+    temp_path = os.path.join(directory, f"{offset}.tmp")
+    digest = hashlib.sha256()
+    client_digest = hashlib.new(checksum[0]) if checksum else None
+    size = 0
+    try:
+        with open(temp_path, "wb") as target:
+            async for piece in body:
+                size += len(piece)
+                if offset + size > length:
+                    raise ChunkRejected(413, "Chunk goes past Upload-Length.")
+                if size > settings.resumable_max_chunk_bytes:
+                    raise ChunkRejected(413, f"Chunks are limited to {settings.resumable_max_chunk_bytes} bytes.")
+                digest.update(piece)
+                if client_digest is not None:
+                    client_digest.update(piece)
+                target.write(piece)
+        if size == 0:
+            raise ChunkRejected(400, "Chunk is empty.")
+        if client_digest is not None and client_digest.digest() != checksum[1]:
+            raise ChunkRejected(460, "Checksum mismatch; resend the chunk.")
+        os.replace(temp_path, os.path.join(directory, f"{offset:020d}-{digest.hexdigest()}.part"))
+    finally:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+    return offset + size
+
+
+def assemble(job_id: str, target_path: str) -> tuple[int, str]:
+    # Re-verifies every chunk and concatenates them into target_path; returns (size, sha256).
+    digest = hashlib.sha256()
+    expected_offset = 0
+    with open(target_path, "wb") as target:
+        for offset, sha256, path in _chunks(job_id):
+            if offset != expected_offset:
+                raise RuntimeError(f"Staged chunks are not contiguous at offset {expected_offset}.")
+            chunk_digest = hashlib.sha256()
+            with open(path, "rb") as source:
+                while piece := source.read(settings.upload_chunk_bytes):
+                    chunk_digest.update(piece)
+                    digest.update(piece)
+                    target.write(piece)
+            if chunk_digest.hexdigest() != sha256:
+                # Drop it and everything after it so the client can resend from this offset.
+                for later_offset, _, later_path in _chunks(job_id):
+                    if later_offset >= offset:
+                        os.remove(later_path)
+                raise RuntimeError(f"Staged chunk at offset {offset} is corrupt; resend from there.")
+            expected_offset = target.tell()
+        return target.tell(), digest.hexdigest()
+
+
+def discard(job_id: str) -> None:
+    shutil.rmtree(staging_dir(job_id), ignore_errors=True)
@@ -0,0 +1,47 @@
+from __future__ import annotations
+
+from collections.abc import Sequence
+
+import numpy as np
+
+
+_INT64_MAX = np.iinfo(np.int64).max
+
+
+def largest_remainder(pool_units: int, weights: Sequence[int]) -> list[int]:
+    # Splits pool_units across weights in integer base units. Everyone gets the floor of their
+    # exact share, and the leftover units (fewer than len(weights)) go one each to the largest
+    # remainders, ties to the earlier entry, so the shares always sum to the pool exactly.
+    if pool_units <= 0 or not len(weights):
+        return [0] * len(weights)
+    weight_array = np.asarray(weights, dtype=np.int64)
+    if (weight_array < 0).any():
+        raise ValueError("Allocation weights must be non-negative.")
+    total = int(weight_array.sum(dtype=np.int64))
+    if total <= 0:
+        return [0] * len(weights)
+
+    # pool * w / total = whole * w + rest * w / total with rest < total, which keeps the
+    # products inside int64 for any realistic pool; beyond that fall back to Python ints.
+    whole, rest = divmod(pool_units, total)
+    max_weight = int(weight_array.max())
+    if whole * max_weight > _INT64_MAX or rest * max_weight > _INT64_MAX:
+        return _largest_remainder_exact(pool_units, [int(weight) for weight in weights], total)
+
+    scaled_rest = weight_array * rest
+    shares = weight_array * whole + scaled_rest // total
+    remainders = scaled_rest % total
+    leftover = pool_units - int(shares.sum(dtype=np.int64))
+    if leftover:
+        shares[np.argsort(-remainders, kind="stable")[:leftover]] += 1
+    return shares.tolist()
+
+
+def _largest_remainder_exact(pool_units: int, weights: list[int], total: int) -> list[int]:
+    shares = [pool_units * weight // total for weight in weights]
+    leftover = pool_units - sum(shares)
+    if leftover:
+        ranked = sorted(range(len(weights)), key=lambda index: -(pool_units * weights[index] % total))
+        for index in ranked[:leftover]:
+            shares[index] += 1
+    return shares
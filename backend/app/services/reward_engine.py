@@ -1,20 +1,36 @@
 from __future__ import annotations
 
 from datetime import datetime, timezone
-from decimal import Decimal, ROUND_DOWN
+from typing import Any
 
 from apscheduler.schedulers.background import BackgroundScheduler
 
 from ..config import settings
 from ..database import get_db
-from . import algorand_service, banner_engine
+from ..repository import fetch_by_ids
+from ..utils.units import row_units
+from . import algorand_service, banner_engine, reconciliation_service, solvency
 
 
 _scheduler: BackgroundScheduler | None = None
 
 
-def _to_decimal(value: object) -> Decimal:
-    return Decimal(str(value or 0))
+def _creator_wallets(db: Any, video_ids: list[str]) -> dict[str, str]:
+    # video_id -> creator wallet for every campaign video, resolved up front so receivers can be
+    # checked for the asset opt-in in one bulk pass.
+    video_creators = {
+        video_id: row["creator_id"] for video_id, row in fetch_by_ids(db, "videos", "id", video_ids, "id, creator_id").items()
+    }
+    creator_wallets = {
+        user_id: row["wallet_address"]
+        for user_id, row in fetch_by_ids(db, "users", "id", list(video_creators.values()), "id, wallet_address").items()
+    }
+
+    return {
+        video_id: creator_wallets[creator_id]
+        for video_id, creator_id in video_creators.items()
+        if creator_id in creator_wallets
+    }
 
 
 def calculate_and_settle() -> dict[str, int]:
@@ -23,7 +39,7 @@ def calculate_and_settle() -> dict[str, int]:
         db.table("ad_campaigns")
         .select("*")
         .eq("active", True)
-        .gt("remaining_budget", 0)
+        .gt("remaining_budget_units", 0)
         .execute()
         .data
         or []
@@ -34,19 +50,42 @@ def calculate_and_settle() -> dict[str, int]:
         "campaigns_settled": 0,
         "views_settled": 0,
         "settlements_created": 0,
+        "campaigns_deferred": 0,
+        "campaigns_trimmed": 0,
     }
 
+    wallets_by_video = _creator_wallets(db, list(dict.fromkeys(campaign["video_id"] for campaign in campaigns)))
+    # Creators who have not opted in to the asset keep their views unsettled until they do.
+    _, not_opted_in = algorand_service.split_opted_in(list(wallets_by_video.values()))
+
+    # Priced up front against the payer's balance; raises under SOLVENCY_POLICY=refuse. Only
+    # campaigns that can be paid this run are priced, so deferred ones take no budget.
+    payable_campaigns = [
+        campaign
+        for campaign in campaigns
+        if wallets_by_video.get(campaign["video_id"]) and wallets_by_video[campaign["video_id"]] not in not_opted_in
+    ]
+    allowed_views, forecast = solvency.plan_video_ad_run(db, payable_campaigns)
+    report["campaigns_trimmed"] = forecast["campaigns_trimmed"]
+
     for campaign in campaigns:
         try:
             campaign_id = campaign["id"]
             video_id = campaign["video_id"]
-            reward_per_view = _to_decimal(campaign.get("reward_per_view"))
-            remaining_budget = _to_decimal(campaign.get("remaining_budget"))
+            reward_per_view = row_units(campaign, "reward_per_view")
+            remaining_budget = row_units(campaign, "remaining_budget")
 
             if reward_per_view <= 0 or remaining_budget <= 0:
                 db.table("ad_campaigns").update({"active": False}).eq("id", campaign_id).execute()
                 continue
 
+            creator_wallet = wallets_by_video.get(video_id)
+            if not creator_wallet:
+                continue
+            if creator_wallet in not_opted_in:
+                report["campaigns_deferred"] += 1
+                continue
+
             views = (
                 db.table("views")
                 .select("id")
@@ -61,30 +100,18 @@ def calculate_and_settle() -> dict[str, int]:
             if not views:
                 continue
 
-            max_affordable_views = int((remaining_budget / reward_per_view).to_integral_value(rounding=ROUND_DOWN))
+            max_affordable_views = remaining_budget // reward_per_view
             if max_affordable_views <= 0:
-                db.table("ad_campaigns").update({"active": False, "remaining_budget": 0}).eq("id", campaign_id).execute()
+                db.table("ad_campaigns").update({"active": False, "remaining_budget_units": 0}).eq("id", campaign_id).execute()
                 continue
 
-            payable_views = views[:max_affordable_views]
+            payable_views = views[: min(max_affordable_views, allowed_views.get(campaign_id, 0))]
             payable_view_count = len(payable_views)
             if payable_view_count <= 0:
                 continue
 
-            creator_earnings = reward_per_view * Decimal(payable_view_count)
-            new_remaining_budget = remaining_budget - creator_earnings
-            if new_remaining_budget < 0:
-                new_remaining_budget = Decimal("0")
-
-            video_res = db.table("videos").select("creator_id").eq("id", video_id).limit(1).execute()
-            if not video_res.data:
-                continue
-            creator_id = video_res.data[0]["creator_id"]
-
-            creator_res = db.table("users").select("wallet_address").eq("id", creator_id).limit(1).execute()
-            if not creator_res.data:
-                continue
-            creator_wallet = creator_res.data[0]["wallet_address"]
+            creator_earnings = reward_per_view * payable_view_count
+            new_remaining_budget = max(remaining_budget - creator_earnings, 0)
 
             settlement = algorand_service.settle_reward(creator_wallet, creator_earnings)
             tx_hash = settlement["tx_hash"]
@@ -95,9 +122,10 @@ def calculate_and_settle() -> dict[str, int]:
             db.table("settlements").insert(
                 {
                     "creator_wallet": creator_wallet,
-                    "amount": float(settlement["creator_amount"]),
-                    "platform_fee": float(settlement["platform_fee"]),
+                    "amount_units": settlement["creator_amount_units"],
+                    "platform_fee_units": settlement["platform_fee_units"],
                     "tx_hash": tx_hash,
+                    "confirmed_round": settlement.get("confirmed_round"),
                     "timestamp": datetime.now(timezone.utc).isoformat(),
                     "settlement_type": "video_ad",
                     "campaign_id": campaign_id,
@@ -106,8 +134,8 @@ def calculate_and_settle() -> dict[str, int]:
 
             db.table("ad_campaigns").update(
                 {
-                    "remaining_budget": float(new_remaining_budget),
-                    "active": bool(new_remaining_budget > 0),
+                    "remaining_budget_units": new_remaining_budget,
+                    "active": new_remaining_budget > 0,
                 }
             ).eq("id", campaign_id).execute()
 
@@ -130,4 +158,7 @@ def start() -> None:
     _scheduler = BackgroundScheduler()
     _scheduler.add_job(calculate_and_settle, "interval", minutes=max(1, settings.reward_interval_minutes))
     _scheduler.add_job(banner_engine.distribute_banner_rewards, "cron", day=1, hour=0, minute=5)
+    _scheduler.add_job(
+        reconciliation_service.reconcile_settlements, "interval", minutes=max(1, settings.reconcile_interval_minutes)
+    )
     _scheduler.start()
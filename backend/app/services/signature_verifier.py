@@ -0,0 +1,216 @@
+from __future__ import annotations
+
+import asyncio
+import base64
+import binascii
+import logging
+import math
+import multiprocessing
+import threading
+from collections import OrderedDict
+from collections.abc import Callable
+from concurrent.futures import Executor, Future, ProcessPoolExecutor
+from functools import lru_cache
+
+from algosdk import constants, encoding
+from nacl.exceptions import BadSignatureError
+from nacl.signing import VerifyKey
+
+
+logger = logging.getLogger(__name__)
+
+SIGNATURE_BYTES = 64
+ADDRESS_LENGTH = 58
+_BASE64_LENGTH = 88
+_HEX_LENGTH = 128
+_HEX_DIGITS = frozenset("0123456789abcdefABCDEF")
+_URLSAFE_TO_STANDARD = str.maketrans("-_", "+/")
+
+VerifyItem = tuple[str, bytes, bytes]
+
+
+def decode_signature(signature: str) -> bytes:
+    # Wallets send 64-byte signatures as base64 (88 chars) or hex (128 chars); recognise those
+    # by shape so the common case never raises.
+    length = len(signature)
+    if length == _BASE64_LENGTH and signature.endswith("==") and signature.isascii():
+        try:
+            return binascii.a2b_base64(signature.translate(_URLSAFE_TO_STANDARD))
+        except binascii.Error:
+            pass
+    elif length == _HEX_LENGTH and _HEX_DIGITS.issuperset(signature):
+        return bytes.fromhex(signature)
+    try:
+        return base64.b64decode(signature)
+    except Exception:
+        try:
+            return bytes.fromhex(signature)
+        except Exception:
+            return signature.encode("utf-8")
+
+
+@lru_cache(maxsize=4096)
+def _verify_key(wallet_address: str) -> VerifyKey | None:
+    if len(wallet_address) != ADDRESS_LENGTH:
+        return None
+    try:
+        return VerifyKey(encoding.decode_address(wallet_address))
+    except Exception:
+        return None
+
+
+def verify_one(wallet_address: str, message: bytes, signature: bytes) -> bool:
+    # Same check as algosdk.util.verify_bytes ("MX"-prefixed message), on already decoded bytes.
+    if len(signature) != SIGNATURE_BYTES:
+        return False
+    verify_key = _verify_key(wallet_address)
+    if verify_key is None:
+        return False
+    try:
+        verify_key.verify(constants.bytes_prefix + message, signature)
+    except BadSignatureError:
+        return False
+    return True
+
+
+def verify_batch(items: list[VerifyItem]) -> list[bool]:
+    # Process-pool entry point: one round trip per batch instead of per signature.
+    return [verify_one(*item) for item in items]
+
+
+class SignatureVerifier:
+    # Login/signup signature checks. Recent (wallet, message, signature) results are kept in an
+    # LRU so retries are free; misses from async callers are coalesced per event-loop tick and
+    # verified in batches on a process pool so ed25519 work never runs on the loop.
+
+    def __init__(
+        self,
+        workers: Callable[[], int],
+        cache_size: Callable[[], int],
+        batch_size: Callable[[], int],
+    ) -> None:
+        self._workers = workers
+        self._cache_size = cache_size
+        self._batch_size = batch_size
+        self._lock = threading.Lock()
+        self._cache: OrderedDict[tuple[str, str, str], bool] = OrderedDict()
+        self._executor: Executor | None = None
+        self._queue: list[tuple[VerifyItem, asyncio.Future[bool]]] = []
+        self._flush_scheduled = False
+        self.hits = 0
+        self.misses = 0
+        self.batches = 0
+
+    def _cached(self, key: tuple[str, str, str]) -> bool | None:
+        with self._lock:
+            result = self._cache.get(key)
+            if result is None:
+                self.misses += 1
+                return None
+            self._cache.move_to_end(key)
+            self.hits += 1
+            return result
+
+    def _remember(self, key: tuple[str, str, str], result: bool) -> None:
+        max_entries = self._cache_size()
+        if max_entries <= 0:
+            return
+        with self._lock:
+            self._cache[key] = result
+            self._cache.move_to_end(key)
+            while len(self._cache) > max_entries:
+                self._cache.popitem(last=False)
+
+    @staticmethod
+    def _item(wallet_address: str, message: str, signature: str) -> VerifyItem:
+        return wallet_address, message.encode("utf-8"), decode_signature(signature)
+
+    def verify(self, wallet_address: str, message: str, signature: str) -> bool:
+        if not wallet_address or not message or not signature:
+            return False
+        key = (wallet_address, message, signature)
+        cached = self._cached(key)
+        if cached is not None:
+            return cached
+        result = verify_one(*self._item(wallet_address, message, signature))
+        self._remember(key, result)
+        return result
+
+    async def verify_async(self, wallet_address: str, message: str, signature: str) -> bool:
+        if not wallet_address or not message or not signature:
+            return False
+        key = (wallet_address, message, signature)
+        cached = self._cached(key)
+        if cached is not None:
+            return cached
+
+        item = self._item(wallet_address, message, signature)
+        if self._workers() <= 0:
+            result = verify_one(*item)
+        else:
+            loop = asyncio.get_running_loop()
+            future: asyncio.Future[bool] = loop.create_future()
+            self._queue.append((item, future))
+            if not self._flush_scheduled:
+                self._flush_scheduled = True
+                loop.call_soon(self._flush)
+            result = await future
+        self._remember(key, result)
+        return result
+
+    def _executor_for(self) -> Executor:
+        if self._executor is None:
+            # spawn, not fork: the API process runs background threads (block follower, scheduler).
+            self._executor = ProcessPoolExecutor(
+                max_workers=self._workers(),
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+        return self._executor
+
+    def _flush(self) -> None:
+        self._flush_scheduled = False
+        queue, self._queue = self._queue, []
+        if not queue:
+            return
+        # Spread the tick's work over every worker, but keep each IPC round trip bounded.
+        chunk_size = max(1, min(self._batch_size(), math.ceil(len(queue) / self._workers())))
+        executor = self._executor_for()
+        loop = asyncio.get_running_loop()
+        for start in range(0, len(queue), chunk_size):
+            chunk = queue[start : start + chunk_size]
+            self.batches += 1
+            try:
+                submitted = executor.submit(verify_batch, [item for item, _ in chunk])
+            except Exception as exc:
+                self._deliver_inline(chunk, exc)
+                continue
+            submitted.add_done_callback(
+                lambda done, chunk=chunk: loop.call_soon_threadsafe(self._deliver, chunk, done)
+            )
+
+    def _deliver(self, chunk: list[tuple[VerifyItem, asyncio.Future[bool]]], done: Future) -> None:
+        try:
+            results = done.result()
+        except BaseException as exc:
+            self._deliver_inline(chunk, exc)
+            return
+        for (_, future), result in zip(chunk, results):
+            if not future.done():
+                future.set_result(result)
+
+    def _deliver_inline(self, chunk: list[tuple[VerifyItem, asyncio.Future[bool]]], exc: BaseException) -> None:
+        logger.warning("Signature verification pool failed (%s); verifying inline", exc)
+        executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+        for item, future in chunk:
+            if not future.done():
+                future.set_result(verify_one(*item))
+
+    def shutdown(self) -> None:
+        executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True, cancel_futures=True)
+
+    def stats(self) -> dict[str, int]:
+        return {"entries": len(self._cache), "hits": self.hits, "misses": self.misses, "batches": self.batches}
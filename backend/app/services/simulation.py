@@ -0,0 +1,526 @@
+from __future__ import annotations
+
+import base64
+import random
+import threading
+import time
+import tracemalloc
+import uuid
+from collections import Counter
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from datetime import date, datetime, timedelta, timezone
+from typing import Any
+
+from algosdk import account, encoding, error, transaction
+
+from ..config import settings
+from ..database import use_db
+from ..utils.units import scale
+from . import algorand_service, banner_engine, reward_engine
+
+
+# Dry-run settlement: the engines run unchanged against an in-memory copy of the
+# Supabase tables and a fake algod node, so nothing touches the network or chain.
+
+SIMULATED_ASSET_ID = 1_000_001
+_TABLE_DEFAULTS: dict[str, dict[str, Any]] = {
+    "views": {"settled": False},
+    "settlements": {"platform_fee_units": 0, "tx_hash": None, "settlement_type": "video_ad"},
+    "banner_distribution_runs": {"creators_planned": 0, "last_error": None, "completed_at": None},
+    "banner_allocations": {"status": "pending", "tx_hash": None, "confirmed_round": None, "error": None},
+}
+_SERIAL_COLUMNS = {"settlements": "seq"}
+
+
+class SimulatedResponse:
+    def __init__(self, data: list[dict[str, Any]], count: int | None = None) -> None:
+        self.data = data
+        self.count = count
+
+
+class _SimulatedQuery:
+    def __init__(self, db: InMemoryDB, table: str) -> None:
+        self._db = db
+        self._table = table
+        self._op = "select"
+        self._columns: list[str] | None = None
+        self._count: str | None = None
+        self._payload: Any = None
+        self._filters: list[Callable[[dict[str, Any]], bool]] = []
+        self._order: list[tuple[str, bool]] = []
+        self._limit: int | None = None
+        self._offset = 0
+
+    def select(self, columns: str = "*", count: str | None = None) -> _SimulatedQuery:
+        self._op = "select"
+        self._count = count
+        names = [name.strip() for name in columns.split(",") if name.strip()]
+        # Embedded resources such as "users(username)" are not modelled.
+        names = [name for name in names if "(" not in name]
+        self._columns = None if "*" in names else names
+        return self
+
+    def insert(self, payload: dict[str, Any] | list[dict[str, Any]]) -> _SimulatedQuery:
+        self._op = "insert"
+        self._payload = payload
+        return self
+
+    def upsert(self, payload: dict[str, Any] | list[dict[str, Any]], on_conflict: str = "id") -> _SimulatedQuery:
+        self._op = "upsert"
+        self._payload = (payload, [key.strip() for key in on_conflict.split(",") if key.strip()])
+        return self
+
+    def update(self, payload: dict[str, Any]) -> _SimulatedQuery:
+        self._op = "update"
+        self._payload = payload
+        return self
+
+    def delete(self) -> _SimulatedQuery:
+        self._op = "delete"
+        return self
+
+    def _where(self, predicate: Callable[[dict[str, Any]], bool]) -> _SimulatedQuery:
+        self._filters.append(predicate)
+        return self
+
+    def eq(self, column: str, value: Any) -> _SimulatedQuery:
+        return self._where(lambda row: row.get(column) == value)
+
+    def neq(self, column: str, value: Any) -> _SimulatedQuery:
+        return self._where(lambda row: row.get(column) != value)
+
+    def gt(self, column: str, value: Any) -> _SimulatedQuery:
+        return self._where(lambda row: row.get(column) is not None and row[column] > value)
+
+    def gte(self, column: str, value: Any) -> _SimulatedQuery:
+        return self._where(lambda row: row.get(column) is not None and row[column] >= value)
+
+    def lt(self, column: str, value: Any) -> _SimulatedQuery:
+        return self._where(lambda row: row.get(column) is not None and row[column] < value)
+
+    def lte(self, column: str, value: Any) -> _SimulatedQuery:
+        return self._where(lambda row: row.get(column) is not None and row[column] <= value)
+
+    def in_(self, column: str, values: list[Any]) -> _SimulatedQuery:
+        allowed = set(values)
+        return self._where(lambda row: row.get(column) in allowed)
+
+    def is_(self, column: str, value: Any) -> _SimulatedQuery:
+        expected = None if value in (None, "null") else value
+        return self._where(lambda row: row.get(column) is expected)
+
+    def order(self, column: str, desc: bool = False) -> _SimulatedQuery:
+        self._order.append((column, desc))
+        return self
+
+    def limit(self, size: int) -> _SimulatedQuery:
+        self._limit = size
+        return self
+
+    def range(self, start: int, end: int) -> _SimulatedQuery:
+        self._offset = start
+        self._limit = end - start + 1
+        return self
+
+    def _matching(self) -> list[dict[str, Any]]:
+        rows = [row for row in self._db.tables.setdefault(self._table, []) if all(f(row) for f in self._filters)]
+        for column, desc in reversed(self._order):
+            rows.sort(key=lambda row: (row.get(column) is None, row.get(column)), reverse=desc)
+        return rows
+
+    def _project(self, row: dict[str, Any]) -> dict[str, Any]:
+        if self._columns is None:
+            return dict(row)
+        return {name: row.get(name) for name in self._columns}
+
+    def _new_row(self, values: dict[str, Any]) -> dict[str, Any]:
+        row = {"id": str(uuid.uuid4()), "created_at": datetime.now(timezone.utc).isoformat()}
+        row.update(_TABLE_DEFAULTS.get(self._table, {}))
+        serial = _SERIAL_COLUMNS.get(self._table)
+        if serial:
+            self._db.sequences[self._table] += 1
+            row[serial] = self._db.sequences[self._table]
+        row.update(values)
+        self._db.tables.setdefault(self._table, []).append(row)
+        return row
+
+    def execute(self) -> SimulatedResponse:
+        self._db.calls[f"{self._table}.{self._op}"] += 1
+        started = time.perf_counter()
+        try:
+            return self._execute()
+        finally:
+            self._db.seconds += time.perf_counter() - started
+
+    def _execute(self) -> SimulatedResponse:
+        if self._op == "select":
+            rows = self._matching()
+            total = len(rows)
+            end = None if self._limit is None else self._offset + self._limit
+            rows = rows[self._offset:end]
+            return SimulatedResponse([self._project(row) for row in rows], total if self._count else None)
+
+        if self._op == "insert":
+            payload = self._payload if isinstance(self._payload, list) else [self._payload]
+            return SimulatedResponse([dict(self._new_row(values)) for values in payload])
+
+        if self._op == "upsert":
+            payload, keys = self._payload
+            payload = payload if isinstance(payload, list) else [payload]
+            table = self._db.tables.setdefault(self._table, [])
+            # Index the conflict keys once per call instead of scanning the table for every row.
+            index = {tuple(row.get(key) for key in keys): row for row in table} if keys else {}
+            written = []
+            for values in payload:
+                existing = index.get(tuple(values.get(key) for key in keys)) if keys else None
+                if existing is None:
+                    existing = self._new_row(values)
+                    if keys:
+                        index[tuple(values.get(key) for key in keys)] = existing
+                    written.append(dict(existing))
+                else:
+                    existing.update(values)
+                    written.append(dict(existing))
+            return SimulatedResponse(written)
+
+        rows = self._matching()
+        if self._op == "update":
+            for row in rows:
+                row.update(self._payload)
+            return SimulatedResponse([dict(row) for row in rows])
+
+        doomed = {id(row) for row in rows}
+        self._db.tables[self._table] = [row for row in self._db.tables[self._table] if id(row) not in doomed]
+        return SimulatedResponse([dict(row) for row in rows])
+
+
+class InMemoryDB:
+    # Implements the subset of the supabase-py query builder used by the services.
+
+    def __init__(self, tables: dict[str, list[dict[str, Any]]] | None = None) -> None:
+        self.tables: dict[str, list[dict[str, Any]]] = {name: [dict(row) for row in rows] for name, rows in (tables or {}).items()}
+        self.calls: Counter[str] = Counter()
+        self.sequences: Counter[str] = Counter()
+        # Time spent inside the store itself, reported separately from engine time.
+        self.seconds = 0.0
+
+    def table(self, name: str) -> _SimulatedQuery:
+        return _SimulatedQuery(self, name)
+
+    @property
+    def total_calls(self) -> int:
+        return sum(self.calls.values())
+
+
+class SimulatedAlgodClient:
+    # Accepts signed transactions and confirms them on the next round.
+
+    def __init__(
+        self,
+        asset_id: int = SIMULATED_ASSET_ID,
+        starting_round: int = 1_000,
+        not_opted_in: set[str] | None = None,
+        block_seconds: float = 0.0,
+    ) -> None:
+        self.asset_id = asset_id
+        # Minimum time between blocks; 0 produces blocks as fast as transactions arrive.
+        self.block_seconds = block_seconds
+        self._last_block_at = 0.0
+        # Wallets that do not hold the asset; transfers to them are rejected like on chain.
+        self.not_opted_in = set(not_opted_in or ())
+        self.round = starting_round
+        self.calls: Counter[str] = Counter()
+        self.transactions: list[dict[str, Any]] = []
+        self.balances: Counter[str] = Counter()
+        self._confirmed_round: dict[str, int] = {}
+        self._txn_bodies: dict[str, dict[str, Any]] = {}
+        self._block_txids: dict[int, list[str]] = {}
+        self._block_ready = threading.Condition(threading.RLock())
+        self._genesis_hash = base64.b64encode(bytes(32)).decode()
+
+    def status(self) -> dict[str, Any]:
+        self.calls["status"] += 1
+        return {"last-round": self.round}
+
+    def status_after_block(self, round_num: int) -> dict[str, Any]:
+        # Blocks are produced on demand, as soon as a submitted transaction is waiting for
+        # one, so the dry run measures compute rather than ~3s block times (unless
+        # block_seconds asks for a block interval).
+        self.calls["status_after_block"] += 1
+        delay = self._last_block_at + self.block_seconds - time.monotonic()
+        if delay > 0:
+            time.sleep(delay)
+        with self._block_ready:
+            if round_num >= self.round and not self._block_txids.get(self.round + 1):
+                self._block_ready.wait(timeout=0.05)
+            if round_num >= self.round and self._block_txids.get(self.round + 1):
+                self.round += 1
+                self._last_block_at = time.monotonic()
+            return {"last-round": self.round}
+
+    def suggested_params(self) -> transaction.SuggestedParams:
+        self.calls["suggested_params"] += 1
+        return transaction.SuggestedParams(
+            fee=1_000,
+            first=self.round,
+            last=self.round + 1_000,
+            gh=self._genesis_hash,
+            gen="rift-simulation-v1",
+            flat_fee=True,
+            min_fee=1_000,
+        )
+
+    def send_transaction(self, signed_txn: Any) -> str:
+        self.calls["send_transaction"] += 1
+        self._check(signed_txn)
+        return self._submit(signed_txn)
+
+    def send_transactions(self, signed_txns: list[Any]) -> str:
+        self.calls["send_transactions"] += 1
+        # The whole group is rejected if any member is invalid.
+        for signed_txn in signed_txns:
+            self._check(signed_txn)
+        # An atomic group lands in a single block, so hold the block open while it is applied.
+        with self._block_ready:
+            txids = [self._submit(signed_txn) for signed_txn in signed_txns]
+        return txids[0]
+
+    def _check(self, signed_txn: Any) -> None:
+        txn = signed_txn.transaction
+        receiver = getattr(txn, "receiver", None)
+        if txn.type == "axfer" and getattr(txn, "amount", 0) and receiver in self.not_opted_in:
+            raise error.AlgodHTTPError(
+                f"TransactionPool.Remember: transaction {signed_txn.get_txid()}: receiver error: "
+                f"must optin, asset {txn.index} missing from {receiver}",
+                400,
+            )
+
+    def _submit(self, signed_txn: Any) -> str:
+        txn = signed_txn.transaction
+        txid = signed_txn.get_txid()
+        receiver = getattr(txn, "receiver", None)
+        amount = int(getattr(txn, "amount", 0) or 0)
+        if txn.type == "axfer" and receiver and amount:
+            self.balances[txn.sender] -= amount
+            self.balances[receiver] += amount
+        self.transactions.append({"txid": txid, "type": txn.type, "receiver": receiver, "amount": amount})
+        body: dict[str, Any] = {"type": txn.type, "snd": txn.sender}
+        if txn.type == "axfer":
+            body.update({"arcv": receiver, "aamt": amount, "xaid": txn.index})
+        with self._block_ready:
+            self._txn_bodies[txid] = body
+            self._confirmed_round[txid] = self.round + 1
+            self._block_txids.setdefault(self.round + 1, []).append(txid)
+            self._block_ready.notify_all()
+        return txid
+
+    def get_block_txids(self, round_num: int) -> dict[str, Any]:
+        self.calls["get_block_txids"] += 1
+        return {"blockTxids": list(self._block_txids.get(round_num, [])) if round_num <= self.round else []}
+
+    def pending_transaction_info(self, txid: str) -> dict[str, Any]:
+        self.calls["pending_transaction_info"] += 1
+        if txid not in self._confirmed_round:
+            raise error.AlgodHTTPError("txn does not exist", 404)
+        confirmed_round = self._confirmed_round[txid]
+        return {
+            "confirmed-round": confirmed_round if confirmed_round <= self.round else 0,
+            "pool-error": "",
+            "txn": {"txn": dict(self._txn_bodies[txid])},
+        }
+
+    def account_asset_info(self, address: str, asset_id: int) -> dict[str, Any]:
+        self.calls["account_asset_info"] += 1
+        if address in self.not_opted_in or asset_id != self.asset_id:
+            raise error.AlgodHTTPError("account asset info not found", 404)
+        return {"asset-holding": {"asset-id": asset_id, "amount": max(self.balances[address], 0), "is-frozen": False}}
+
+    def account_info(self, address: str) -> dict[str, Any]:
+        self.calls["account_info"] += 1
+        return {
+            "address": address,
+            "amount": 10_000_000_000,
+            "assets": [{"asset-id": self.asset_id, "amount": max(self.balances[address], 0)}],
+        }
+
+
+def _pareto_weights(rng: random.Random, count: int, alpha: float) -> list[float]:
+    return [rng.paretovariate(alpha) for _ in range(count)]
+
+
+def _random_wallet(rng: random.Random) -> str:
+    return encoding.encode_address(rng.randbytes(32))
+
+
+def generate_dataset(
+    creators: int,
+    campaigns: int,
+    views: int,
+    banner_campaigns: int = 0,
+    seed: int = 7,
+) -> dict[str, list[dict[str, Any]]]:
+    # Subscribers, uploads and views follow heavy-tailed (Pareto) distributions so a
+    # small share of creators and videos dominate, as on real video platforms.
+    rng = random.Random(seed)
+    now = datetime.now(timezone.utc)
+    today = date.today()
+
+    users: list[dict[str, Any]] = []
+    for index in range(creators):
+        users.append(
+            {
+                "id": str(uuid.UUID(int=rng.getrandbits(128))),
+                "wallet_address": _random_wallet(rng),
+                "username": f"creator_{index}",
+                "role": "creator",
+                "subscribers_count": int((rng.paretovariate(1.2) - 1) * 50) if rng.random() < 0.9 else 0,
+            }
+        )
+
+    videos: list[dict[str, Any]] = []
+    for creator in users:
+        for _ in range(min(1 + int(rng.paretovariate(1.5)), 50)):
+            videos.append(
+                {
+                    "id": str(uuid.UUID(int=rng.getrandbits(128))),
+                    "creator_id": creator["id"],
+                    "cid": f"bafy{rng.getrandbits(160):040x}",
+                    "title": f"video_{len(videos)}",
+                    "ads_enabled": True,
+                    "total_views": 0,
+                    "total_watch_time": 0,
+                }
+            )
+
+    popularity = _pareto_weights(rng, len(videos), 1.1) if videos else []
+    ad_campaigns: list[dict[str, Any]] = []
+    campaign_videos = rng.choices(videos, weights=popularity, k=campaigns) if videos else []
+    for video in campaign_videos:
+        reward_per_view = rng.choice([1, 5, 10, 50]) * scale() // 1000
+        budget = reward_per_view * rng.randint(10, 5_000)
+        ad_campaigns.append(
+            {
+                "id": str(uuid.UUID(int=rng.getrandbits(128))),
+                "advertiser_wallet": _random_wallet(rng),
+                "video_id": video["id"],
+                "budget_units": budget,
+                "remaining_budget_units": budget,
+                "reward_per_view_units": reward_per_view,
+                "active": True,
+            }
+        )
+
+    # Views land on advertised videos most of the time so the settlement loop has work.
+    advertised = [video for video in videos if video["id"] in {c["video_id"] for c in ad_campaigns}] or videos
+    advertised_weights = _pareto_weights(rng, len(advertised), 1.1)
+    view_rows: list[dict[str, Any]] = []
+    viewer_pool = [_random_wallet(rng) for _ in range(max(1, min(views // 5, 50_000)))]
+    for video in rng.choices(advertised, weights=advertised_weights, k=views) if advertised else []:
+        view_rows.append(
+            {
+                "id": str(uuid.UUID(int=rng.getrandbits(128))),
+                "video_id": video["id"],
+                "viewer_wallet": rng.choice(viewer_pool),
+                "watch_seconds": int(rng.lognormvariate(3.8, 0.9)),
+                "settled": False,
+                "timestamp": (now - timedelta(seconds=rng.randint(0, 86_400))).isoformat(),
+            }
+        )
+
+    banner_rows: list[dict[str, Any]] = []
+    for _ in range(banner_campaigns):
+        tier = rng.choice(["1m", "3m", "6m"])
+        months = int(tier[0])
+        end = today - timedelta(days=rng.randint(0, 10))
+        banner_rows.append(
+            {
+                "id": str(uuid.UUID(int=rng.getrandbits(128))),
+                "advertiser_wallet": _random_wallet(rng),
+                "tier": tier,
+                "fixed_price_units": 100 * months * scale(),
+                "start_date": (end - timedelta(days=30 * months)).isoformat(),
+                "end_date": end.isoformat(),
+                "active": True,
+                "distributed": False,
+            }
+        )
+
+    return {
+        "users": users,
+        "videos": videos,
+        "views": view_rows,
+        "ad_campaigns": ad_campaigns,
+        "banner_campaigns": banner_rows,
+        "settlements": [],
+    }
+
+
+SIMULATED_PLATFORM_UNITS = 10**15
+
+
+@contextmanager
+def simulation_mode(
+    db: InMemoryDB, client: SimulatedAlgodClient, platform_units: int = SIMULATED_PLATFORM_UNITS
+) -> Iterator[None]:
+    private_key, address = account.generate_account()
+    client.balances[address] += platform_units
+    previous = (settings.asset_id, settings.use_contract_settlement)
+    settings.asset_id = client.asset_id
+    settings.use_contract_settlement = False
+    algorand_service.optin_index.clear()
+    try:
+        with use_db(db), algorand_service.use_algod(client, private_key):
+            yield
+    finally:
+        settings.asset_id, settings.use_contract_settlement = previous
+        algorand_service.optin_index.clear()
+
+
+def _measure(run: Callable[[], dict[str, Any]], db: InMemoryDB, client: SimulatedAlgodClient, trace_memory: bool) -> dict[str, Any]:
+    db_calls_before = Counter(db.calls)
+    db_seconds_before = db.seconds
+    algod_calls_before = Counter(client.calls)
+    transactions_before = len(client.transactions)
+
+    if trace_memory:
+        tracemalloc.start()
+    started = time.perf_counter()
+    try:
+        report = run()
+    finally:
+        elapsed = time.perf_counter() - started
+        peak = tracemalloc.get_traced_memory()[1] if trace_memory else None
+        if trace_memory:
+            tracemalloc.stop()
+
+    db_calls = db.calls - db_calls_before
+    return {
+        "report": report,
+        "seconds": round(elapsed, 4),
+        "db_seconds": round(db.seconds - db_seconds_before, 4),
+        "peak_memory_bytes": peak,
+        "db_calls": sum(db_calls.values()),
+        "db_calls_by_query": dict(sorted(db_calls.items())),
+        "algod_calls": dict(sorted((client.calls - algod_calls_before).items())),
+        "transactions": len(client.transactions) - transactions_before,
+    }
+
+
+def run_simulation(
+    dataset: dict[str, list[dict[str, Any]]],
+    trace_memory: bool = True,
+    not_opted_in: set[str] | None = None,
+    platform_units: int = SIMULATED_PLATFORM_UNITS,
+) -> dict[str, Any]:
+    db = InMemoryDB(dataset)
+    client = SimulatedAlgodClient(not_opted_in=not_opted_in)
+    with simulation_mode(db, client, platform_units):
+        rewards = _measure(reward_engine.calculate_and_settle, db, client, trace_memory)
+        banners = _measure(banner_engine.distribute_banner_rewards, db, client, trace_memory)
+
+    return {
+        "dataset": {name: len(rows) for name, rows in dataset.items()},
+        "reward_engine": rewards,
+        "banner_engine": banners,
+    }
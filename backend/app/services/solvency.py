@@ -0,0 +1,194 @@
+from __future__ import annotations
+
+from collections import Counter
+from typing import Any, NamedTuple
+
+from algosdk import logic
+
+from ..config import settings
+from ..database import get_db
+from ..utils.units import row_units, to_tokens
+from . import algorand_service, banner_engine
+
+SOLVENCY_TRIM = "trim"
+SOLVENCY_REFUSE = "refuse"
+OUTSTANDING_ALLOCATION_STATUSES = ("pending", "failed", "deferred")
+
+# Before a settlement run the platform's pending liabilities are priced from the database and
+# compared with the cached on-chain balance of the account that pays them, so a run that cannot
+# be covered is trimmed or refused before its first transfer instead of failing half way.
+
+
+class CampaignLiability(NamedTuple):
+    campaign_id: str
+    views: int
+    gross_units: int
+    creator_units: int
+
+
+def creator_share(gross_units: int) -> int:
+    # What settle_reward sends the creator for gross_units of earnings.
+    return gross_units - (gross_units * settings.settlement_fee_bps) // 10000
+
+
+def video_ad_payer() -> str:
+    if settings.use_contract_settlement and settings.app_id > 0:
+        return logic.get_application_address(settings.app_id)
+    return algorand_service.payout_account()
+
+
+def available_units(payer: str) -> int:
+    if payer == algorand_service.payout_account():
+        return algorand_service.payout_funds_units()
+    return algorand_service.get_asset_balance(payer)
+
+
+def _unsettled_views(db: Any, video_id: str) -> int:
+    res = (
+        db.table("views")
+        .select("id", count="exact")
+        .eq("video_id", video_id)
+        .eq("settled", False)
+        .gte("watch_seconds", settings.view_min_watch_seconds)
+        .limit(1)
+        .execute()
+    )
+    return int(res.count or 0)
+
+
+def video_ad_liabilities(db: Any, campaigns: list[dict]) -> list[CampaignLiability]:
+    # Mirrors calculate_and_settle: campaigns in the same order, each paying for the unsettled
+    # views its remaining budget affords, and campaigns on one video sharing its views.
+    views_left: dict[str, int] = {}
+    liabilities = []
+    for campaign in campaigns:
+        reward_per_view = row_units(campaign, "reward_per_view")
+        remaining_budget = row_units(campaign, "remaining_budget")
+        if reward_per_view <= 0 or remaining_budget <= 0:
+            continue
+        video_id = campaign["video_id"]
+        if video_id not in views_left:
+            views_left[video_id] = _unsettled_views(db, video_id)
+        views = min(views_left[video_id], remaining_budget // reward_per_view)
+        if views <= 0:
+            continue
+        views_left[video_id] -= views
+        gross = reward_per_view * views
+        liabilities.append(CampaignLiability(campaign["id"], views, gross, creator_share(gross)))
+    return liabilities
+
+
+def banner_liabilities(db: Any) -> dict[str, int]:
+    # Creator pools of due campaigns not yet planned, plus planned allocations not yet paid.
+    due = banner_engine.eligible_banner_campaigns(db)
+    unplanned = banner_engine.split_revenue(sum(row_units(campaign, "fixed_price") for campaign in due))[0]
+    outstanding = 0
+    last_id: str | None = None
+    page_size = max(1, settings.banner_payout_chunk_size)
+    while True:
+        query = (
+            db.table("banner_allocations")
+            .select("id, amount_units")
+            .in_("status", list(OUTSTANDING_ALLOCATION_STATUSES))
+        )
+        if last_id is not None:
+            query = query.gt("id", last_id)
+        page = query.order("id").limit(page_size).execute().data or []
+        outstanding += sum(int(row["amount_units"]) for row in page)
+        if len(page) < page_size:
+            break
+        last_id = page[-1]["id"]
+    return {"unplanned": unplanned, "outstanding": outstanding}
+
+
+def plan_video_ad_run(db: Any, campaigns: list[dict]) -> tuple[dict[str, int], dict[str, Any]]:
+    # Returns (views each campaign may settle, forecast). Banner liabilities are reserved first
+    # when the same account pays both. Under SOLVENCY_POLICY=refuse an uncovered run raises;
+    # under trim, campaigns are paid in order until the balance runs out and the last one is cut
+    # to the views that still fit.
+    liabilities = video_ad_liabilities(db, campaigns)
+    payer = video_ad_payer()
+    available = available_units(payer)
+    reserved = 0
+    if payer == algorand_service.payout_account():
+        banners = banner_liabilities(db)
+        reserved = banners["unplanned"] + banners["outstanding"]
+    budget = max(available - reserved - settings.solvency_reserve_units, 0)
+    required = sum(liability.creator_units for liability in liabilities)
+
+    if required > budget and settings.solvency_policy == SOLVENCY_REFUSE:
+        raise RuntimeError(
+            f"Platform wallet cannot cover this settlement run: needs {to_tokens(required)} tokens, "
+            f"{to_tokens(budget)} available after reserves."
+        )
+
+    allowed: dict[str, int] = {}
+    remaining = budget
+    trimmed = 0
+    for liability in liabilities:
+        views = liability.views
+        if liability.creator_units > remaining:
+            trimmed += 1
+            reward_per_view = liability.gross_units // liability.views
+            views = min(views, remaining // max(creator_share(reward_per_view), 1))
+            while views and creator_share(reward_per_view * views) > remaining:
+                views -= 1
+        if views > 0:
+            allowed[liability.campaign_id] = views
+            remaining -= creator_share(liability.gross_units // liability.views * views)
+
+    forecast = {
+        "payer": payer,
+        "available": available,
+        "reserved": reserved,
+        "required": required,
+        "payable": budget - remaining,
+        "campaigns_trimmed": trimmed,
+    }
+    return allowed, forecast
+
+
+def forecast() -> dict[str, Any]:
+    db = get_db()
+    campaigns = (
+        db.table("ad_campaigns")
+        .select("id, video_id, reward_per_view_units, remaining_budget_units")
+        .eq("active", True)
+        .gt("remaining_budget_units", 0)
+        .execute()
+        .data
+        or []
+    )
+    video_ads = video_ad_liabilities(db, campaigns)
+    banners = banner_liabilities(db)
+    liabilities = Counter({video_ad_payer(): sum(liability.creator_units for liability in video_ads)})
+    liabilities[algorand_service.payout_account()] += banners["unplanned"] + banners["outstanding"]
+
+    accounts = []
+    for payer, required in liabilities.items():
+        available = available_units(payer)
+        accounts.append(
+            {
+                "wallet_address": payer,
+                "available": to_tokens(available),
+                "required": to_tokens(required),
+                "shortfall": to_tokens(max(required + settings.solvency_reserve_units - available, 0)),
+                "covered": available - settings.solvency_reserve_units >= required,
+            }
+        )
+    return {
+        "asset_id": settings.asset_id,
+        "policy": settings.solvency_policy,
+        "reserve": to_tokens(settings.solvency_reserve_units),
+        "video_ads": {
+            "campaigns": len(video_ads),
+            "views": sum(liability.views for liability in video_ads),
+            "creator_payouts": to_tokens(sum(liability.creator_units for liability in video_ads)),
+        },
+        "banners": {
+            "unplanned_pool": to_tokens(banners["unplanned"]),
+            "outstanding_allocations": to_tokens(banners["outstanding"]),
+        },
+        "accounts": accounts,
+        "covered": all(account["covered"] for account in accounts),
+    }
@@ -0,0 +1,301 @@
+from __future__ import annotations
+
+import base64
+import hashlib
+import io
+import os
+import re
+import threading
+import uuid
+from abc import ABC, abstractmethod
+from collections.abc import Iterator
+from contextlib import contextmanager
+from functools import lru_cache
+from typing import Any, BinaryIO
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from ..config import settings
+from .gateway_registry import gateway_registry
+
+# Where uploaded files are pinned and where the playback proxy reads them back from. Selected by
+# STORAGE_BACKEND:
+#   pinata   Pinata's pinning API; playback from the ranked public IPFS gateways.
+#   local    content-addressed files under STORAGE_LOCAL_DIR; playback through /stream.
+#   memory   a process-local dict, for benchmarks and offline load tests.
+# The local and memory backends name content by a CIDv1 (raw codec, sha2-256) of the bytes, so
+# the CIDs they return are valid but differ from the ones Pinata's chunker would produce.
+
+PINATA = "pinata"
+LOCAL = "local"
+MEMORY = "memory"
+_RAW_CID_PREFIX = bytes([0x01, 0x55, 0x12, 0x20])  # CIDv1, raw codec, sha2-256, 32-byte digest
+_CONTENT_RANGE = re.compile(r"bytes (\d+)-(\d+)/(\d+|\*)")
+
+_override: StorageBackend | None = None
+
+
+def stream_size(stream: BinaryIO) -> int:
+    start = stream.tell()
+    size = stream.seek(0, os.SEEK_END) - start
+    stream.seek(start)
+    return size
+
+
+def raw_cid(sha256: bytes) -> str:
+    return "b" + base64.b32encode(_RAW_CID_PREFIX + sha256).decode().lower().rstrip("=")
+
+
+class StorageBackend(ABC):
+    name = ""
+    # True when pinned content is served by public IPFS gateways; otherwise playback needs /stream.
+    public_gateways = False
+    # True when the CID is derived from the SHA-256 alone, so find() replaces the content_cids index.
+    content_addressed = False
+
+    @abstractmethod
+    def pin(self, stream: BinaryIO, filename: str, content_type: str | None = None) -> str:
+        # Stores the rest of stream (from its current position) and returns its CID.
+        ...
+
+    @abstractmethod
+    def read_range(self, cid: str, start: int, length: int, target: BinaryIO) -> int | None:
+        # Writes up to length bytes of cid from start into target and returns the object size when
+        # known. Raises IndexError when start is past the end.
+        ...
+
+    def find(self, sha256: str) -> str | None:
+        # CID of already stored bytes with this SHA-256, for content-addressed backends.
+        return None
+
+    def url_prefixes(self) -> list[str]:
+        # Playback URL prefixes, best first; a CID's URL is f"{prefix}/{cid}".
+        return ["/stream"]
+
+
+class _MultipartFileBody:
+    # A one-field multipart/form-data body read straight from a seekable file, so the request is
+    # streamed chunk by chunk instead of assembled in memory. The length is known up front, which
+    # lets requests send a Content-Length rather than chunked encoding.
+
+    def __init__(self, stream: BinaryIO, filename: str, content_type: str) -> None:
+        self.boundary = uuid.uuid4().hex
+        safe_name = filename.replace("\r", "").replace("\n", "").replace('"', "%22")
+        self._head = (
+            f"--{self.boundary}\r\n"
+            f'Content-Disposition: form-data; name="file"; filename="{safe_name}"\r\n'
+            f"Content-Type: {content_type}\r\n\r\n"
+        ).encode()
+        self._tail = f"\r\n--{self.boundary}--\r\n".encode()
+        self.file_size = stream_size(stream)
+        self._parts = [io.BytesIO(self._head), stream, io.BytesIO(self._tail)]
+
+    @property
+    def content_type(self) -> str:
+        return f"multipart/form-data; boundary={self.boundary}"
+
+    def __len__(self) -> int:
+        return len(self._head) + self.file_size + len(self._tail)
+
+    def read(self, size: int = -1) -> bytes:
+        size = settings.upload_chunk_bytes if size is None or size < 0 else size
+        while self._parts:
+            chunk = self._parts[0].read(size)
+            if chunk:
+                return chunk
+            self._parts.pop(0)
+        return b""
+
+
+class PinataBackend(StorageBackend):
+    name = PINATA
+    public_gateways = True
+
+    def __init__(self) -> None:
+        self._session: requests.Session | None = None
+
+    def _gateway(self) -> requests.Session:
+        if self._session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=4, pool_maxsize=max(4, settings.stream_gateway_pool_size))
+            session.mount("http://", adapter)
+            session.mount("https://", adapter)
+            self._session = session
+        return self._session
+
+    def pin(self, stream: BinaryIO, filename: str, content_type: str | None = None) -> str:
+        # Peak memory is a few upload_chunk_bytes reads regardless of file size.
+        if not settings.pinata_jwt:
+            raise RuntimeError("PINATA_JWT is not configured.")
+
+        body = _MultipartFileBody(stream, filename, content_type or "application/octet-stream")
+        response = requests.post(
+            f"{settings.pinata_api_url.rstrip('/')}/pinning/pinFileToIPFS",
+            headers={
+                "Authorization": f"Bearer {settings.pinata_jwt}",
+                "Content-Type": body.content_type,
+            },
+            data=body,
+            timeout=120,
+        )
+        response.raise_for_status()
+        payload = response.json()
+        cid = payload.get("IpfsHash")
+        if not cid:
+            raise RuntimeError("Pinata response missing IpfsHash.")
+        return cid
+
+    def read_range(self, cid: str, start: int, length: int, target: BinaryIO) -> int | None:
+        response = self._gateway().get(
+            f"{gateway_registry.best()}/ipfs/{cid}",
+            headers={"Range": f"bytes={start}-{start + length - 1}"},
+            stream=True,
+            timeout=settings.stream_gateway_timeout_seconds,
+        )
+        try:
+            if response.status_code == 416:
+                raise IndexError(f"Offset {start} is past the end of {cid}.")
+            response.raise_for_status()
+            if response.status_code == 206:
+                match = _CONTENT_RANGE.match(response.headers.get("Content-Range", ""))
+                if not match or int(match.group(1)) != start:
+                    raise RuntimeError("Gateway returned an unexpected Content-Range.")
+                total = int(match.group(3)) if match.group(3) != "*" else None
+                skip = 0
+            else:
+                # The gateway ignored the Range header; read through to the start.
+                total = int(response.headers["Content-Length"]) if "Content-Length" in response.headers else None
+                skip = start
+
+            written = 0
+            for piece in response.iter_content(chunk_size=256 * 1024):
+                if skip:
+                    dropped = min(skip, len(piece))
+                    piece, skip = piece[dropped:], skip - dropped
+                piece = piece[: length - written]
+                target.write(piece)
+                written += len(piece)
+                if written >= length:
+                    break
+            if written == 0:
+                raise IndexError(f"Offset {start} is past the end of {cid}.")
+            return total
+        finally:
+            response.close()
+
+    def url_prefixes(self) -> list[str]:
+        return [f"{gateway}/ipfs" for gateway in gateway_registry.ranked()]
+
+
+class LocalDiskBackend(StorageBackend):
+    # <root>/<last two CID characters>/<cid>, written to a temp file and renamed into place.
+    name = LOCAL
+    content_addressed = True
+
+    def __init__(self, root: str) -> None:
+        self.root = root
+
+    def path(self, cid: str) -> str:
+        return os.path.join(self.root, cid[-2:], cid)
+
+    def find(self, sha256: str) -> str | None:
+        cid = raw_cid(bytes.fromhex(sha256))
+        return cid if os.path.exists(self.path(cid)) else None
+
+    def pin(self, stream: BinaryIO, filename: str, content_type: str | None = None) -> str:
+        os.makedirs(self.root, exist_ok=True)
+        temp_path = os.path.join(self.root, f".{uuid.uuid4().hex}.tmp")
+        digest = hashlib.sha256()
+        try:
+            with open(temp_path, "wb") as target:
+                while chunk := stream.read(settings.upload_chunk_bytes):
+                    digest.update(chunk)
+                    target.write(chunk)
+            cid = raw_cid(digest.digest())
+            os.makedirs(os.path.dirname(self.path(cid)), exist_ok=True)
+            os.replace(temp_path, self.path(cid))
+        finally:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+        return cid
+
+    def read_range(self, cid: str, start: int, length: int, target: BinaryIO) -> int | None:
+        try:
+            source = open(self.path(cid), "rb")
+        except FileNotFoundError as exc:
+            raise RuntimeError(f"{cid} is not stored locally.") from exc
+        with source:
+            total = os.fstat(source.fileno()).st_size
+            if start >= total:
+                raise IndexError(f"Offset {start} is past the end of {cid}.")
+            source.seek(start)
+            remaining = length
+            while remaining and (chunk := source.read(min(remaining, settings.upload_chunk_bytes))):
+                target.write(chunk)
+                remaining -= len(chunk)
+        return total
+
+
+class MemoryBackend(StorageBackend):
+    name = MEMORY
+    content_addressed = True
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._objects: dict[str, bytes] = {}
+
+    def find(self, sha256: str) -> str | None:
+        cid = raw_cid(bytes.fromhex(sha256))
+        with self._lock:
+            return cid if cid in self._objects else None
+
+    def pin(self, stream: BinaryIO, filename: str, content_type: str | None = None) -> str:
+        content = stream.read()
+        cid = raw_cid(hashlib.sha256(content).digest())
+        with self._lock:
+            self._objects.setdefault(cid, content)
+        return cid
+
+    def read_range(self, cid: str, start: int, length: int, target: BinaryIO) -> int | None:
+        with self._lock:
+            content = self._objects.get(cid)
+        if content is None:
+            raise RuntimeError(f"{cid} is not stored in memory.")
+        if start >= len(content):
+            raise IndexError(f"Offset {start} is past the end of {cid}.")
+        target.write(content[start : start + length])
+        return len(content)
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            return {"objects": len(self._objects), "bytes": sum(len(content) for content in self._objects.values())}
+
+
+@lru_cache
+def _build_backend(name: str, local_dir: str) -> StorageBackend:
+    if name == PINATA:
+        return PinataBackend()
+    if name == LOCAL:
+        return LocalDiskBackend(local_dir)
+    if name == MEMORY:
+        return MemoryBackend()
+    raise RuntimeError(f"Unknown STORAGE_BACKEND {name!r}; expected pinata, local or memory.")
+
+
+def get_backend() -> StorageBackend:
+    if _override is not None:
+        return _override
+    return _build_backend(settings.storage_backend.strip().lower(), settings.storage_local_dir)
+
+
+@contextmanager
+def use_backend(backend: StorageBackend) -> Iterator[None]:
+    # Routes every get_backend() call to `backend`, like database.use_db.
+    global _override
+    previous = _override
+    _override = backend
+    try:
+        yield
+    finally:
+        _override = previous
@@ -1,32 +1,77 @@
 from __future__ import annotations
 
-import requests
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import BinaryIO
 
 from ..config import settings
+from ..database import get_db
+from .storage_backends import get_backend, stream_size
 
+# Content hash -> CID of every file this platform has pinned. A re-upload of known bytes reuses
+# the CID without pinning again. The key is a SHA-256 of the raw bytes rather than a locally
+# computed CID, so a hit does not depend on matching Pinata's chunker and CID version settings.
+# Content-addressed backends (local, memory) derive the CID from the hash and skip the index.
+_cid_cache: OrderedDict[str, str] = OrderedDict()
+_cid_cache_lock = threading.Lock()
 
-def upload_file(file_content: bytes, filename: str) -> str:
-    if not settings.pinata_jwt:
-        raise RuntimeError("PINATA_JWT is not configured.")
-
-    response = requests.post(
-        "https://api.pinata.cloud/pinning/pinFileToIPFS",
-        headers={"Authorization": f"Bearer {settings.pinata_jwt}"},
-        files={"file": (filename, file_content)},
-        timeout=120,
-    )
-    response.raise_for_status()
-    payload = response.json()
-    cid = payload.get("IpfsHash")
-    if not cid:
-        raise RuntimeError("Pinata response missing IpfsHash.")
+
+def content_hash(stream: BinaryIO) -> str:
+    # SHA-256 of the rest of stream, read in upload_chunk_bytes; the position is restored.
+    start = stream.tell()
+    digest = hashlib.sha256()
+    while chunk := stream.read(settings.upload_chunk_bytes):
+        digest.update(chunk)
+    stream.seek(start)
+    return digest.hexdigest()
+
+
+def _cache_cid(sha256: str, cid: str) -> None:
+    with _cid_cache_lock:
+        _cid_cache[sha256] = cid
+        _cid_cache.move_to_end(sha256)
+        while len(_cid_cache) > settings.cid_index_cache_entries:
+            _cid_cache.popitem(last=False)
+
+
+def known_cid(sha256: str) -> str | None:
+    backend = get_backend()
+    if backend.content_addressed:
+        return backend.find(sha256)
+    with _cid_cache_lock:
+        cid = _cid_cache.get(sha256)
+    if cid:
+        return cid
+    rows = get_db().table("content_cids").select("cid").eq("sha256", sha256).limit(1).execute().data
+    if not rows:
+        return None
+    _cache_cid(sha256, rows[0]["cid"])
+    return rows[0]["cid"]
+
+
+def remember_cid(sha256: str, cid: str, size_bytes: int) -> None:
+    if get_backend().content_addressed:
+        return
+    get_db().table("content_cids").upsert(
+        {"sha256": sha256, "cid": cid, "size_bytes": size_bytes}, on_conflict="sha256"
+    ).execute()
+    _cache_cid(sha256, cid)
+
+
+def pin_stream(stream: BinaryIO, filename: str, content_type: str | None = None, sha256: str | None = None) -> str:
+    # Pins to the configured storage backend, skipped when the same bytes were pinned before. Pass
+    # sha256 when it was already computed while the file was received.
+    sha256 = sha256 or content_hash(stream)
+    cid = known_cid(sha256)
+    if cid:
+        return cid
+    size = stream_size(stream)
+    cid = get_backend().pin(stream, filename, content_type)
+    remember_cid(sha256, cid, size)
     return cid
 
 
 def build_ipfs_url(cid: str) -> str:
-    gateway = settings.pinata_gateway.strip()
-    if gateway.startswith("http://") or gateway.startswith("https://"):
-        base = gateway.rstrip("/")
-    else:
-        base = f"https://{gateway.rstrip('/')}"
-    return f"{base}/ipfs/{cid}"
+    # Playback URL on the backend's best gateway, currently the one ranked fastest.
+    return f"{get_backend().url_prefixes()[0]}/{cid}"
@@ -0,0 +1,186 @@
+from __future__ import annotations
+
+import os
+import re
+import threading
+from collections import Counter, OrderedDict
+from typing import Any
+
+from ..config import settings
+from .storage_backends import get_backend
+
+CID_PATTERN = re.compile(r"^[A-Za-z0-9]{20,128}$")
+
+# Playback data is cached on local disk as fixed-size chunks of each CID:
+#   <STREAM_CACHE_DIR>/<cid>/<index>      chunk bytes [index * chunk, (index + 1) * chunk)
+#   <STREAM_CACHE_DIR>/<cid>/size         total object size
+# Chunks are evicted least recently used once the cache passes STREAM_CACHE_MAX_BYTES, except those
+# pinned by a response still reading them. Misses are read from the storage backend, and concurrent
+# misses for one chunk share a single read.
+
+
+class ChunkCache:
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._entries: OrderedDict[tuple[str, int], int] = OrderedDict()
+        self._sizes: dict[str, int] = {}
+        self._inflight: dict[tuple[str, int], threading.Event] = {}
+        self._pins: Counter[tuple[str, int]] = Counter()
+        self._total_bytes = 0
+        self._loaded_root: str | None = None
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.evictions = 0
+        self.bytes_fetched = 0
+
+    @property
+    def chunk_bytes(self) -> int:
+        return max(64 * 1024, settings.stream_cache_chunk_bytes)
+
+    def _root(self) -> str:
+        return settings.stream_cache_dir
+
+    def chunk_path(self, cid: str, index: int) -> str:
+        return os.path.join(self._root(), cid, str(index))
+
+    def _load(self) -> None:
+        # Rebuilds the index from disk once per cache directory, oldest chunks first.
+        root = self._root()
+        if self._loaded_root == root:
+            return
+        found = []
+        sizes = {}
+        if os.path.isdir(root):
+            for cid in os.listdir(root):
+                directory = os.path.join(root, cid)
+                if not os.path.isdir(directory):
+                    continue
+                for name in os.listdir(directory):
+                    path = os.path.join(directory, name)
+                    if name == "size":
+                        with open(path) as size_file:
+                            sizes[cid] = int(size_file.read() or 0)
+                    elif name.isdigit():
+                        stat = os.stat(path)
+                        found.append((stat.st_mtime, cid, int(name), stat.st_size))
+        self._entries = OrderedDict(((cid, index), size) for _, cid, index, size in sorted(found))
+        self._sizes = sizes
+        self._total_bytes = sum(self._entries.values())
+        self._loaded_root = root
+
+    def object_size(self, cid: str) -> int:
+        with self._lock:
+            self._load()
+            size = self._sizes.get(cid)
+        if size is None:
+            # The first chunk's Content-Range carries the object size.
+            self.get_chunk(cid, 0)
+            self.release_chunk(cid, 0)
+            with self._lock:
+                size = self._sizes.get(cid)
+            if size is None:
+                raise RuntimeError(f"Storage backend did not report the size of {cid}.")
+        return size
+
+    def get_chunk(self, cid: str, index: int) -> str:
+        # Path of the cached chunk, read from the storage backend on a miss. The chunk stays pinned,
+        # safe from eviction, until the caller passes it to release_chunk.
+        key = (cid, index)
+        while True:
+            with self._lock:
+                self._load()
+                if key in self._entries:
+                    self._entries.move_to_end(key)
+                    self._pins[key] += 1
+                    self.hits += 1
+                    return self.chunk_path(cid, index)
+                event = self._inflight.get(key)
+                leader = event is None
+                if leader:
+                    event = self._inflight[key] = threading.Event()
+                    self.misses += 1
+                else:
+                    self.coalesced += 1
+            if not leader:
+                event.wait()
+                # The leader may have failed; check again and fetch if needed.
+                continue
+            try:
+                size = self._fetch(cid, index)
+                with self._lock:
+                    self._entries[key] = size
+                    self._pins[key] += 1
+                    self._total_bytes += size
+                    self.bytes_fetched += size
+                    self._evict()
+                return self.chunk_path(cid, index)
+            finally:
+                with self._lock:
+                    self._inflight.pop(key, None)
+                event.set()
+
+    def _fetch(self, cid: str, index: int) -> int:
+        directory = os.path.join(self._root(), cid)
+        os.makedirs(directory, exist_ok=True)
+        temp_path = f"{self.chunk_path(cid, index)}.{threading.get_ident()}.tmp"
+        try:
+            with open(temp_path, "wb") as target:
+                total = get_backend().read_range(cid, index * self.chunk_bytes, self.chunk_bytes, target)
+                written = target.tell()
+            os.replace(temp_path, self.chunk_path(cid, index))
+        finally:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+
+        if total is not None:
+            with self._lock:
+                if cid not in self._sizes:
+                    self._sizes[cid] = total
+                    with open(os.path.join(directory, "size"), "w") as size_file:
+                        size_file.write(str(total))
+        return written
+
+    def release_chunk(self, cid: str, index: int) -> None:
+        key = (cid, index)
+        with self._lock:
+            self._pins[key] -= 1
+            if self._pins[key] <= 0:
+                del self._pins[key]
+                # Eviction may have skipped this chunk while it was pinned.
+                self._evict()
+
+    def _evict(self) -> None:
+        # Called with the lock held.
+        for key in list(self._entries):
+            if self._total_bytes <= settings.stream_cache_max_bytes:
+                return
+            if key in self._pins:
+                continue
+            size = self._entries.pop(key)
+            self._total_bytes -= size
+            self.evictions += 1
+            try:
+                os.remove(self.chunk_path(*key))
+            except FileNotFoundError:
+                pass
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses + self.coalesced
+            return {
+                "chunks": len(self._entries),
+                "pinned": len(self._pins),
+                "bytes": self._total_bytes,
+                "max_bytes": settings.stream_cache_max_bytes,
+                "chunk_bytes": self.chunk_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "coalesced": self.coalesced,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else None,
+                "evictions": self.evictions,
+                "bytes_fetched": self.bytes_fetched,
+            }
+
+
+chunk_cache = ChunkCache()
@@ -0,0 +1,137 @@
+from __future__ import annotations
+
+import asyncio
+import threading
+import time
+from collections.abc import Awaitable, Callable
+from typing import Generic, Hashable, TypeVar
+
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+
+class TTLCache(Generic[K, V]):
+    # Short-lived cache with single-flight loading: concurrent misses for one key share a
+    # single load. invalidate() bumps a per-key generation so a load that started before the
+    # invalidation never writes its (possibly stale) result back. Generations are only kept
+    # while a load of their key is in flight, so they do not grow with every key ever seen.
+
+    def __init__(self, ttl_seconds: Callable[[], float], max_entries: int = 10_000) -> None:
+        self._ttl_seconds = ttl_seconds
+        self._max_entries = max_entries
+        self._lock = threading.Lock()
+        self._entries: dict[K, tuple[float, V]] = {}
+        self._generations: dict[K, int] = {}
+        self._async_inflight: dict[K, asyncio.Task] = {}
+        self._sync_inflight: dict[K, threading.Event] = {}
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+
+    def get(self, key: K) -> tuple[bool, V | None]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] <= time.monotonic():
+                return False, None
+            self.hits += 1
+            return True, entry[1]
+
+    def _store(self, key: K, value: V, generation: int) -> None:
+        ttl = self._ttl_seconds()
+        with self._lock:
+            if ttl <= 0 or self._generations.get(key, 0) != generation:
+                return
+            if len(self._entries) >= self._max_entries:
+                now = time.monotonic()
+                self._entries = {k: v for k, v in self._entries.items() if v[0] > now}
+                if len(self._entries) >= self._max_entries:
+                    self._entries.pop(next(iter(self._entries)))
+            self._entries[key] = (time.monotonic() + ttl, value)
+
+    def _loading(self, key: K) -> bool:
+        return key in self._sync_inflight or key in self._async_inflight
+
+    def _load_finished(self, key: K) -> None:
+        # Called with the lock held once a load of key has been unregistered.
+        if not self._loading(key):
+            self._generations.pop(key, None)
+
+    def invalidate(self, key: K) -> None:
+        with self._lock:
+            self._entries.pop(key, None)
+            if self._loading(key):
+                self._generations[key] = self._generations.get(key, 0) + 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            for key in {*self._sync_inflight, *self._async_inflight}:
+                self._generations[key] = self._generations.get(key, 0) + 1
+
+    def get_or_load(self, key: K, loader: Callable[[], V]) -> V:
+        while True:
+            found, value = self.get(key)
+            if found:
+                return value  # type: ignore[return-value]
+            with self._lock:
+                event = self._sync_inflight.get(key)
+                if event is None:
+                    event = self._sync_inflight[key] = threading.Event()
+                    generation = self._generations.get(key, 0)
+                    self.misses += 1
+                    leader = True
+                else:
+                    self.coalesced += 1
+                    leader = False
+            if not leader:
+                event.wait()
+                # The leader may have failed or been invalidated; re-check and, if needed, load again.
+                continue
+            try:
+                value = loader()
+                self._store(key, value, generation)
+                return value
+            finally:
+                with self._lock:
+                    self._sync_inflight.pop(key, None)
+                    self._load_finished(key)
+                event.set()
+
+    async def get_or_load_async(self, key: K, loader: Callable[[], Awaitable[V]]) -> V:
+        found, value = self.get(key)
+        if found:
+            return value  # type: ignore[return-value]
+
+        with self._lock:
+            task = self._async_inflight.get(key)
+            if task is None:
+                self.misses += 1
+                # The load runs in its own task: a caller that is cancelled (e.g. its client
+                # went away) stops waiting for it, but the load and every other waiter carry on.
+                task = asyncio.ensure_future(self._load_async(key, loader, self._generations.get(key, 0)))
+                task.add_done_callback(_retrieve_exception)
+                self._async_inflight[key] = task
+            else:
+                self.coalesced += 1
+        return await asyncio.shield(task)
+
+    async def _load_async(self, key: K, loader: Callable[[], Awaitable[V]], generation: int) -> V:
+        try:
+            value = await loader()
+            self._store(key, value, generation)
+            return value
+        finally:
+            with self._lock:
+                if self._async_inflight.get(key) is asyncio.current_task():
+                    del self._async_inflight[key]
+                self._load_finished(key)
+
+    def stats(self) -> dict[str, int]:
+        return {"entries": len(self._entries), "hits": self.hits, "misses": self.misses, "coalesced": self.coalesced}
+
+
+def _retrieve_exception(task: asyncio.Task) -> None:
+    # A failed load nobody is waiting for any more is not logged as an unhandled exception.
+    if not task.cancelled():
+        task.exception()
@@ -0,0 +1,33 @@
+from __future__ import annotations
+
+from decimal import Decimal, InvalidOperation, ROUND_DOWN
+from typing import Any
+
+from ..config import settings
+
+
+# Ledger amounts (budgets, rewards, settlements, balances) are ints in the asset's base units
+# (micro-tokens at 6 decimals). Decimal only appears here, where user input and API output
+# cross into whole tokens.
+
+
+def scale() -> int:
+    return 10 ** settings.token_decimals
+
+
+def to_units(amount_tokens: Decimal | float | int | str) -> int:
+    try:
+        amount = Decimal(str(amount_tokens))
+    except InvalidOperation as exc:
+        raise ValueError(f"Invalid token amount: {amount_tokens!r}") from exc
+    if not amount.is_finite():
+        raise ValueError(f"Invalid token amount: {amount_tokens!r}")
+    return int((amount * scale()).to_integral_value(rounding=ROUND_DOWN))
+
+
+def to_tokens(amount_units: int) -> float:
+    return amount_units / scale()
+
+
+def row_units(row: dict[str, Any], column: str) -> int:
+    return int(row.get(f"{column}_units") or 0)
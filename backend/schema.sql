@@ -44,9 +44,12 @@ create table if not exists public.ad_campaigns (
   id uuid primary key default uuid_generate_v4(),
   advertiser_wallet text not null,
   video_id uuid not null references public.videos(id) on delete cascade,
-  budget numeric(20, 6) not null check (budget >= 0),
-  remaining_budget numeric(20, 6) not null check (remaining_budget >= 0),
-  reward_per_view numeric(20, 6) not null check (reward_per_view > 0),
+  budget_units bigint not null check (budget_units >= 0),
+  remaining_budget_units bigint not null check (remaining_budget_units >= 0),
+  reward_per_view_units bigint not null check (reward_per_view_units > 0),
+  budget numeric(20, 6) generated always as (budget_units::numeric / 1000000) stored,
+  remaining_budget numeric(20, 6) generated always as (remaining_budget_units::numeric / 1000000) stored,
+  reward_per_view numeric(20, 6) generated always as (reward_per_view_units::numeric / 1000000) stored,
   active boolean not null default true,
   ad_video_cid text,
   created_at timestamptz not null default timezone('utc', now())
@@ -56,7 +59,8 @@ create table if not exists public.banner_campaigns (
   id uuid primary key default uuid_generate_v4(),
   advertiser_wallet text not null,
   tier text not null check (tier in ('1m', '3m', '6m')),
-  fixed_price numeric(20, 6) not null check (fixed_price > 0),
+  fixed_price_units bigint not null check (fixed_price_units > 0),
+  fixed_price numeric(20, 6) generated always as (fixed_price_units::numeric / 1000000) stored,
   start_date date not null,
   end_date date not null,
   active boolean not null default true,
@@ -67,19 +71,185 @@ create table if not exists public.banner_campaigns (
 create table if not exists public.settlements (
   id uuid primary key default uuid_generate_v4(),
   creator_wallet text not null,
-  amount numeric(20, 6) not null,
-  platform_fee numeric(20, 6) not null default 0,
+  amount_units bigint not null,
+  platform_fee_units bigint not null default 0,
+  amount numeric(20, 6) generated always as (amount_units::numeric / 1000000) stored,
+  platform_fee numeric(20, 6) generated always as (platform_fee_units::numeric / 1000000) stored,
   tx_hash text,
+  confirmed_round bigint,
+  seq bigserial,
+  reconciliation_status text check (reconciliation_status in ('confirmed', 'pending', 'missing', 'mismatch')),
+  reconciliation_error text,
+  reconciled_at timestamptz,
   settlement_type text not null default 'video_ad',
   campaign_id uuid,
   timestamp timestamptz not null default timezone('utc', now())
 );
 
+alter table public.settlements add column if not exists confirmed_round bigint;
+alter table public.settlements add column if not exists seq bigserial;
+alter table public.settlements add column if not exists reconciliation_status text
+  check (reconciliation_status in ('confirmed', 'pending', 'missing', 'mismatch'));
+alter table public.settlements add column if not exists reconciliation_error text;
+alter table public.settlements add column if not exists reconciled_at timestamptz;
+
+-- Incremental jobs (settlement reconciliation) remember the last settlements.seq they checked.
+create table if not exists public.reconciliation_watermarks (
+  job text primary key,
+  last_seq bigint not null default 0,
+  updated_at timestamptz not null default timezone('utc', now())
+);
+
+-- Banner distributions are planned once into banner_allocations and paid in checkpointed
+-- chunks; a run left in 'planning' or 'paying' is resumed by the next trigger.
+create table if not exists public.banner_distribution_runs (
+  id uuid primary key default uuid_generate_v4(),
+  status text not null default 'planning' check (status in ('planning', 'paying', 'completed')),
+  creator_pool_units bigint not null,
+  platform_share_units bigint not null,
+  campaigns_count integer not null default 0,
+  creators_planned integer not null default 0,
+  last_error text,
+  created_at timestamptz not null default timezone('utc', now()),
+  updated_at timestamptz not null default timezone('utc', now()),
+  completed_at timestamptz
+);
+
+create table if not exists public.banner_allocations (
+  id uuid primary key default uuid_generate_v4(),
+  run_id uuid not null references public.banner_distribution_runs(id) on delete cascade,
+  creator_wallet text not null,
+  amount_units bigint not null check (amount_units > 0),
+  status text not null default 'pending',
+  tx_hash text,
+  last_valid_round bigint,
+  confirmed_round bigint,
+  error text,
+  updated_at timestamptz not null default timezone('utc', now()),
+  unique (run_id, creator_wallet)
+);
+
+alter table public.banner_allocations drop constraint if exists banner_allocations_status_check;
+alter table public.banner_allocations add constraint banner_allocations_status_check
+  check (status in ('pending', 'submitted', 'paid', 'deferred', 'failed', 'unknown'));
+
+alter table public.banner_campaigns
+  add column if not exists distribution_run_id uuid references public.banner_distribution_runs(id);
+
+-- Uploads are spooled to the API host's disk and pinned by a background worker pool; the video
+-- row is inserted once the CID arrives.
+create table if not exists public.upload_jobs (
+  id uuid primary key default uuid_generate_v4(),
+  creator_id uuid not null references public.users(id) on delete cascade,
+  title text not null,
+  description text default '',
+  filename text not null,
+  content_type text,
+  size_bytes bigint not null default 0,
+  status text not null default 'queued' check (status in ('queued', 'pinning', 'completed', 'failed')),
+  attempts integer not null default 0,
+  cid text,
+  video_id uuid references public.videos(id) on delete set null,
+  error text,
+  created_at timestamptz not null default timezone('utc', now()),
+  updated_at timestamptz not null default timezone('utc', now())
+);
+
+alter table public.upload_jobs add column if not exists content_sha256 text;
+alter table public.upload_jobs add column if not exists received_bytes bigint not null default 0;
+alter table public.upload_jobs drop constraint if exists upload_jobs_status_check;
+alter table public.upload_jobs add constraint upload_jobs_status_check
+  check (status in ('receiving', 'queued', 'pinning', 'completed', 'failed'));
+
+-- SHA-256 of every pinned file's bytes -> its CID, so re-uploads skip Pinata.
+create table if not exists public.content_cids (
+  sha256 text primary key,
+  cid text not null,
+  size_bytes bigint not null default 0,
+  created_at timestamptz not null default timezone('utc', now())
+);
+
+-- Token amounts are stored as integer base units (micro-tokens); the numeric columns are
+-- read-only whole-token copies. The divisor 1000000 and the numeric(20, 6) scale assume the
+-- asset has 6 decimals, which config.py enforces through TOKEN_DECIMALS. Migrate databases
+-- created with numeric amounts.
+do $$
+declare
+  ledger record;
+begin
+  for ledger in
+    select * from (values
+      ('ad_campaigns', 'budget'),
+      ('ad_campaigns', 'remaining_budget'),
+      ('ad_campaigns', 'reward_per_view'),
+      ('banner_campaigns', 'fixed_price'),
+      ('settlements', 'amount'),
+      ('settlements', 'platform_fee')
+    ) as columns_to_migrate(table_name, column_name)
+  loop
+    if not exists (
+      select 1 from information_schema.columns
+      where table_schema = 'public' and table_name = ledger.table_name and column_name = ledger.column_name || '_units'
+    ) then
+      execute format('alter table public.%I add column %I bigint', ledger.table_name, ledger.column_name || '_units');
+      execute format(
+        'update public.%I set %I = floor(coalesce(%I, 0) * 1000000)',
+        ledger.table_name, ledger.column_name || '_units', ledger.column_name
+      );
+      execute format('alter table public.%I alter column %I set not null', ledger.table_name, ledger.column_name || '_units');
+      execute format('alter table public.%I drop column %I', ledger.table_name, ledger.column_name);
+      execute format(
+        'alter table public.%I add column %I numeric(20, 6) generated always as (%I::numeric / 1000000) stored',
+        ledger.table_name, ledger.column_name, ledger.column_name || '_units'
+      );
+    end if;
+  end loop;
+end $$;
+
+alter table public.settlements alter column platform_fee_units set default 0;
+
+-- The migration drops the numeric columns together with their checks; restore them on the
+-- unit columns, under the names a fresh database gives them.
+do $$
+declare
+  guard record;
+begin
+  for guard in
+    select * from (values
+      ('ad_campaigns', 'budget_units', '>='),
+      ('ad_campaigns', 'remaining_budget_units', '>='),
+      ('ad_campaigns', 'reward_per_view_units', '>'),
+      ('banner_campaigns', 'fixed_price_units', '>')
+    ) as unit_checks(table_name, column_name, operator)
+  loop
+    if not exists (
+      select 1 from pg_constraint
+      where conrelid = format('public.%I', guard.table_name)::regclass
+        and conname = guard.table_name || '_' || guard.column_name || '_check'
+    ) then
+      execute format(
+        'alter table public.%I add constraint %I check (%I %s 0)',
+        guard.table_name, guard.table_name || '_' || guard.column_name || '_check', guard.column_name, guard.operator
+      );
+    end if;
+  end loop;
+end $$;
+
 create index if not exists idx_videos_creator_id on public.videos(creator_id);
 create index if not exists idx_views_video_id on public.views(video_id);
 create index if not exists idx_views_settled on public.views(settled);
 create index if not exists idx_ad_campaigns_video_id on public.ad_campaigns(video_id);
 create index if not exists idx_settlements_timestamp on public.settlements(timestamp desc);
+create index if not exists idx_settlements_tx_hash on public.settlements(tx_hash);
+create unique index if not exists idx_settlements_seq on public.settlements(seq);
+create index if not exists idx_settlements_reconcile_pending on public.settlements(seq) where reconciliation_status = 'pending';
+create index if not exists idx_users_paid_creators on public.users(id) where role = 'creator' and subscribers_count > 0;
+create index if not exists idx_banner_campaigns_due on public.banner_campaigns(end_date) where active and not distributed;
+create index if not exists idx_banner_campaigns_run on public.banner_campaigns(distribution_run_id);
+create index if not exists idx_banner_allocations_run_status on public.banner_allocations(run_id, status, id);
+create index if not exists idx_banner_allocations_deferred on public.banner_allocations(id) where status = 'deferred';
+create index if not exists idx_upload_jobs_open on public.upload_jobs(created_at) where status in ('queued', 'pinning');
+create index if not exists idx_banner_distribution_runs_open on public.banner_distribution_runs(created_at) where status <> 'completed';
 
 alter table public.users enable row level security;
 alter table public.videos enable row level security;
@@ -88,6 +258,11 @@ alter table public.views enable row level security;
 alter table public.ad_campaigns enable row level security;
 alter table public.banner_campaigns enable row level security;
 alter table public.settlements enable row level security;
+alter table public.banner_distribution_runs enable row level security;
+alter table public.banner_allocations enable row level security;
+alter table public.reconciliation_watermarks enable row level security;
+alter table public.upload_jobs enable row level security;
+alter table public.content_cids enable row level security;
 
 drop policy if exists "Public read users" on public.users;
 drop policy if exists "Public read videos" on public.videos;
@@ -0,0 +1,74 @@
+import argparse
+import os
+import statistics
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from algosdk import account, transaction
+
+# Add backend directory to sys.path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app.services.algod_pool import AlgodEndpointPool, PooledAlgodClient
+from fake_algod import FakeAlgodNode, FakeNetwork
+
+
+def _percentiles(samples):
+    ordered = sorted(samples)
+
+    def pick(pct):
+        return ordered[min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))] * 1000
+
+    return f"p50={pick(50):7.1f}ms p95={pick(95):7.1f}ms p99={pick(99):7.1f}ms max={ordered[-1] * 1000:7.1f}ms"
+
+
+def _run(client, label, calls, threads, address, txid):
+    def one(index):
+        started = time.perf_counter()
+        if index % 2:
+            client.pending_transaction_info(txid)
+        else:
+            client.account_info(address)
+        return time.perf_counter() - started
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as executor:
+        samples = list(executor.map(one, range(calls)))
+    elapsed = time.perf_counter() - started
+    print(f"{label:28s} {_percentiles(samples)}  mean={statistics.mean(samples) * 1000:6.1f}ms  {calls / elapsed:7.1f} req/s")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare one algod node with a hedged multi-node pool.")
+    parser.add_argument("--calls", type=int, default=1_000)
+    parser.add_argument("--threads", type=int, default=8)
+    args = parser.parse_args()
+
+    network = FakeNetwork()
+    # A node with a slow tail, a consistently fast node and a flaky one.
+    tail = FakeAlgodNode(network, latency_ms=5, jitter_ms=3, slow_fraction=0.04, slow_ms=250, seed=1).start()
+    fast = FakeAlgodNode(network, latency_ms=8, jitter_ms=3, seed=2).start()
+    flaky = FakeAlgodNode(network, latency_ms=4, jitter_ms=2, error_rate=0.4, seed=3).start()
+
+    private_key, address = account.generate_account()
+    seed_client = PooledAlgodClient("", fast.url)
+    params = seed_client.suggested_params()
+    opt_in = transaction.AssetTransferTxn(address, params, address, 0, network.asset_id)
+    txid = seed_client.send_transaction(opt_in.sign(private_key))
+
+    print(f"nodes: tail={tail.url} fast={fast.url} flaky={flaky.url}")
+    _run(PooledAlgodClient("", tail.url), "single node (slow tail)", args.calls, args.threads, address, txid)
+    pool = AlgodEndpointPool("", [tail.url, fast.url, flaky.url])
+    _run(pool, "pool (health + hedging)", args.calls, args.threads, address, txid)
+
+    print("\nendpoint health after run:")
+    for row in pool.health():
+        print(f"  {row}")
+
+    for node in (tail, fast, flaky):
+        node.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+import argparse
+import asyncio
+import os
+import sys
+import time
+
+import httpx
+from algosdk import account
+from fastapi import APIRouter, Depends, FastAPI
+
+# Add backend directory to sys.path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app.config import settings
+from app.routes import auth, wallets
+from app.services import algorand_service
+from app.utils.units import to_tokens
+from fake_algod import FakeAlgodNode, FakeNetwork
+
+
+def _legacy_app():
+    # The pre-async handler: blocking algosdk call inside an async route.
+    router = APIRouter()
+
+    @router.get("/balance")
+    async def get_my_wallet_balance(current_user: dict = Depends(auth.get_current_user)):
+        balance = algorand_service.get_asset_balance(current_user["wallet_address"])
+        return {"wallet_address": current_user["wallet_address"], "balance": to_tokens(balance)}
+
+    app = FastAPI()
+    app.include_router(router, prefix="/wallets")
+    return app
+
+
+def _async_app():
+    app = FastAPI()
+    app.include_router(wallets.router, prefix="/wallets")
+    return app
+
+
+async def _run(app, label, concurrency, tokens):
+    transport = httpx.ASGITransport(app=app)
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies = []
+
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+
+        async def one(token):
+            async with semaphore:
+                started = time.perf_counter()
+                response = await client.get("/wallets/balance", headers={"Authorization": f"Bearer {token}"})
+                response.raise_for_status()
+                latencies.append(time.perf_counter() - started)
+
+        started = time.perf_counter()
+        await asyncio.gather(*(one(token) for token in tokens))
+        elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    p99 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))] * 1000
+    print(f"{label:34s} {len(tokens) / elapsed:8.1f} req/s  p50={latencies[len(latencies) // 2] * 1000:7.1f}ms  p99={p99:7.1f}ms")
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="Concurrent /wallets/balance throughput, blocking vs async algod.")
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--latency-ms", type=float, default=100)
+    args = parser.parse_args()
+
+    network = FakeNetwork()
+    node = FakeAlgodNode(network, latency_ms=args.latency_ms, jitter_ms=5).start()
+    settings.algod_address = node.url
+    settings.algod_addresses = ""
+    settings.asset_id = network.asset_id
+    settings.algod_pool_size = args.concurrency
+    settings.jwt_secret = settings.jwt_secret or "bench-secret"
+    # Every request asks for a different wallet and nothing is cached, so both paths reach algod
+    # for each request instead of being answered by the balance cache or a shared in-flight load.
+    settings.balance_cache_ttl_seconds = 0
+
+    tokens = []
+    for index in range(args.requests):
+        _, wallet = account.generate_account()
+        tokens.append(auth._create_access_token({"sub": wallet, "user_id": f"bench-user-{index}", "role": "viewer"}))
+
+    print(f"fake algod {node.url} latency={args.latency_ms}ms, {args.requests} requests, concurrency={args.concurrency}")
+    await _run(_legacy_app(), "before: blocking account_info", args.concurrency, tokens)
+    await _run(_async_app(), "after: awaited httpx account_info", args.concurrency, tokens)
+
+    await algorand_service.aclose()
+    node.stop()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,89 @@
+import argparse
+import asyncio
+import base64
+import os
+import sys
+import time
+
+from algosdk import account, util
+
+# Add backend directory to sys.path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app.services.signature_verifier import SignatureVerifier
+
+
+def _legacy_verify(wallet_address, message, signature):
+    # The pre-cache path: exception-driven decoding, then algosdk's verify_bytes.
+    try:
+        base64.b64decode(signature)
+    except Exception:
+        try:
+            bytes.fromhex(signature)
+        except Exception:
+            signature.encode("utf-8")
+    return util.verify_bytes(message.encode("utf-8"), signature, wallet_address)
+
+
+def _logins(count, wallets):
+    logins = []
+    for index in range(count):
+        private_key, address = wallets[index % len(wallets)]
+        message = f"RIFT_AUTH:bench-{index}:{int(time.time())}"
+        logins.append((address, message, util.sign_bytes(message.encode("utf-8"), private_key)))
+    return logins
+
+
+def _report(label, count, elapsed, cores):
+    rate = count / elapsed
+    print(f"{label:36s} {rate:9.0f} logins/s  {rate / cores:9.0f} logins/s/core  ({cores} core(s))")
+
+
+def _run_sync(label, verify, logins):
+    started = time.perf_counter()
+    for login in logins:
+        assert verify(*login)
+    _report(label, len(logins), time.perf_counter() - started, 1)
+
+
+async def _run_pool(verifier, logins, concurrency):
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def one(login):
+        async with semaphore:
+            assert await verifier.verify_async(*login)
+
+    await asyncio.gather(*(one(login) for login in logins[:concurrency]))  # spawn the workers
+    started = time.perf_counter()
+    await asyncio.gather(*(one(login) for login in logins[concurrency:]))
+    return time.perf_counter() - started
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Login signature verification throughput.")
+    parser.add_argument("--logins", type=int, default=5_000)
+    parser.add_argument("--wallets", type=int, default=500)
+    parser.add_argument("--workers", type=int, default=len(os.sched_getaffinity(0)))
+    parser.add_argument("--concurrency", type=int, default=256)
+    args = parser.parse_args()
+
+    wallets = [account.generate_account() for _ in range(args.wallets)]
+    logins = _logins(args.logins, wallets)
+
+    _run_sync("legacy decode + verify_bytes", _legacy_verify, logins)
+    uncached = SignatureVerifier(workers=lambda: 0, cache_size=lambda: 0, batch_size=lambda: 64)
+    _run_sync("fast decode, inline", uncached.verify, logins)
+    cached = SignatureVerifier(workers=lambda: 0, cache_size=lambda: len(logins), batch_size=lambda: 64)
+    for login in logins:
+        cached.verify(*login)
+    _run_sync("fast decode, LRU hit (retry storm)", cached.verify, logins)
+
+    pooled = SignatureVerifier(workers=lambda: args.workers, cache_size=lambda: 0, batch_size=lambda: 64)
+    elapsed = asyncio.run(_run_pool(pooled, logins, args.concurrency))
+    _report(f"process pool x{args.workers}, batched", len(logins) - args.concurrency, elapsed, args.workers)
+    print(f"pool stats: {pooled.stats()}")
+    pooled.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,134 @@
+import argparse
+import math
+import os
+import random
+import sys
+import time
+from collections import Counter
+from datetime import datetime, timezone
+from decimal import Decimal, ROUND_DOWN
+
+from algosdk import account
+
+# Add backend directory to sys.path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app.config import settings
+from app.database import get_db
+from app.services import algorand_service, reward_allocation, simulation
+
+
+def _legacy_allocation(creator_pool_units, subscribers):
+    # The old per-creator loop: Decimal ratio, quantized down, dust dropped.
+    pool = Decimal(creator_pool_units) / Decimal(10**6)
+    total = Decimal(sum(subscribers))
+    shares = []
+    for count in subscribers:
+        reward = (pool * (Decimal(count) / total)).quantize(Decimal("0.000001"), rounding=ROUND_DOWN)
+        shares.append(int(reward * 10**6))
+    return shares
+
+
+def _time(label, fn, pool_units):
+    started = time.perf_counter()
+    shares = fn()
+    elapsed = time.perf_counter() - started
+    print(f"  {label:30s} {elapsed * 1000:9.1f}ms  undistributed dust={pool_units - sum(shares)} units")
+    return shares
+
+
+def _settlement_row(wallet, amount_units, tx_hash, confirmed_round):
+    return {
+        "creator_wallet": wallet,
+        "amount_units": amount_units,
+        "platform_fee_units": 0,
+        "tx_hash": tx_hash,
+        "confirmed_round": confirmed_round,
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "settlement_type": "banner",
+    }
+
+
+def _pay_one_by_one(payouts):
+    db = get_db()
+    for payout in payouts:
+        transfer = algorand_service.transfer_tokens(payout.wallet, payout.amount_units)
+        db.table("settlements").insert(
+            _settlement_row(payout.wallet, transfer["amount_units"], transfer["tx_hash"], transfer["confirmed_round"])
+        ).execute()
+
+
+def _pay_bulk(payouts):
+    db = get_db()
+    results = algorand_service.transfer_tokens_bulk(payouts)
+    rows = [
+        _settlement_row(result["wallet"], result["amount_units"], result["tx_hash"], result["confirmed_round"])
+        for result in results
+        if result["error"] is None
+    ]
+    for start in range(0, len(rows), settings.banner_creator_page_size):
+        db.table("settlements").insert(rows[start : start + settings.banner_creator_page_size]).execute()
+
+
+def _run_payouts(label, pay, payouts, blocking_waits):
+    db = simulation.InMemoryDB({"settlements": []})
+    client = simulation.SimulatedAlgodClient()
+    with simulation.simulation_mode(db, client):
+        started = time.perf_counter()
+        pay(payouts)
+        elapsed = time.perf_counter() - started
+    algod_calls = Counter(client.calls)
+    print(
+        f"  {label:30s} {elapsed:8.2f}s  {len(payouts) / elapsed:8.0f} payouts/s  db_calls={sum(db.calls.values())} "
+        f"algod={dict(sorted(algod_calls.items()))}"
+    )
+    # Simulated blocks are instant; on chain every blocking confirmation wait costs ~1 round (~2.8s).
+    print(f"  {'':30s} blocking confirmation waits={blocking_waits} (~{blocking_waits * 2.8 / 60:.0f} min of rounds on chain)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Banner allocation and payout hand-off at scale.")
+    parser.add_argument("--creators", type=int, default=100_000)
+    parser.add_argument("--payout-creators", type=int, default=None, help="Creators in the payout run (default: --creators).")
+    parser.add_argument("--pool-tokens", type=int, default=70_000)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    subscribers = [max(1, int(rng.paretovariate(1.1) * 10)) for _ in range(args.creators)]
+    pool_units = args.pool_tokens * 10**6
+
+    print(f"allocation of {args.pool_tokens} tokens across {args.creators} creators")
+    legacy = _time("legacy Decimal loop", lambda: _legacy_allocation(pool_units, subscribers), pool_units)
+    exact = _time(
+        "largest remainder, Python ints",
+        lambda: reward_allocation._largest_remainder_exact(pool_units, subscribers, sum(subscribers)),
+        pool_units,
+    )
+    vectorized = _time("largest remainder, NumPy", lambda: reward_allocation.largest_remainder(pool_units, subscribers), pool_units)
+    assert exact == vectorized
+    print(f"  max per-creator difference vs legacy: {max(a - b for a, b in zip(vectorized, legacy))} unit(s)")
+
+    count = args.payout_creators or args.creators
+    payouts = [
+        algorand_service.Payout(account.generate_account()[1], share)
+        for share in vectorized[:count]
+        if share > 0
+    ]
+    print(f"\npayout hand-off for {len(payouts)} creators (simulated algod, in-memory db)")
+    groups = math.ceil(len(payouts) / algorand_service.PAYOUT_GROUP_SIZE)
+    _run_payouts("one transfer + insert each", _pay_one_by_one, payouts, len(payouts))
+    _run_payouts(
+        "grouped transfers, bulk insert",
+        _pay_bulk,
+        payouts,
+        math.ceil(groups / settings.payout_max_in_flight_groups),
+    )
+    # Simulated blocks confirm instantly, so neither path waits on the chain and the wall times
+    # above come out close. Bulk payouts save DB round trips and blocking confirmation waits,
+    # which only turn into wall time against a real node's ~2.8s rounds.
+    print(f"  {'':30s} wall times exclude block time; compare db_calls and blocking confirmation waits")
+
+
+if __name__ == "__main__":
+    main()
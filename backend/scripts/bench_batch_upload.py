@@ -0,0 +1,124 @@
+import argparse
+import hashlib
+import json
+import os
+import sys
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Add backend directory to sys.path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from fastapi.testclient import TestClient
+
+from app.config import settings
+from app.database import use_db
+from app.main import app
+from app.routes.auth import get_current_user
+from app.services import simulation
+
+CREATOR = {"user_id": "bench-creator", "wallet_address": "BENCH"}
+
+
+def _pinata(latency, rate_limit_every, counter):
+    class SlowPinataHandler(BaseHTTPRequestHandler):
+        # Answers after a fixed delay, like a remote pinning API, and rate limits every Nth pin.
+
+        def do_POST(self):
+            remaining = int(self.headers["Content-Length"])
+            digest = hashlib.sha256()
+            while remaining:
+                chunk = self.rfile.read(min(1024 * 1024, remaining))
+                remaining -= len(chunk)
+                digest.update(chunk)
+            with counter["lock"]:
+                counter["requests"] += 1
+                limited = rate_limit_every and counter["requests"] % rate_limit_every == 0
+            time.sleep(latency)
+            if limited:
+                self.send_response(429)
+                self.send_header("Retry-After", "0.2")
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+                return
+            body = json.dumps({"IpfsHash": f"fake-{digest.hexdigest()[:32]}"}).encode()
+            self.send_response(200)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    return SlowPinataHandler
+
+
+def _one_by_one(client, videos):
+    # The previous path: one /videos/upload per file, each waited on before the next.
+    for index, video in enumerate(videos):
+        job_id = client.post(
+            "/videos/upload", data={"title": f"video {index}"}, files={"file": (f"{index}.mp4", video, "video/mp4")}
+        ).json()["job_id"]
+        while client.get(f"/videos/upload/{job_id}").json()["status"] not in ("completed", "failed"):
+            time.sleep(0.005)
+
+
+def _batch(client, videos):
+    files = [("files", (f"{index}.mp4", video, "video/mp4")) for index, video in enumerate(videos)]
+    metadata = json.dumps([{"title": f"video {index}"} for index in range(len(videos))])
+    events = 0
+    summary = None
+    with client.stream("POST", "/videos/batch-upload", data={"metadata": metadata}, files=files) as response:
+        for line in response.iter_lines():
+            if line:
+                events += 1
+                summary = json.loads(line)
+    assert summary["event"] == "completed" and summary["created"] == len(videos), summary
+    return events
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Catalog import time, one upload per file vs /videos/batch-upload.")
+    parser.add_argument("--files", type=int, default=100)
+    parser.add_argument("--size-kb", type=int, default=256)
+    parser.add_argument("--latency-ms", type=float, default=150.0, help="Simulated Pinata time per pin.")
+    parser.add_argument("--rate-limit-every", type=int, default=25, help="Answer every Nth pin with a 429 (0 to disable).")
+    parser.add_argument("--concurrency", type=int, default=16)
+    args = parser.parse_args()
+
+    counter = {"lock": threading.Lock(), "requests": 0}
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _pinata(args.latency_ms / 1000, args.rate_limit_every, counter))
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    spool = tempfile.TemporaryDirectory()
+    settings.pinata_api_url = f"http://127.0.0.1:{server.server_address[1]}"
+    settings.pinata_jwt = "bench"
+    settings.storage_backend = "pinata"
+    settings.scheduler_enabled = False
+    settings.upload_spool_dir = spool.name
+    settings.pinning_retry_base_seconds = 0.1
+    settings.batch_upload_concurrency = args.concurrency
+    app.dependency_overrides[get_current_user] = lambda: CREATOR
+
+    print(f"{args.files} files of {args.size_kb} KiB, Pinata latency {args.latency_ms:.0f} ms")
+    for name, run in (("one by one", _one_by_one), ("batch-upload", _batch)):
+        # Fresh bytes and a fresh database per run, so neither run benefits from the CID index.
+        videos = [os.urandom(args.size_kb * 1024) for _ in range(args.files)]
+        db = simulation.InMemoryDB({"users": [{"id": CREATOR["user_id"], "username": "bench", "wallet_address": "BENCH"}]})
+        counter["requests"] = 0
+        with use_db(db), TestClient(app) as client:
+            started = time.perf_counter()
+            run(client, videos)
+            elapsed = time.perf_counter() - started
+            inserts = db.calls["videos.insert"]
+            assert len(db.tables["videos"]) == args.files
+        print(
+            f"  {name:12s} {elapsed:7.2f}s  {args.files / elapsed:6.1f} files/s  "
+            f"pin requests {counter['requests']:4d}  video inserts {inserts:4d}"
+        )
+    spool.cleanup()
+
+
+if __name__ == "__main__":
+    main()
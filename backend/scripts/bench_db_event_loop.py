@@ -0,0 +1,116 @@
+import argparse
+import json
+import os
+import statistics
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse
+
+# Add backend directory to sys.path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from fastapi.testclient import TestClient
+
+from app.config import settings
+from app.main import app
+
+CREATOR = {"id": "6f1c3a52-0d4e-4b8a-9c71-2e5f8d9a0b13", "username": "bench", "wallet_address": "BENCH"}
+VIDEO = {
+    "id": "0b7e2c9d-5a41-4f3e-8d26-91c4e7a5f380",
+    "cid": "bafybeibenchmarkvideo",
+    "title": "bench",
+    "creator_id": CREATOR["id"],
+}
+
+
+def _postgrest(slow, fast, counter):
+    class FakePostgrestHandler(BaseHTTPRequestHandler):
+        # The video list query is slow (a large, unindexed scan); single-row lookups are fast.
+        protocol_version = "HTTP/1.1"
+
+        def do_GET(self):
+            url = urlparse(self.path)
+            if not self.headers.get("apikey"):
+                self.send_response(401)
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+                return
+            single = "id=in." in url.query
+            time.sleep(fast if single else slow)
+            with counter["lock"]:
+                counter["requests"] += 1
+            if url.path.endswith("/users"):
+                rows = [CREATOR]
+            else:
+                rows = [VIDEO] if single else [VIDEO] * 50
+            body = json.dumps(rows).encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    return FakePostgrestHandler
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Tail latency of fast requests while slow queries run on the same worker.")
+    parser.add_argument("--seconds", type=float, default=5.0)
+    parser.add_argument("--slow-clients", type=int, default=4, help="Clients looping on /videos/list.")
+    parser.add_argument("--fast-clients", type=int, default=16, help="Clients looping on /videos/{id}.")
+    parser.add_argument("--slow-ms", type=float, default=300.0, help="PostgREST time for the list query.")
+    parser.add_argument("--fast-ms", type=float, default=5.0, help="PostgREST time for a single-row lookup.")
+    args = parser.parse_args()
+
+    counter = {"lock": threading.Lock(), "requests": 0}
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _postgrest(args.slow_ms / 1000, args.fast_ms / 1000, counter))
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    settings.supabase_url = f"http://127.0.0.1:{server.server_address[1]}"
+    settings.supabase_key = "bench-service-key"
+    settings.scheduler_enabled = False
+
+    latencies = {"list": [], "get": []}
+    errors = []
+    deadline = time.perf_counter() + args.seconds
+
+    with TestClient(app) as client:
+
+        def loop(kind):
+            path = "/videos/list" if kind == "list" else f"/videos/{VIDEO['id']}"
+            while time.perf_counter() < deadline:
+                started = time.perf_counter()
+                response = client.get(path)
+                latencies[kind].append(time.perf_counter() - started)
+                if response.status_code != 200:
+                    errors.append(response.status_code)
+
+        kinds = ["list"] * args.slow_clients + ["get"] * args.fast_clients
+        with ThreadPoolExecutor(max_workers=len(kinds)) as pool:
+            list(pool.map(loop, kinds))
+
+    print(
+        f"{args.slow_clients} clients on /videos/list ({args.slow_ms:.0f} ms query), "
+        f"{args.fast_clients} on /videos/{{id}} ({args.fast_ms:.0f} ms query), {args.seconds:.0f}s"
+    )
+    for kind, label in (("get", "/videos/{id}"), ("list", "/videos/list")):
+        ordered = sorted(latencies[kind])
+        if not ordered:
+            continue
+        p95 = ordered[int(len(ordered) * 0.95) - 1]
+        p99 = ordered[max(int(len(ordered) * 0.99) - 1, 0)]
+        print(
+            f"  {label:13s} {len(ordered):6d} requests  p50 {statistics.median(ordered) * 1000:7.1f} ms  "
+            f"p95 {p95 * 1000:7.1f} ms  p99 {p99 * 1000:7.1f} ms"
+        )
+    print(f"  PostgREST requests {counter['requests']}, errors {len(errors)}")
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+import argparse
+import os
+import random
+import sys
+import time
+from collections import Counter
+
+from algosdk import account, mnemonic
+
+# Add backend directory to sys.path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app.config import settings
+from app.services import algorand_service, simulation
+
+
+def _run(payouts, hot_wallets, block_seconds):
+    settings.payout_hot_wallet_mnemonics = ",".join(
+        mnemonic.from_private_key(account.generate_account()[0]) for _ in range(hot_wallets)
+    )
+    db = simulation.InMemoryDB({})
+    client = simulation.SimulatedAlgodClient(block_seconds=block_seconds)
+    with simulation.simulation_mode(db, client):
+        started = time.perf_counter()
+        results = algorand_service.transfer_tokens_bulk(payouts)
+        elapsed = time.perf_counter() - started
+    failed = sum(1 for result in results if result["error"])
+    paid = Counter()
+    for result in results:
+        if not result["error"]:
+            paid[result["wallet"]] += result["amount_units"]
+    assert failed == 0 and all(paid[payout.wallet] == payout.amount_units for payout in payouts)
+    return elapsed, client.round - 1_000, len(client.transactions) - len(payouts)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Bulk payout submission throughput vs hot-wallet pool size.")
+    parser.add_argument("--payouts", type=int, default=4_096)
+    parser.add_argument("--pools", default="0,1,2,4,8", help="Hot wallets per run; 0 sends from the platform account.")
+    parser.add_argument("--block-seconds", type=float, default=0.25, help="Simulated block interval (mainnet ~2.8s).")
+    parser.add_argument("--in-flight-groups", type=int, default=4, help="PAYOUT_MAX_IN_FLIGHT_GROUPS per sender.")
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    settings.payout_max_in_flight_groups = args.in_flight_groups
+    rng = random.Random(args.seed)
+    payouts = [
+        algorand_service.Payout(account.generate_account()[1], rng.randint(1, 50) * 10_000) for _ in range(args.payouts)
+    ]
+
+    print(
+        f"{args.payouts} payouts, block interval {args.block_seconds}s, "
+        f"{args.in_flight_groups} groups of {algorand_service.PAYOUT_GROUP_SIZE} in flight per sender"
+    )
+    baseline = None
+    for size in [int(value) for value in args.pools.split(",") if value.strip()]:
+        elapsed, rounds, top_ups = _run(payouts, size, args.block_seconds)
+        rate = args.payouts / elapsed
+        baseline = baseline or rate
+        label = "platform account" if size == 0 else f"{size} hot wallet(s)"
+        print(f"  {label:18s} {elapsed:7.2f}s  {rate:8.0f} payouts/s  {rate / baseline:5.1f}x  rounds={rounds} top-up txns={top_ups}")
+
+
+if __name__ == "__main__":
+    main()
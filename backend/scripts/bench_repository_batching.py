@@ -0,0 +1,112 @@
+import argparse
+import asyncio
+import json
+import os
+import sys
+import threading
+import time
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qsl, urlparse
+
+# Add backend directory to sys.path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app.config import settings
+from app.database import aclose_db, get_async_db
+from app.repository import Repository, users_by_id, videos_by_id
+
+
+def _postgrest(tables, latency, counter):
+    class FakePostgrestHandler(BaseHTTPRequestHandler):
+        # Answers eq. and in.() filters on one column after a fixed round-trip delay.
+        protocol_version = "HTTP/1.1"
+
+        def do_GET(self):
+            url = urlparse(self.path)
+            table = url.path.rsplit("/", 1)[-1]
+            rows = tables[table]
+            for column, condition in parse_qsl(url.query):
+                if condition.startswith("eq."):
+                    rows = [row for row in rows if row[column] == condition[3:]]
+                elif condition.startswith("in.("):
+                    wanted = set(condition[4:-1].split(","))
+                    rows = [row for row in rows if row[column] in wanted]
+            time.sleep(latency)
+            with counter["lock"]:
+                counter["queries"] += 1
+            body = json.dumps(rows).encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    return FakePostgrestHandler
+
+
+async def _direct_request(video_id):
+    # The previous pattern: one .eq().limit(1) query per lookup, repeated lookups included.
+    db = get_async_db()
+    video = (await db.table("videos").select("*").eq("id", video_id).limit(1).execute()).data[0]
+    creator = (await db.table("users").select("*").eq("id", video["creator_id"]).limit(1).execute()).data[0]
+    (await db.table("videos").select("*").eq("id", video_id).limit(1).execute()).data[0]
+    return creator["wallet_address"]
+
+
+async def _repository_request(video_id):
+    repo = Repository()
+    video = await repo.video(video_id)
+    creator = await repo.user(video["creator_id"])
+    await repo.video(video_id)  # served from the request's cache
+    return creator["wallet_address"]
+
+
+async def _run(request, video_ids):
+    started = time.perf_counter()
+    wallets = await asyncio.gather(*(request(video_id) for video_id in video_ids))
+    elapsed = time.perf_counter() - started
+    await aclose_db()
+    return elapsed, wallets
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Query count and time for concurrent by-id lookups, direct vs repository.")
+    parser.add_argument("--requests", type=int, default=500, help="Concurrent requests, each looking up a video and its creator.")
+    parser.add_argument("--videos", type=int, default=100)
+    parser.add_argument("--creators", type=int, default=20)
+    parser.add_argument("--latency-ms", type=float, default=10.0, help="PostgREST round trip.")
+    args = parser.parse_args()
+
+    user_ids = [str(uuid.UUID(int=index)) for index in range(args.creators)]
+    video_ids = [str(uuid.UUID(int=(1 << 64) + index)) for index in range(args.videos)]
+    tables = {
+        "users": [{"id": user_id, "wallet_address": f"WALLET{index}"} for index, user_id in enumerate(user_ids)],
+        "videos": [
+            {"id": video_id, "creator_id": user_ids[index % args.creators]} for index, video_id in enumerate(video_ids)
+        ],
+    }
+    counter = {"lock": threading.Lock(), "queries": 0}
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _postgrest(tables, args.latency_ms / 1000, counter))
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    settings.supabase_url = f"http://127.0.0.1:{server.server_address[1]}"
+    settings.supabase_key = "bench-service-key"
+    requested = [video_ids[index % args.videos] for index in range(args.requests)]
+
+    print(f"{args.requests} concurrent requests over {args.videos} videos, PostgREST latency {args.latency_ms:.0f} ms")
+    results = {}
+    for name, request in (("direct", _direct_request), ("repository", _repository_request)):
+        counter["queries"] = 0
+        elapsed, wallets = asyncio.run(_run(request, requested))
+        results[name] = wallets
+        print(f"  {name:10s} {elapsed:6.2f}s  queries {counter['queries']:5d}")
+    assert results["direct"] == results["repository"], "repository returned different rows"
+    print(f"  loader batches: videos {videos_by_id.batches}, users {users_by_id.batches}")
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,129 @@
+import argparse
+import base64
+import hashlib
+import json
+import os
+import sys
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Add backend directory to sys.path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from fastapi.testclient import TestClient
+
+from app.config import settings
+from app.database import use_db
+from app.main import app
+from app.routes.auth import get_current_user
+from app.services import simulation
+
+CREATOR = {"user_id": "bench-creator", "wallet_address": "BENCH"}
+
+
+class FakePinataHandler(BaseHTTPRequestHandler):
+    def do_POST(self):
+        remaining = int(self.headers["Content-Length"])
+        digest = hashlib.sha256()
+        while remaining:
+            chunk = self.rfile.read(min(1024 * 1024, remaining))
+            remaining -= len(chunk)
+            digest.update(chunk)
+        body = json.dumps({"IpfsHash": f"fake-{digest.hexdigest()[:32]}"}).encode()
+        self.send_response(200)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+def _wait(client, job_id):
+    while True:
+        job = client.get(f"/videos/upload/{job_id}").json()
+        if job["status"] in ("completed", "failed"):
+            assert job["status"] == "completed", job
+            return job
+        time.sleep(0.01)
+
+
+def _single_request(client, video, cut):
+    # The first attempt dies after `cut` bytes; the retry starts over with the whole file.
+    started = time.perf_counter()
+    client.post("/videos/upload", data={"title": "interrupted"}, files={"file": ("video.mp4", video[:cut], "video/mp4")})
+    response = client.post("/videos/upload", data={"title": "retry"}, files={"file": ("video.mp4", video, "video/mp4")})
+    _wait(client, response.json()["job_id"])
+    return time.perf_counter() - started, cut + len(video)
+
+
+def _resumable(client, video, cut, chunk_bytes):
+    started = time.perf_counter()
+    created = client.post(
+        "/videos/uploads", json={"title": "resumable", "filename": "video.mp4", "size_bytes": len(video)}
+    ).json()
+    url = f"/videos/uploads/{created['job_id']}"
+    sent = 0
+    offset = 0
+    interrupted = False
+    while offset < len(video):
+        chunk = video[offset : offset + chunk_bytes]
+        checksum = "sha256 " + base64.b64encode(hashlib.sha256(chunk).digest()).decode()
+        if not interrupted and offset + len(chunk) > cut:
+            # The connection drops mid-chunk: the server gets a short body that fails its checksum.
+            interrupted = True
+            partial = chunk[: cut - offset]
+            sent += len(partial)
+            client.patch(url, content=partial, headers={"Upload-Offset": str(offset), "Upload-Checksum": checksum})
+            offset = int(client.head(url).headers["Upload-Offset"])
+            continue
+        response = client.patch(url, content=chunk, headers={"Upload-Offset": str(offset), "Upload-Checksum": checksum})
+        assert response.status_code == 204, response.text
+        sent += len(chunk)
+        offset = int(response.headers["Upload-Offset"])
+    finalized = client.post(f"{url}/finalize").json()
+    if finalized["status"] != "completed":
+        _wait(client, created["job_id"])
+    return time.perf_counter() - started, sent
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Upload time and bytes sent after an interruption, single request vs resumable.")
+    parser.add_argument("--size-mb", type=int, default=256)
+    parser.add_argument("--chunk-mb", type=int, default=8)
+    parser.add_argument("--interrupt-at", type=float, default=0.95, help="Share of the file sent before the drop.")
+    args = parser.parse_args()
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), FakePinataHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    settings.pinata_api_url = f"http://127.0.0.1:{server.server_address[1]}"
+    settings.pinata_jwt = "bench"
+    settings.scheduler_enabled = False
+    staging = tempfile.TemporaryDirectory()
+    settings.upload_spool_dir = os.path.join(staging.name, "spool")
+    settings.resumable_staging_dir = os.path.join(staging.name, "resumable")
+    app.dependency_overrides[get_current_user] = lambda: CREATOR
+
+    size = args.size_mb * 1024 * 1024
+    cut = int(size * args.interrupt_at)
+    print(f"{args.size_mb} MiB upload, connection dropped at {args.interrupt_at:.0%}, {args.chunk_mb} MiB chunks")
+    for name in ("single request", "resumable"):
+        # Distinct bytes per run so the CID index does not short-circuit the second upload.
+        video = os.urandom(size)
+        db = simulation.InMemoryDB({"users": [{"id": CREATOR["user_id"]}]})
+        with use_db(db), TestClient(app) as client:
+            if name == "single request":
+                elapsed, sent = _single_request(client, video, cut)
+            else:
+                elapsed, sent = _resumable(client, video, cut, args.chunk_mb * 1024 * 1024)
+        print(
+            f"  {name:15s} {elapsed:6.2f}s  sent {sent / (1024 * 1024):7.1f} MiB "
+            f"({sent / size:4.2f}x the file)  goodput {args.size_mb / elapsed:7.1f} MiB/s"
+        )
+    staging.cleanup()
+
+
+if __name__ == "__main__":
+    main()
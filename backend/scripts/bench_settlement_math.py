@@ -0,0 +1,116 @@
+import argparse
+import os
+import random
+import sys
+import time
+from decimal import Decimal, ROUND_DOWN
+
+# Add backend directory to sys.path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app.config import settings
+from app.utils.units import scale
+
+QUANT = Decimal("0.000001")
+SCALE = Decimal(10) ** 6
+
+
+def _legacy_settle(campaign, view_count, fee_bps):
+    # reward_engine + settle_reward before the integer ledger: float rows, Decimal(str()) round
+    # trips, quantize on every conversion and float() for the inserts.
+    reward_per_view = Decimal(str(campaign["reward_per_view"] or 0))
+    remaining_budget = Decimal(str(campaign["remaining_budget"] or 0))
+    max_views = int((remaining_budget / reward_per_view).to_integral_value(rounding=ROUND_DOWN))
+    earnings = reward_per_view * Decimal(min(view_count, max_views))
+    new_remaining = remaining_budget - earnings
+    gross = int((Decimal(str(earnings)) * SCALE).quantize(Decimal("1"), rounding=ROUND_DOWN))
+    fee = (gross * fee_bps) // 10000
+    creator_amount = (Decimal(gross - fee) / SCALE).quantize(QUANT)
+    platform_fee = (Decimal(fee) / SCALE).quantize(QUANT)
+    return float(creator_amount), float(platform_fee), float(new_remaining)
+
+
+def _ledger_settle(campaign, view_count, fee_bps):
+    reward_per_view = campaign["reward_per_view_units"]
+    remaining_budget = campaign["remaining_budget_units"]
+    earnings = reward_per_view * min(view_count, remaining_budget // reward_per_view)
+    fee = (earnings * fee_bps) // 10000
+    return earnings - fee, fee, remaining_budget - earnings
+
+
+def _legacy_banner(creator_pool, subscribers, total_subscribers):
+    pool = Decimal(str(creator_pool))
+    paid = 0.0
+    for count in subscribers:
+        reward = (pool * (Decimal(count) / Decimal(total_subscribers))).quantize(QUANT, rounding=ROUND_DOWN)
+        amount = int((Decimal(str(reward)) * SCALE).quantize(Decimal("1"), rounding=ROUND_DOWN))
+        paid += float((Decimal(amount) / SCALE).quantize(QUANT))
+    return paid
+
+
+def _ledger_banner(creator_pool_units, subscribers, total_subscribers):
+    return sum(creator_pool_units * count // total_subscribers for count in subscribers)
+
+
+def _time(label, fn, operations):
+    started = time.perf_counter()
+    fn()
+    elapsed = time.perf_counter() - started
+    print(f"{label:34s} {elapsed * 1000:9.1f}ms  {operations / elapsed:12.0f} ops/s")
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Settlement arithmetic: Decimal/float round trips vs integer base units.")
+    parser.add_argument("--campaigns", type=int, default=200_000)
+    parser.add_argument("--creators", type=int, default=200_000)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    settings.token_decimals = 6
+    rng = random.Random(args.seed)
+    fee_bps = settings.settlement_fee_bps
+
+    ledger_rows, legacy_rows, view_counts = [], [], []
+    for _ in range(args.campaigns):
+        reward_units = rng.choice([1, 5, 10, 50]) * scale() // 1000
+        budget_units = reward_units * rng.randint(10, 5_000)
+        ledger_rows.append({"reward_per_view_units": reward_units, "remaining_budget_units": budget_units})
+        legacy_rows.append({"reward_per_view": reward_units / scale(), "remaining_budget": budget_units / scale()})
+        view_counts.append(rng.randint(1, 2_000))
+    subscribers = [rng.randint(1, 100_000) for _ in range(args.creators)]
+    total_subscribers = sum(subscribers)
+    creator_pool_units = 70_000 * scale()
+
+    print(f"{args.campaigns} campaign settlements, {args.creators} banner payouts")
+    legacy = _time(
+        "video ads, Decimal + float",
+        lambda: [_legacy_settle(row, views, fee_bps) for row, views in zip(legacy_rows, view_counts)],
+        args.campaigns,
+    )
+    ledger = _time(
+        "video ads, integer base units",
+        lambda: [_ledger_settle(row, views, fee_bps) for row, views in zip(ledger_rows, view_counts)],
+        args.campaigns,
+    )
+    print(f"{'':34s} {legacy / ledger:9.1f}x faster")
+    legacy = _time(
+        "banner pro-rata, Decimal + float",
+        lambda: _legacy_banner(creator_pool_units / scale(), subscribers, total_subscribers),
+        args.creators,
+    )
+    ledger = _time(
+        "banner pro-rata, integer base units",
+        lambda: _ledger_banner(creator_pool_units, subscribers, total_subscribers),
+        args.creators,
+    )
+    print(f"{'':34s} {legacy / ledger:9.1f}x faster")
+
+    for row, legacy_row, views in zip(ledger_rows[:1000], legacy_rows, view_counts):
+        creator_units, fee_units, _ = _ledger_settle(row, views, fee_bps)
+        creator_amount, platform_fee, _ = _legacy_settle(legacy_row, views, fee_bps)
+        assert creator_units == round(creator_amount * scale()) and fee_units == round(platform_fee * scale())
+
+
+if __name__ == "__main__":
+    main()
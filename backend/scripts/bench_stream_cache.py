@@ -0,0 +1,117 @@
+import argparse
+import os
+import re
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import requests
+
+# Add backend directory to sys.path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from fastapi.testclient import TestClient
+
+from app.config import settings
+from app.database import use_db
+from app.main import app
+from app.services import simulation
+from app.services.stream_cache import chunk_cache
+
+CID = "bafybeibenchmarkvideo0000000000000000000000000000000000"
+
+
+def _gateway(blob, latency, counter):
+    class FakeGatewayHandler(BaseHTTPRequestHandler):
+        # Serves one object with Range support after a fixed delay, like a distant public gateway.
+
+        def do_GET(self):
+            time.sleep(latency)
+            with counter["lock"]:
+                counter["requests"] += 1
+            match = re.match(r"bytes=(\d+)-(\d*)", self.headers.get("Range", ""))
+            start = int(match.group(1)) if match else 0
+            end = min(int(match.group(2)) if match and match.group(2) else len(blob) - 1, len(blob) - 1)
+            body = blob[start : end + 1]
+            with counter["lock"]:
+                counter["bytes"] += len(body)
+            self.send_response(206 if match else 200)
+            if match:
+                self.send_header("Content-Range", f"bytes {start}-{end}/{len(blob)}")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    return FakeGatewayHandler
+
+
+def _play(fetch, size, request_bytes):
+    # One viewer reading the video front to back in player-sized ranges; returns per-request latency.
+    latencies = []
+    offset = 0
+    received = bytearray()
+    while offset < size:
+        started = time.perf_counter()
+        body = fetch(offset, min(offset + request_bytes, size) - 1)
+        latencies.append(time.perf_counter() - started)
+        received += body
+        offset += len(body)
+    return latencies, bytes(received)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Playback latency and gateway traffic, direct gateway vs /stream cache.")
+    parser.add_argument("--size-mb", type=int, default=32)
+    parser.add_argument("--viewers", type=int, default=16)
+    parser.add_argument("--latency-ms", type=float, default=40.0, help="Simulated gateway latency per request.")
+    parser.add_argument("--request-kb", type=int, default=1024, help="Range size a player asks for.")
+    args = parser.parse_args()
+
+    blob = os.urandom(args.size_mb * 1024 * 1024)
+    counter = {"lock": threading.Lock(), "requests": 0, "bytes": 0}
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _gateway(blob, args.latency_ms / 1000, counter))
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    gateway = f"http://127.0.0.1:{server.server_address[1]}"
+    cache_dir = tempfile.TemporaryDirectory()
+    settings.pinata_gateway = gateway
+    settings.stream_proxy_enabled = True
+    settings.stream_cache_dir = cache_dir.name
+    settings.scheduler_enabled = False
+    request_bytes = args.request_kb * 1024
+    session = requests.Session()
+
+    def direct(start, end):
+        return session.get(f"{gateway}/ipfs/{CID}", headers={"Range": f"bytes={start}-{end}"}).content
+
+    with use_db(simulation.InMemoryDB({})), TestClient(app) as client:
+
+        def proxied(start, end):
+            return client.get(f"/stream/{CID}", headers={"Range": f"bytes={start}-{end}"}).content
+
+        print(f"{args.viewers} viewers of a {args.size_mb} MiB video, gateway latency {args.latency_ms:.0f} ms")
+        for name, fetch in (("direct gateway", direct), ("/stream cache", proxied)):
+            counter["requests"] = counter["bytes"] = 0
+            started = time.perf_counter()
+            with ThreadPoolExecutor(max_workers=args.viewers) as pool:
+                plays = list(pool.map(lambda _: _play(fetch, len(blob), request_bytes), range(args.viewers)))
+            elapsed = time.perf_counter() - started
+            assert all(received == blob for _, received in plays), "viewer received different bytes"
+            latencies = sorted(latency for play, _ in plays for latency in play)
+            p95 = latencies[int(len(latencies) * 0.95) - 1]
+            print(
+                f"  {name:15s} {elapsed:6.2f}s  p50 {statistics.median(latencies) * 1000:6.1f} ms  p95 {p95 * 1000:6.1f} ms  "
+                f"gateway requests {counter['requests']:5d}  gateway MiB {counter['bytes'] / (1024 * 1024):7.1f}"
+            )
+        print(f"  cache stats: {chunk_cache.stats()}")
+    cache_dir.cleanup()
+
+
+if __name__ == "__main__":
+    main()
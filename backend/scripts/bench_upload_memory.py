@@ -0,0 +1,153 @@
+import argparse
+import hashlib
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import requests
+
+# Add backend directory to sys.path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app.config import settings
+from app.services.storage_backends import PinataBackend
+
+READ_BYTES = 1024 * 1024
+
+
+class FakePinataHandler(BaseHTTPRequestHandler):
+    # Reads the multipart body in chunks and answers with a CID derived from the file bytes.
+
+    def do_POST(self):
+        boundary = self.headers["Content-Type"].split("boundary=", 1)[1].strip('"')
+        tail = f"\r\n--{boundary}--\r\n".encode()
+        remaining = int(self.headers["Content-Length"])
+        digest = hashlib.sha256()
+        head = b""
+        held = b""
+        while remaining:
+            chunk = self.rfile.read(min(READ_BYTES, remaining))
+            remaining -= len(chunk)
+            if head is not None:
+                head += chunk
+                if b"\r\n\r\n" not in head:
+                    continue
+                chunk = head.split(b"\r\n\r\n", 1)[1]
+                head = None
+            # Hold back the closing boundary so only file bytes are hashed.
+            held += chunk
+            digest.update(held[: -len(tail)])
+            held = held[-len(tail):]
+        body = json.dumps({"IpfsHash": f"fake-{digest.hexdigest()}"}).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+def _rss_bytes():
+    with open("/proc/self/statm") as statm:
+        return int(statm.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+
+
+def _upload_buffered(path):
+    # The previous path: the whole file read into memory, then encoded again by requests.
+    with open(path, "rb") as stream:
+        content = stream.read()
+    response = requests.post(
+        f"{settings.pinata_api_url}/pinning/pinFileToIPFS",
+        headers={"Authorization": f"Bearer {settings.pinata_jwt}"},
+        files={"file": (os.path.basename(path), content)},
+        timeout=120,
+    )
+    response.raise_for_status()
+    return response.json()["IpfsHash"]
+
+
+def _upload_streamed(path):
+    with open(path, "rb") as stream:
+        return PinataBackend().pin(stream, os.path.basename(path), "video/mp4")
+
+
+def _run_mode(mode, path, concurrency, expected):
+    server = ThreadingHTTPServer(("127.0.0.1", 0), FakePinataHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    settings.pinata_api_url = f"http://127.0.0.1:{server.server_address[1]}"
+    settings.pinata_jwt = "bench"
+    upload = _upload_buffered if mode == "buffered" else _upload_streamed
+
+    baseline = _rss_bytes()
+    peak = baseline
+    done = threading.Event()
+
+    def sample():
+        nonlocal peak
+        while not done.is_set():
+            peak = max(peak, _rss_bytes())
+            time.sleep(0.005)
+
+    sampler = threading.Thread(target=sample, daemon=True)
+    sampler.start()
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        cids = list(pool.map(lambda _: upload(path), range(concurrency)))
+    elapsed = time.perf_counter() - started
+    done.set()
+    sampler.join()
+    server.shutdown()
+    assert all(cid == f"fake-{expected}" for cid in cids), "fake server received different bytes"
+    print(json.dumps({"seconds": elapsed, "peak_rss_delta": max(peak - baseline, 0)}))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Peak RSS of concurrent large uploads against a local fake pinning server.")
+    parser.add_argument("--size-mb", type=int, default=256, help="Size of each uploaded file.")
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument("--modes", default="buffered,streamed")
+    parser.add_argument("--mode", help=argparse.SUPPRESS)
+    parser.add_argument("--file", help=argparse.SUPPRESS)
+    parser.add_argument("--sha256", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.mode:
+        _run_mode(args.mode, args.file, args.concurrency, args.sha256)
+        return
+
+    with tempfile.NamedTemporaryFile(suffix=".mp4") as video:
+        digest = hashlib.sha256()
+        block = os.urandom(READ_BYTES)
+        for _ in range(args.size_mb):
+            video.write(block)
+            digest.update(block)
+        video.flush()
+
+        print(f"{args.concurrency} concurrent uploads of {args.size_mb} MiB")
+        for mode in [value.strip() for value in args.modes.split(",") if value.strip()]:
+            # Each mode runs in a fresh process so its peak RSS is not inherited from the last one.
+            output = subprocess.run(
+                [
+                    sys.executable, __file__, "--mode", mode, "--file", video.name, "--sha256", digest.hexdigest(),
+                    "--concurrency", str(args.concurrency),
+                ],
+                check=True, capture_output=True, text=True,
+            ).stdout
+            result = json.loads(output.strip().splitlines()[-1])
+            rate = args.size_mb * args.concurrency / result["seconds"]
+            print(
+                f"  {mode:9s} {result['seconds']:6.2f}s  {rate:7.0f} MiB/s  "
+                f"peak RSS +{result['peak_rss_delta'] / (1024 * 1024):7.1f} MiB over baseline"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+import argparse
+import os
+import sys
+from collections import Counter
+
+# Add backend directory to sys.path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app.config import settings
+from app.services import algorand_service, banner_engine, simulation
+
+
+class LossyAlgodClient(simulation.SimulatedAlgodClient):
+    # Accepts every group, but loses the first `lost` groups outright and holds the next `late`
+    # ones back until deliver_late(), so their confirmations time out like on a congested node.
+
+    def __init__(self, lost: int, late: int) -> None:
+        super().__init__()
+        self.lost = lost
+        self.late = late
+        self.held: list[list] = []
+
+    def send_transactions(self, signed_txns):
+        for signed_txn in signed_txns:
+            self._check(signed_txn)
+        if self.lost:
+            self.lost -= 1
+            return signed_txns[0].get_txid()
+        if self.late:
+            self.late -= 1
+            self.held.append(signed_txns)
+            return signed_txns[0].get_txid()
+        return super().send_transactions(signed_txns)
+
+    def deliver_late(self) -> None:
+        with self._block_ready:
+            for signed_txns in self.held:
+                for signed_txn in signed_txns:
+                    self._submit(signed_txn)
+            self.held = []
+        self.round += 1
+
+    def advance(self, rounds: int) -> None:
+        with self._block_ready:
+            self.round += rounds
+
+
+def _distribute(label):
+    try:
+        report = banner_engine.distribute_banner_rewards()
+        print(f"  {label}: completed, creators paid {report['creators_paid']}")
+        return report
+    except RuntimeError as exc:
+        print(f"  {label}: {exc}")
+        return None
+
+
+def _statuses(db):
+    return dict(Counter(row["status"] for row in db.tables["banner_allocations"]))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Banner payouts whose confirmation timed out, resolved by later runs.")
+    parser.add_argument("--creators", type=int, default=120)
+    parser.add_argument("--lost-groups", type=int, default=2, help="Groups the node accepts but never includes.")
+    parser.add_argument("--late-groups", type=int, default=1, help="Groups that land after their confirmation timed out.")
+    args = parser.parse_args()
+
+    settings.confirmation_timeout_seconds = 1
+    settings.solvency_reserve_units = 0
+    dataset = simulation.generate_dataset(args.creators, 0, 0, banner_campaigns=3)
+    db = simulation.InMemoryDB(dataset)
+    node = LossyAlgodClient(args.lost_groups, args.late_groups)
+
+    with simulation.simulation_mode(db, node):
+        print("run 1: payouts sent, some confirmations time out")
+        assert _distribute("run 1") is None
+        first = _statuses(db)
+        print(f"  allocations {first}")
+        assert first.get("unknown") == (args.lost_groups + args.late_groups) * algorand_service.PAYOUT_GROUP_SIZE
+
+        node.deliver_late()
+        sent = len(node.transactions)
+        print("run 2: late groups landed, lost ones still inside their validity window")
+        assert _distribute("run 2") is None
+        second = _statuses(db)
+        print(f"  allocations {second}")
+        assert len(node.transactions) == sent, "an allocation that could still land was sent again"
+        assert second.get("unknown") == args.lost_groups * algorand_service.PAYOUT_GROUP_SIZE
+
+        node.advance(algorand_service.MAX_TXN_LIFE + 1)
+        print("run 3: chain past the lost transactions' last valid round")
+        report = _distribute("run 3")
+        print(f"  allocations {_statuses(db)}")
+        assert report is not None
+
+        campaign = dict(dataset["banner_campaigns"][0], id="follow-up-campaign")
+        db.tables["banner_campaigns"].append({**campaign, "distributed": False, "active": True, "distribution_run_id": None})
+        print("run 4: a campaign due after the stuck run is distributed")
+        assert _distribute("run 4")["campaigns_distributed"] == 1
+
+    paid_to = Counter()
+    for settlement in db.tables["settlements"]:
+        paid_to[settlement["creator_wallet"]] += int(settlement["amount_units"])
+    planned = Counter()
+    for allocation in db.tables["banner_allocations"]:
+        planned[allocation["creator_wallet"]] += int(allocation["amount_units"])
+    assert all(node.balances[wallet] == amount for wallet, amount in planned.items()), "a creator was paid twice"
+    assert paid_to == planned
+    print(f"every creator received their allocation exactly once ({len(planned)} creators, {len(node.transactions)} transfers)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+import argparse
+import os
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Add backend directory to sys.path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app.config import settings
+from app.services.gateway_registry import GatewayRegistry
+
+
+def _stand_in(latency, status):
+    class StandInGatewayHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            time.sleep(latency)
+            self.send_response(status)
+            self.send_header("Content-Length", "1")
+            self.end_headers()
+            self.wfile.write(b"x")
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StandInGatewayHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def _print(registry, title):
+    print(title)
+    for stats in registry.snapshot():
+        print(
+            f"  {stats['gateway']:28s} latency={stats['latency_ms']} ms availability={stats['availability']:.2f} "
+            f"reachable={stats['reachable']} score={stats['score']}"
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Gateway ranking and failover against local stand-in gateways.")
+    parser.add_argument("--latencies-ms", default="120,15,60", help="Stand-in gateway latencies, in configured order.")
+    parser.add_argument("--probes", type=int, default=3)
+    args = parser.parse_args()
+
+    settings.gateway_probe_timeout_seconds = 1.0
+    servers = [_stand_in(float(value) / 1000, 200) for value in args.latencies_ms.split(",")]
+    servers.append(_stand_in(0.001, 502))
+    gateways = [f"http://127.0.0.1:{server.server_address[1]}" for server in servers]
+    registry = GatewayRegistry(lambda: gateways)
+
+    _print(registry, "before probing (configured order):")
+    for _ in range(args.probes):
+        registry.probe()
+    _print(registry, f"after {args.probes} probes:")
+    fastest = registry.best()
+    expected = gateways[min(range(len(servers) - 1), key=lambda index: float(args.latencies_ms.split(",")[index]))]
+    assert fastest == expected, "fastest stand-in is not ranked first"
+    assert registry.ranked()[-1] == gateways[-1], "failing stand-in is not ranked last"
+
+    servers[gateways.index(fastest)].shutdown()
+    servers[gateways.index(fastest)].server_close()
+    for _ in range(settings.gateway_failure_threshold):
+        registry.probe()
+    _print(registry, "after the fastest gateway went down:")
+    assert registry.best() != fastest, "registry did not fail over"
+    print(f"failover ok: {fastest} -> {registry.best()}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+import argparse
+import os
+import sys
+from datetime import datetime, timezone
+
+# Add backend directory to sys.path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from algosdk import account
+
+from app.config import settings
+from app.services import reward_engine, simulation, solvency
+from app.utils.units import scale
+
+
+def _dataset(views):
+    # Two creators with one campaign each; the first campaign's creator has not opted in.
+    now = datetime.now(timezone.utc).isoformat()
+    wallets = [account.generate_account()[1] for _ in range(2)]
+    users = [
+        {"id": f"creator-{index}", "wallet_address": wallet, "username": f"creator_{index}", "role": "creator"}
+        for index, wallet in enumerate(wallets)
+    ]
+    videos = [{"id": f"video-{index}", "creator_id": f"creator-{index}", "cid": f"bafy{index}"} for index in range(2)]
+    campaigns = [
+        {
+            "id": f"campaign-{index}",
+            "advertiser_wallet": wallets[1 - index],
+            "video_id": f"video-{index}",
+            "budget_units": views * scale(),
+            "remaining_budget_units": views * scale(),
+            "reward_per_view_units": scale(),
+            "active": True,
+        }
+        for index in range(2)
+    ]
+    view_rows = [
+        {
+            "id": f"view-{index}-{number}",
+            "video_id": f"video-{index}",
+            "viewer_wallet": "viewer",
+            "watch_seconds": settings.view_min_watch_seconds,
+            "settled": False,
+            "timestamp": now,
+        }
+        for index in range(2)
+        for number in range(views)
+    ]
+    data = {"users": users, "videos": videos, "ad_campaigns": campaigns, "views": view_rows, "settlements": []}
+    return data, wallets
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Deferred campaigns must not take solvency budget from payable ones.")
+    parser.add_argument("--views", type=int, default=50, help="Unsettled views per campaign, one token each.")
+    args = parser.parse_args()
+
+    settings.solvency_policy = solvency.SOLVENCY_TRIM
+    settings.solvency_reserve_units = 0
+    dataset, (deferred_wallet, payable_wallet) = _dataset(args.views)
+    db = simulation.InMemoryDB(dataset)
+    node = simulation.SimulatedAlgodClient(not_opted_in={deferred_wallet})
+    # Exactly what the payable campaign needs; the deferred one would need as much again.
+    balance = solvency.creator_share(args.views * scale())
+
+    with simulation.simulation_mode(db, node, platform_units=balance):
+        report = reward_engine.calculate_and_settle()
+
+    print(f"platform balance covers one campaign ({balance / scale()} tokens), the other creator is not opted in")
+    print(f"  report {report}")
+    print(f"  paid to the opted-in creator: {node.balances[payable_wallet] / scale()} tokens")
+    assert report["campaigns_deferred"] == 1
+    assert report["campaigns_trimmed"] == 0, "the deferred campaign used up the payable one's budget"
+    assert report["views_settled"] == args.views
+    assert node.balances[payable_wallet] == balance
+    print("deferred campaign reserved nothing; the payable campaign settled in full")
+
+
+if __name__ == "__main__":
+    main()
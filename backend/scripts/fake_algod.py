@@ -0,0 +1,209 @@
+import base64
+import json
+import random
+import re
+import socket
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import msgpack
+from algosdk import transaction
+
+# Local stand-in for algod used by the benchmark scripts. Several FakeAlgodNode servers can
+# share one FakeNetwork so they agree on rounds, balances and submitted transactions while
+# each injects its own latency and error profile.
+
+GENESIS_HASH = base64.b64encode(bytes(32)).decode()
+
+
+def _txn_json(txn):
+    # The subset of algod's JSON transaction encoding that the services read back.
+    payload = {"type": txn.type, "snd": txn.sender, "fv": txn.first_valid_round, "lv": txn.last_valid_round}
+    if txn.type == "axfer":
+        payload.update({"arcv": txn.receiver, "aamt": int(txn.amount or 0), "xaid": txn.index})
+    if txn.note:
+        payload["note"] = base64.b64encode(txn.note).decode()
+    return payload
+
+
+class FakeNetwork:
+    def __init__(self, round_seconds=0.5, starting_round=1000, asset_id=1_000_001):
+        self.round_seconds = round_seconds
+        self.starting_round = starting_round
+        self.asset_id = asset_id
+        self.started_at = time.monotonic()
+        self.lock = threading.Lock()
+        self.balances = {}
+        self.opted_in = set()
+        self.transactions = {}
+        self.blocks = {}
+
+    def current_round(self):
+        return self.starting_round + int((time.monotonic() - self.started_at) / self.round_seconds)
+
+    def wait_for_round(self, round_num, max_wait=5.0):
+        deadline = time.monotonic() + max_wait
+        while self.current_round() < round_num and time.monotonic() < deadline:
+            time.sleep(min(0.01, self.round_seconds / 10))
+        return self.current_round()
+
+    def submit(self, raw):
+        # raw may be a whole atomic group: concatenated msgpack-encoded signed transactions.
+        unpacker = msgpack.Unpacker(raw=False)
+        unpacker.feed(raw)
+        txids = [self._apply(transaction.SignedTransaction.undictify(decoded)) for decoded in unpacker]
+        return txids[0]
+
+    def _apply(self, signed):
+        txn = signed.transaction
+        txid = signed.get_txid()
+        with self.lock:
+            confirmed_round = self.current_round() + 1
+            receiver = getattr(txn, "receiver", None)
+            amount = int(getattr(txn, "amount", 0) or 0)
+            if txn.type == "axfer" and receiver == txn.sender and amount == 0:
+                self.opted_in.add(txn.sender)
+            elif receiver and amount:
+                self.balances[txn.sender] = self.balances.get(txn.sender, 0) - amount
+                self.balances[receiver] = self.balances.get(receiver, 0) + amount
+            self.transactions[txid] = {"txn": txn, "confirmed-round": confirmed_round}
+            self.blocks.setdefault(confirmed_round, []).append(txid)
+        return txid
+
+    def account(self, address):
+        with self.lock:
+            balance = self.balances.get(address, 0)
+            holdings = []
+            if address in self.opted_in or balance:
+                holdings.append({"asset-id": self.asset_id, "amount": max(balance, 0), "is-frozen": False})
+        return {"address": address, "amount": 10_000_000, "round": self.current_round(), "assets": holdings}
+
+    def pending(self, txid):
+        with self.lock:
+            entry = self.transactions.get(txid)
+        if entry is None:
+            return None
+        confirmed_round = entry["confirmed-round"]
+        return {
+            "confirmed-round": confirmed_round if confirmed_round <= self.current_round() else 0,
+            "pool-error": "",
+            "txn": {"txn": _txn_json(entry["txn"])},
+        }
+
+
+class _Server(ThreadingHTTPServer):
+    daemon_threads = True
+    # The default backlog of 5 drops SYNs under concurrent benchmarks (1s retransmit stalls).
+    request_queue_size = 256
+
+
+class FakeAlgodNode:
+    def __init__(self, network, latency_ms=5.0, jitter_ms=2.0, slow_fraction=0.0, slow_ms=0.0, error_rate=0.0, seed=None):
+        self.network = network
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.slow_fraction = slow_fraction
+        self.slow_ms = slow_ms
+        self.error_rate = error_rate
+        self.requests = 0
+        self._rng = random.Random(seed)
+        self._server = _Server(("127.0.0.1", 0), self._handler())
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+
+    @property
+    def url(self):
+        return f"http://127.0.0.1:{self._server.server_port}"
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def _delay(self):
+        delay = self.latency_ms + self._rng.uniform(0, self.jitter_ms)
+        if self.slow_fraction and self._rng.random() < self.slow_fraction:
+            delay += self.slow_ms
+        time.sleep(delay / 1000)
+
+    def _handler(self):
+        node = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def setup(self):
+                super().setup()
+                # Without this, delayed ACKs add ~40ms to every keep-alive response.
+                self.request.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+
+            def log_message(self, *args):
+                pass
+
+            def _reply(self, status, payload):
+                body = json.dumps(payload).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def _route(self, method):
+                node.requests += 1
+                path = self.path.split("?", 1)[0]
+                length = int(self.headers.get("Content-Length") or 0)
+                body = self.rfile.read(length) if length else b""
+                if not path.startswith("/v2/status/wait-for-block-after/"):
+                    node._delay()
+                if node.error_rate and node._rng.random() < node.error_rate:
+                    return self._reply(503, {"message": "injected failure"})
+
+                network = node.network
+                if method == "POST" and path == "/v2/transactions":
+                    return self._reply(200, {"txId": network.submit(body)})
+                if path == "/v2/status":
+                    return self._reply(200, {"last-round": network.current_round()})
+                match = re.fullmatch(r"/v2/status/wait-for-block-after/(\d+)", path)
+                if match:
+                    return self._reply(200, {"last-round": network.wait_for_round(int(match.group(1)) + 1)})
+                if path == "/v2/transactions/params":
+                    return self._reply(
+                        200,
+                        {
+                            "fee": 0,
+                            "min-fee": 1000,
+                            "last-round": network.current_round(),
+                            "genesis-hash": GENESIS_HASH,
+                            "genesis-id": "fake-v1",
+                            "consensus-version": "fake",
+                        },
+                    )
+                match = re.fullmatch(r"/v2/blocks/(\d+)/txids", path)
+                if match:
+                    round_num = int(match.group(1))
+                    if round_num > network.current_round():
+                        return self._reply(404, {"message": "round not available"})
+                    with network.lock:
+                        txids = list(network.blocks.get(round_num, []))
+                    return self._reply(200, {"blockTxids": txids})
+                match = re.fullmatch(r"/v2/accounts/([A-Z2-7]+)", path)
+                if match:
+                    return self._reply(200, network.account(match.group(1)))
+                match = re.fullmatch(r"/v2/transactions/pending/([A-Z2-7]+)", path)
+                if match:
+                    info = network.pending(match.group(1))
+                    if info is None:
+                        return self._reply(404, {"message": "txn does not exist"})
+                    return self._reply(200, info)
+                return self._reply(404, {"message": f"unsupported path {path}"})
+
+            def do_GET(self):
+                self._route("GET")
+
+            def do_POST(self):
+                self._route("POST")
+
+        return Handler
@@ -0,0 +1,72 @@
+import argparse
+import json
+import os
+import random
+import sys
+
+# Add backend directory to sys.path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app.services import simulation
+from app.utils.units import to_units
+
+
+def _format_bytes(value):
+    if value is None:
+        return "n/a"
+    return f"{value / (1024 * 1024):.1f} MiB"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Dry-run reward and banner settlement on synthetic data.")
+    parser.add_argument("--creators", type=int, default=1_000)
+    parser.add_argument("--campaigns", type=int, default=200)
+    parser.add_argument("--views", type=int, default=50_000)
+    parser.add_argument("--banner-campaigns", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--unopted-share", type=float, default=0.0, help="Share of creators not opted in to the asset.")
+    parser.add_argument("--platform-balance", type=float, default=None, help="Platform wallet balance in tokens (default: unlimited).")
+    parser.add_argument("--scales", default="1", help="Comma separated multipliers, e.g. 1,10 for a 10x growth plan.")
+    parser.add_argument("--no-memory", action="store_true", help="Skip tracemalloc (faster, no peak memory figure).")
+    parser.add_argument("--json", action="store_true", help="Print the raw report as JSON.")
+    args = parser.parse_args()
+
+    results = []
+    for scale in [int(value) for value in args.scales.split(",") if value.strip()]:
+        dataset = simulation.generate_dataset(
+            creators=args.creators * scale,
+            campaigns=args.campaigns * scale,
+            views=args.views * scale,
+            banner_campaigns=args.banner_campaigns * scale,
+            seed=args.seed,
+        )
+        rng = random.Random(args.seed)
+        not_opted_in = {user["wallet_address"] for user in dataset["users"] if rng.random() < args.unopted_share}
+        platform_units = (
+            simulation.SIMULATED_PLATFORM_UNITS if args.platform_balance is None else to_units(args.platform_balance)
+        )
+        result = simulation.run_simulation(
+            dataset, trace_memory=not args.no_memory, not_opted_in=not_opted_in, platform_units=platform_units
+        )
+        result["scale"] = scale
+        results.append(result)
+
+        if args.json:
+            continue
+        print(f"\n=== scale x{scale}: {result['dataset']} ===")
+        for engine in ("reward_engine", "banner_engine"):
+            stats = result[engine]
+            print(
+                f"{engine:14s} time={stats['seconds']:.3f}s (in-memory db {stats['db_seconds']:.3f}s) peak={_format_bytes(stats['peak_memory_bytes'])} "
+                f"db_calls={stats['db_calls']} txns={stats['transactions']}"
+            )
+            print(f"{'':14s} report={stats['report']}")
+            print(f"{'':14s} db={stats['db_calls_by_query']}")
+            print(f"{'':14s} algod={stats['algod_calls']}")
+
+    if args.json:
+        print(json.dumps(results, indent=2, default=str))
+
+
+if __name__ == "__main__":
+    main()